@@ -0,0 +1,68 @@
+"""Benchmark: reaching a row deep into a CSV file with and without a row index.
+
+Compares getting the first message at ``--row`` by reading past the earlier
+rows (plain chunked iteration), by ``start_row`` without an index (newline
+scan) and with a prebuilt ``CSVRowIndex``, plus random item access.
+
+Usage:
+    python benchmarks/bench_csv_seek.py --rows 1000000 --row 900000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from fluvialgen.benchmark import write_synthetic_csv
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.csv_index import CSVRowIndex
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--row", type=int, default=900_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        write_synthetic_csv(path, args.rows)
+
+        def make(**kwargs):
+            return CSVDatasetGenerator(path, target_column="target", parse_dates=["moment"],
+                                       chunksize=args.chunksize, **kwargs)
+
+        def read_past():
+            gen = make()
+            gen.next_batch(args.row)
+            return next(gen)
+
+        build, _ = _timed(lambda: CSVRowIndex.open(path))
+        replay, expected = _timed(read_past)
+        scan, row = _timed(lambda: next(make(start_row=args.row)))
+        assert row == expected
+        indexed, row = _timed(lambda: next(make(start_row=args.row, index=True)))
+        assert row == expected
+        print(f"first message at row {args.row:,}:")
+        print(f"  read past earlier rows  {replay:8.3f}s")
+        print(f"  start_row, no index     {scan:8.3f}s")
+        print(f"  start_row, row index    {indexed:8.3f}s  (index built once in {build:.2f}s)")
+
+        rng = random.Random(0)
+        picks = [rng.randrange(args.rows) for _ in range(args.lookups)]
+        for label, kwargs in (("no index", {}), ("row index", {"index": True})):
+            gen = make(**kwargs)
+            elapsed, _ = _timed(lambda: [gen[i] for i in picks])
+            print(f"random gen[i], {label:<9} {elapsed / args.lookups * 1e3:8.2f} ms/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: eager vs. lazy (index-backed) MovingWindowBatcher batches.
+
+Reports the time to produce every batch when the consumer materializes all
+of them, only every 10th one or only reads one column, and the memory held
+by a consumer that keeps the last batches around (e.g. a replay buffer).
+
+Usage:
+    python benchmarks/bench_lazy_windows.py --rows 5000 --instance-size 50 --batch-size 32
+"""
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+from fluvialgen.benchmark import SyntheticDataset
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+
+
+def _run(make, consume):
+    start = time.perf_counter()
+    n = 0
+    for i, batch in enumerate(make()):
+        consume(i, batch)
+        n += 1
+    return time.perf_counter() - start, n
+
+
+def _held_memory_mb(make, keep):
+    tracemalloc.start()
+    try:
+        recent = deque(maxlen=keep)
+        for batch in make():
+            recent.append(batch)
+        return tracemalloc.get_traced_memory()[0] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--instance-size", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--keep", type=int, default=200, help="batches held by the consumer")
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.rows)
+
+    def factory(lazy):
+        return lambda: MovingWindowBatcher(
+            dataset, instance_size=args.instance_size, batch_size=args.batch_size,
+            n_instances=args.rows, lazy=lazy,
+        )
+
+    def materialize_all(i, batch):
+        X, y = batch
+
+    def materialize_some(i, batch):
+        if i % 10 == 0:
+            X, y = batch
+
+    def one_column(i, batch):
+        if hasattr(batch, "column"):
+            batch.column("f0")
+        else:
+            batch[0]["f0"]
+
+    for name, consume in (("all", materialize_all), ("every 10th", materialize_some),
+                          ("one column", one_column)):
+        eager, n = _run(factory(False), consume)
+        lazy, _ = _run(factory(True), consume)
+        print(f"{name:<11} eager {eager:6.2f}s  lazy {lazy:6.2f}s  ({eager / lazy:.1f}x, {n} batches)")
+
+    eager = _held_memory_mb(factory(False), args.keep)
+    lazy = _held_memory_mb(factory(True), args.keep)
+    print(f"holding {args.keep} batches: eager {eager:.1f} MB, lazy {lazy:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
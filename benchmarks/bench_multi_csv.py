@@ -0,0 +1,68 @@
+"""Benchmark: latency at file boundaries with and without read-ahead.
+
+The consumer sleeps briefly every ``--io-every`` rows to stand in for
+model/IO work that releases the GIL, which is when background parsing helps.
+
+Usage:
+    python benchmarks/bench_multi_csv.py --files 8 --rows 200000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.multi_csv_dataset_generator import MultiCSVDatasetGenerator
+
+
+def _write_files(n_files, n_rows, directory):
+    rng = np.random.default_rng(0)
+    for i in range(n_files):
+        df = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=["a", "b", "c", "d"])
+        df["value"] = rng.normal(size=n_rows)
+        df.to_csv(os.path.join(directory, f"part_{i:04d}.csv"), index=False)
+
+
+def _run(pattern, prefetch, io_every, rows_per_file):
+    gen = MultiCSVDatasetGenerator(pattern, target_column="value", prefetch=prefetch)
+    latencies = []
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        try:
+            gen.get_message()
+        except StopIteration:
+            break
+        latencies.append(time.perf_counter() - t0)
+        if len(latencies) % io_every == 0:
+            time.sleep(0.001)
+    total = time.perf_counter() - start
+    # The first file is always a cold start; only later boundaries can be hidden
+    later = latencies[rows_per_file:]
+    return total, max(later), sorted(later)[int(len(later) * 0.999)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--io-every", type=int, default=500)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        _write_files(args.files, args.rows, directory)
+        pattern = os.path.join(directory, "part_*.csv")
+        for prefetch in (0, 1, 2):
+            total, worst, p999 = _run(pattern, prefetch, args.io_every, args.rows)
+            print(f"prefetch={prefetch}: total {total:.2f}s, "
+                  f"after first file: p99.9 {p999 * 1e6:.1f}us, max {worst * 1e3:.1f}ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark: per-message iteration vs. next_batch / iter_chunks.
+
+Usage:
+    python benchmarks/bench_next_batch.py --rows 500000 --chunk 1024
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from fluvialgen.benchmark import SyntheticDataset, write_synthetic_csv
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+
+
+def _per_message(make):
+    gen = make()
+    start = time.perf_counter()
+    n = sum(1 for _ in gen)
+    return time.perf_counter() - start, n
+
+
+def _chunked(make, size):
+    gen = make()
+    start = time.perf_counter()
+    n = sum(len(chunk) for chunk in gen.iter_chunks(size))
+    return time.perf_counter() - start, n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk", type=int, default=1024)
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        write_synthetic_csv(path, args.rows)
+        cases = {
+            "river": lambda: RiverDatasetGenerator(dataset, n_instances=args.rows),
+            # Parsed up front, so only iteration is timed
+            "csv": lambda: CSVDatasetGenerator(path, target_column="target"),
+            "csv_chunked": lambda: CSVDatasetGenerator(path, target_column="target", chunksize=50_000),
+            "past_forecast": lambda: PastForecastBatcher(
+                dataset, past_size=8, forecast_size=1, n_instances=args.rows // 10, output_format="dict"
+            ),
+        }
+        for name, make in cases.items():
+            base, n = _per_message(make)
+            bulk, m = _chunked(make, args.chunk)
+            assert n == m
+            print(f"{name:<14} per message {base * 1e9 / n:7.0f} ns  next_batch({args.chunk}) "
+                  f"{bulk * 1e9 / n:7.0f} ns  ({base / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
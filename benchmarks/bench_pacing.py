@@ -0,0 +1,81 @@
+"""Benchmark: pacing accuracy of the deadline-based Pacer vs. the old sleep logic.
+
+Each rate is driven through a minimal BaseGenerator, so the numbers include
+the per-message overhead of ``__next__``.
+
+Usage:
+    python benchmarks/bench_pacing.py --seconds 2
+"""
+import argparse
+import time
+
+import numpy as np
+
+from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.pacing import Pacer
+
+
+class _Counter(BaseGenerator):
+    def __next__(self):
+        super().__next__()
+        return self.get_message()
+
+    def get_message(self):
+        self._count += 1
+        return self._count
+
+    def get_count(self):
+        return self._count
+
+
+class _LegacyCounter(_Counter):
+    """The original relative-sleep pacing from BaseGenerator.__next__."""
+
+    def __init__(self, stream_period):
+        super().__init__()
+        self.period = stream_period
+        self.last_message_time = time.time()
+
+    def __next__(self):
+        if time.time() - self.last_message_time < self.period / 1000:
+            time.sleep(
+                self.period / 1000
+                - ((time.time() - self.last_message_time) % (self.period / 1000))
+            )
+        self.last_message_time = time.time()
+        return self.get_message()
+
+
+def _measure(gen, n):
+    stamps = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        next(gen)
+        stamps[i] = time.monotonic_ns()
+    gaps = np.diff(stamps) / 1e3
+    achieved = (n - 1) * 1e9 / (stamps[-1] - stamps[0])
+    return achieved, gaps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'rate':>8} {'engine':<18} {'achieved':>10} {'error':>8} {'gap p50':>9} {'gap p99':>9}")
+    for rate in (10, 1_000, 50_000):
+        n = max(int(rate * args.seconds), 10)
+        period_ms = 1000 / rate
+        engines = [
+            ("legacy sleep", _LegacyCounter(period_ms)),
+            ("Pacer skip", _Counter(stream_period=Pacer(rate=rate))),
+            ("Pacer catch_up", _Counter(stream_period=Pacer(rate=rate, policy="catch_up"))),
+        ]
+        for name, gen in engines:
+            achieved, gaps = _measure(gen, n)
+            error = (achieved - rate) / rate * 100
+            print(f"{rate:>8} {name:<18} {achieved:>10.1f} {error:>+7.2f}% "
+                  f"{np.percentile(gaps, 50):>7.1f}us {np.percentile(gaps, 99):>7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: PastForecastBatcher over many station files, sequential vs. ParallelRunner.
+
+Usage:
+    python benchmarks/bench_parallel.py --stations 16 --rows 20000 --workers 1 2 4 8
+"""
+import argparse
+import functools
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.csv_past_forecast_batcher import CSVPastForecastBatcher
+from fluvialgen.parallel_runner import ParallelRunner
+
+
+def _write_stations(n_stations, n_rows, directory):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(n_stations):
+        df = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=["rain", "flow", "temp", "hum"])
+        df["level"] = rng.normal(size=n_rows)
+        path = os.path.join(directory, f"station_{i:03d}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--output-format", default="numpy")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = _write_stations(args.stations, args.rows, directory)
+        factories = [
+            functools.partial(
+                CSVPastForecastBatcher, filepath=p, target_column="level",
+                past_size=24, forecast_size=6, output_format=args.output_format,
+            )
+            for p in paths
+        ]
+        start = time.perf_counter()
+        n = sum(1 for f in factories for _ in f())
+        sequential = time.perf_counter() - start
+        print(f"cores: {os.cpu_count()}, instances: {n}")
+        print(f"sequential:         {sequential:.2f}s ({n / sequential:,.0f}/s)")
+        for workers in args.workers:
+            for ordered in (True, False):
+                start = time.perf_counter()
+                count = sum(1 for _ in ParallelRunner(factories, n_workers=workers, ordered=ordered))
+                elapsed = time.perf_counter() - start
+                assert count == n
+                mode = "ordered" if ordered else "interleaved"
+                print(f"{workers} workers {mode:<11}: {elapsed:.2f}s ({n / elapsed:,.0f}/s, "
+                      f"{sequential / elapsed:.2f}x)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
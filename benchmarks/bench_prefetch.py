@@ -0,0 +1,64 @@
+"""Benchmark: overlapping batch production with model training.
+
+A MovingWindowBatcher over a River dataset feeds ``learn_many`` of a linear
+model, directly and through PrefetchGenerator in thread and process mode.
+``--consumer-io-ms`` adds a GIL-releasing wait per batch (e.g. publishing
+predictions), which thread mode can overlap with production even on one core.
+Process mode only pays off with spare cores, since every batch is pickled.
+
+Usage:
+    python benchmarks/bench_prefetch.py --instances 5000
+"""
+import argparse
+import functools
+import time
+
+from river import linear_model, preprocessing
+from river.datasets import synth
+
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.prefetch_generator import PrefetchGenerator
+
+
+def _make_batcher(n_instances):
+    return MovingWindowBatcher(
+        dataset=synth.Friedman(seed=0),
+        instance_size=8,
+        batch_size=4,
+        n_instances=n_instances,
+    )
+
+
+def _train(batches, io_ms):
+    model = preprocessing.StandardScaler() | linear_model.LinearRegression()
+    start = time.perf_counter()
+    n = 0
+    for X, y in batches:
+        model.learn_many(X, y)
+        if io_ms:
+            time.sleep(io_ms / 1000)
+        n += 1
+    return n, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=16)
+    parser.add_argument("--consumer-io-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    factory = functools.partial(_make_batcher, args.instances)
+    n, direct = _train(factory(), args.consumer_io_ms)
+    print(f"direct:          {n} batches in {direct:.2f}s")
+    for mode in ("thread", "process"):
+        gen = PrefetchGenerator(factory, depth=args.depth, mode=mode)
+        try:
+            n, elapsed = _train(gen, args.consumer_io_ms)
+        finally:
+            gen.stop()
+        print(f"prefetch {mode:7s}: {n} batches in {elapsed:.2f}s ({direct / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: column projection and dtype plans for wide CSV files.
+
+Writes a wide CSV (a timestamp, a repeated station name and many numeric
+columns) and times draining a CSVDatasetGenerator over it, with its peak
+memory, when every column is used, when only a few feature columns are
+selected (and so parsed), and with dtype_plan="auto" on top. The parse-only
+lines show what the parser itself saves (the generator used to parse every
+column even when feature_columns named a few).
+
+Usage:
+    python benchmarks/bench_projection.py --rows 200000 --columns 100 --features 3
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+
+
+def _write_wide_csv(path, rows, columns):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(rows, columns)), columns=[f"f{j}" for j in range(columns)])
+    df.insert(0, "station", rng.choice(["north", "south", "east", "west"], size=rows))
+    df.insert(0, "moment", pd.date_range("2024-01-01", periods=rows, freq="min"))
+    df["target"] = rng.normal(size=rows)
+    df.to_csv(path, index=False)
+
+
+def _drain(make, chunk):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        n = sum(len(rows) for rows in make().iter_chunks(chunk))
+        elapsed = time.perf_counter() - start
+        return elapsed, tracemalloc.get_traced_memory()[1] / 2**20, n
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=100)
+    parser.add_argument("--features", type=int, default=3)
+    parser.add_argument("--chunksize", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wide.csv")
+        _write_wide_csv(path, args.rows, args.columns)
+        selected = ["moment", "station"] + [f"f{j}" for j in range(args.features)]
+
+        def make(**kwargs):
+            return lambda: CSVDatasetGenerator(path, target_column="target", parse_dates=["moment"],
+                                               chunksize=args.chunksize, **kwargs)
+
+        for label, usecols in (("all columns", None), ("selected columns", selected + ["target"])):
+            start = time.perf_counter()
+            for _ in pd.read_csv(path, usecols=usecols, parse_dates=["moment"], chunksize=args.chunksize):
+                pass
+            print(f"parse only, {label:<17} {time.perf_counter() - start:7.2f}s")
+
+        for label, kwargs in (
+            ("all columns", {}),
+            (f"{len(selected)} feature columns", {"feature_columns": selected}),
+            ("  + dtype_plan='auto'", {"feature_columns": selected, "dtype_plan": "auto"}),
+        ):
+            elapsed, peak, n = _drain(make(**kwargs), args.chunksize)
+            print(f"{label:<22} {elapsed:7.2f}s  peak {peak:7.1f} MB  ({n} rows)")
+
+
+if __name__ == "__main__":
+    main()
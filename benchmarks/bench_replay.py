@@ -0,0 +1,64 @@
+"""Benchmark: event-time replay accuracy and overhead at high speed multipliers.
+
+Replays synthetic gauge readings (1s cadence with occasional bursts of
+readings a few ms apart) through RiverDatasetGenerator at several speeds and
+reports achieved speed, lag and the per-message cost compared with an
+unpaced run.
+
+Usage:
+    python benchmarks/bench_replay.py --events 20000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+
+
+class _ListDataset:
+    def __init__(self, data):
+        self.data = data
+
+    def take(self, n):
+        return iter(self.data[:n])
+
+
+def _events(n):
+    rng = np.random.default_rng(0)
+    gaps = np.where(rng.random(n) < 0.1, rng.uniform(0.001, 0.01, n), 1.0)
+    offsets = np.cumsum(gaps)
+    start = datetime(2024, 1, 1)
+    data = [({"moment": start + timedelta(seconds=float(o)), "level": float(o)}, 0.0) for o in offsets]
+    return data, float(offsets[-1] - offsets[0])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    data, span = _events(args.events)
+    gen = RiverDatasetGenerator(_ListDataset(data), n_instances=len(data))
+    start = time.perf_counter()
+    for _ in gen:
+        pass
+    base = (time.perf_counter() - start) / len(data)
+    print(f"unpaced: {base * 1e6:.2f}us/message, event span {span / 3600:.1f}h")
+
+    for speed in (10_000, 100_000, 1_000_000):
+        gen = RiverDatasetGenerator(
+            _ListDataset(data), n_instances=len(data), replay_column="moment", replay_speed=speed
+        )
+        start = time.perf_counter()
+        for _ in gen:
+            pass
+        elapsed = time.perf_counter() - start
+        stats = gen.replay_stats()
+        print(f"speed {speed:>9,}x: {elapsed:.2f}s (ideal {max(span / speed, base * len(data)):.2f}s), "
+              f"achieved {stats['achieved_speed']:,.0f}x, max lag {stats['max_lag_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
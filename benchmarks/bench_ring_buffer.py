@@ -0,0 +1,77 @@
+"""Benchmark: sliding-window storage, list.pop(0) vs. RingBuffer.
+
+Scales the window (``past_size``) from 10 to 10,000 and reports the cost of
+one append/evict step of the raw storage, and of a full PastForecastBatcher
+message (which also pays for copying the window out).
+
+Usage:
+    python benchmarks/bench_ring_buffer.py --steps 200000
+"""
+import argparse
+import time
+
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.ring_buffer import RingBuffer
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+class _SyntheticDataset:
+    def __init__(self, n):
+        self.n = n
+
+    def take(self, n):
+        return (({"a": float(i), "b": float(i)}, float(i)) for i in range(min(n, self.n)))
+
+
+def _slide_list(size, steps):
+    buffer = list(range(size))
+    start = time.perf_counter()
+    for i in range(steps):
+        buffer.append(i)
+        buffer.pop(0)
+    return time.perf_counter() - start
+
+
+def _slide_ring(size, steps):
+    buffer = RingBuffer(size + 1)
+    for i in range(size):
+        buffer.append(i)
+    start = time.perf_counter()
+    for i in range(steps):
+        buffer.append(i)
+        buffer.popleft()
+    return time.perf_counter() - start
+
+
+def _slide_batcher(size, messages):
+    n = size + messages + 1
+    batcher = PastForecastBatcher(_SyntheticDataset(n), past_size=size, n_instances=n)
+    start = time.perf_counter()
+    for _ in range(messages):
+        batcher.get_message()
+    elapsed = time.perf_counter() - start
+    batcher.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200_000,
+                        help="Slide steps per storage measurement")
+    parser.add_argument("--messages", type=int, default=200,
+                        help="Messages per PastForecastBatcher measurement")
+    args = parser.parse_args()
+
+    print(f"{'past_size':>9} {'list ns/step':>13} {'ring ns/step':>13} {'batcher us/msg':>15}")
+    for size in SIZES:
+        list_s = _slide_list(size, args.steps)
+        ring_s = _slide_ring(size, args.steps)
+        batch_s = _slide_batcher(size, args.messages)
+        print(f"{size:>9} {list_s / args.steps * 1e9:>13.0f} "
+              f"{ring_s / args.steps * 1e9:>13.0f} "
+              f"{batch_s / args.messages * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: per-worker cost of sharded CSV reading.
+
+Times one worker draining its shard of a CSV file, for contiguous and
+round-robin shards, against every worker parsing the whole file and keeping
+every num_shards-th row.
+
+Usage:
+    python benchmarks/bench_sharding.py --rows 1000000 --shards 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from fluvialgen.benchmark import write_synthetic_csv
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+
+
+def _drain(make, chunk):
+    start = time.perf_counter()
+    gen = make()
+    n = sum(len(rows) for rows in gen.iter_chunks(chunk))
+    return time.perf_counter() - start, n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        write_synthetic_csv(path, args.rows)
+
+        def make(**kwargs):
+            return CSVDatasetGenerator(path, target_column="target", parse_dates=["moment"],
+                                       chunksize=args.chunksize, **kwargs)
+
+        # chunksize is a multiple of the shard count, so slicing each chunk keeps every k-th row
+        start = time.perf_counter()
+        kept = sum(len(rows[::args.shards]) for rows in make().iter_chunks(args.chunksize))
+        print(f"full parse, filter by hand   {time.perf_counter() - start:7.2f}s  ({kept} rows)")
+
+        last = args.shards - 1
+        for label, kwargs in (
+            ("contiguous", {}),
+            ("contiguous, row index", {"index": True}),
+            ("round_robin", {"shard_mode": "round_robin"}),
+        ):
+            elapsed, n = _drain(lambda: make(shard_id=last, num_shards=args.shards, **kwargs),
+                                args.chunksize)
+            print(f"{label:<28} {elapsed:7.2f}s  ({n} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,19 @@ from .movingwindow_generator import MovingWindowBatcher
 from .past_forecast_batcher import PastForecastBatcher
 from .csv_dataset_generator import CSVDatasetGenerator
 from .csv_past_forecast_batcher import CSVPastForecastBatcher
+from .csv_index import CSVRowIndex
+from .multi_csv_dataset_generator import MultiCSVDatasetGenerator
+from .parquet_dataset_generator import ParquetDatasetGenerator
+from .parquet_past_forecast_batcher import ParquetPastForecastBatcher
+from .instrumentation import GeneratorStats
+from .pacing import EventTimePacer, Pacer
+from .parallel_runner import ParallelRunner
+from .prefetch_generator import PrefetchGenerator
+from .ring_buffer import ArrayRingBuffer, RingBuffer
+from .schema import FeatureSchema, Record
+from .tee import Tee, TeeBranch
+from .window_store import ColumnarStore, WindowBatch
+from .output_formats import OutputFormat, get_output_format, register_output_format
 
 __all__ = [
     "BaseGenerator",
@@ -15,4 +28,24 @@ __all__ = [
     "PastForecastBatcher",
     "CSVDatasetGenerator",
     "CSVPastForecastBatcher",
+    "CSVRowIndex",
+    "MultiCSVDatasetGenerator",
+    "ParquetDatasetGenerator",
+    "ParquetPastForecastBatcher",
+    "Pacer",
+    "EventTimePacer",
+    "GeneratorStats",
+    "PrefetchGenerator",
+    "ParallelRunner",
+    "RingBuffer",
+    "ArrayRingBuffer",
+    "OutputFormat",
+    "get_output_format",
+    "register_output_format",
+    "FeatureSchema",
+    "Record",
+    "Tee",
+    "TeeBranch",
+    "ColumnarStore",
+    "WindowBatch",
 ]
\ No newline at end of file
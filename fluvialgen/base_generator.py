@@ -1,31 +1,334 @@
+import asyncio
 import time
 from abc import ABC, abstractmethod
+
+from fluvialgen.instrumentation import GeneratorStats
+from fluvialgen.pacing import EventTimePacer, Pacer
+
+# Returned by _next_message instead of raising StopIteration, which cannot
+# cross an executor future
+_EXHAUSTED = object()
+
+SHARD_MODES = ("contiguous", "round_robin")
+
+
 class BaseGenerator(ABC):
+    # Whether messages are windows assembled from several source items
+    _emits_windows = False
+
     def __init__(self, stream_period=0, timeout=30000):
+        """
+        Args:
+            stream_period: Delay between consecutive messages in ms (fractions
+                allowed), or a Pacer for a rate in messages per second or a
+                catch-up policy. 0 disables pacing.
+            timeout: Maximum wait time (ms)
+        """
         self.stream_period = stream_period
         self.timeout = timeout
         self.last_message_time = time.time()
         self._count = 0
+        self.replay_column = None
+        self.replayer = None
+        self._event_time = None
+        self._stats = None
+        self._drained = False
+        self.shard_id = 0
+        self.num_shards = 1
+        self.shard_mode = "contiguous"
+
     def __iter__(self):
         return self
 
+    @property
+    def stream_period(self):
+        return self._stream_period
+
+    @stream_period.setter
+    def stream_period(self, value):
+        # Messages are scheduled on absolute deadlines, see fluvialgen.pacing
+        self._stream_period = value
+        if isinstance(value, Pacer):
+            self.pacer = value
+        else:
+            self.pacer = Pacer(period_ms=value) if value and value > 0 else None
+
     def __next__(self): # Python 2: def next(self)
-        if self.stream_period > 0:
-            if time.time() - self.last_message_time < self.stream_period / 1000:
-                time.sleep(
-                    self.stream_period / 1000
-                    - (
-                            (time.time() - self.last_message_time)
-                            % (self.stream_period / 1000)
-                    )
-                )
+        stats = self._stats
+        if self.pacer is not None:
+            if stats is None:
+                self.pacer.wait()
+            else:
+                start = time.perf_counter_ns()
+                self.pacer.wait()
+                stats.sleep_ns += time.perf_counter_ns() - start
         start_time = time.time()
         self.last_message_time = start_time
+        if stats is not None:
+            stats.begin()
         try:
             return None
         except Exception as e:
             raise StopIteration
 
+    def next_batch(self, n):
+        """
+        Returns up to ``n`` messages in one call.
+
+        Fewer than ``n`` are returned at the end of the stream, and an empty
+        list once it is exhausted. When the stream is not paced, replayed or
+        instrumented, the per-message bookkeeping of ``__next__`` is skipped,
+        and sources read their rows in bulk.
+        """
+        if n <= 0:
+            raise ValueError("n must be a positive integer")
+        if self._drained:
+            return []
+        if self.pacer is None and self.replayer is None and self._stats is None:
+            messages = self._bulk_messages(n)
+            self.last_message_time = time.time()
+        else:
+            messages = []
+            try:
+                for _ in range(n):
+                    messages.append(next(self))
+            except StopIteration:
+                pass
+        if len(messages) < n:
+            self._drained = True
+        return messages
+
+    def iter_chunks(self, n):
+        """Yields lists of up to ``n`` messages until the stream is exhausted."""
+        while True:
+            chunk = self.next_batch(n)
+            if chunk:
+                yield chunk
+            if self._drained:
+                return
+
+    def _bulk_messages(self, n):
+        """
+        Up to ``n`` messages from ``get_message`` without pacing or stats.
+        Sources override it with a native bulk read.
+        """
+        messages = []
+        append = messages.append
+        get_message = self.get_message
+        try:
+            for _ in range(n):
+                append(get_message())
+        except StopIteration:
+            pass
+        return messages
+
+    def state_dict(self):
+        """
+        Returns a picklable snapshot of the stream position.
+
+        Sources add their offset into the data and batchers their window
+        buffer, so that ``load_state_dict`` on a freshly built generator with
+        the same arguments resumes with the same next message.
+        """
+        return {"generator": type(self).__name__, "count": self._count}
+
+    def load_state_dict(self, state):
+        """Restores a position saved by ``state_dict``; call it before iterating."""
+        if state.get("generator") != type(self).__name__:
+            raise ValueError(
+                f"State was saved by {state.get('generator')}, not {type(self).__name__}"
+            )
+        self._count = state["count"]
+
+    def _pacing_delay(self):
+        """Seconds to wait before the next message to honour stream_period."""
+        if self.pacer is not None:
+            return self.pacer.delay()
+        return 0.0
+
+    def pacing_stats(self):
+        """Requested vs achieved message rate, or None if the stream is not paced."""
+        return self.pacer.stats() if self.pacer is not None else None
+
+    def _init_replay(self, replay_column, replay_speed=1.0):
+        """
+        Enables event-time replay: messages are released at the pace of the
+        gaps between consecutive values of ``replay_column``, ``replay_speed``
+        times faster than real time.
+        """
+        if replay_column is None:
+            return
+        self.replay_column = replay_column
+        self.replayer = EventTimePacer(speed=replay_speed)
+
+    def _init_shards(self, shard_id=0, num_shards=1, shard_mode="contiguous"):
+        """
+        Validates the sharding options. Sources apply them when opening their
+        data, so that each shard only reads its own share: a contiguous block
+        of rows, or every ``num_shards``-th row starting at ``shard_id``.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be >= 1")
+        if not 0 <= shard_id < num_shards:
+            raise ValueError(f"shard_id must be in [0, {num_shards})")
+        if shard_mode not in SHARD_MODES:
+            raise ValueError(f"Unknown shard_mode '{shard_mode}', expected one of {SHARD_MODES}")
+        if shard_mode == "round_robin" and num_shards > 1 and self._emits_windows:
+            raise ValueError("round_robin shards would break up windows; use contiguous shards")
+        self.shard_id = shard_id
+        self.num_shards = num_shards
+        self.shard_mode = shard_mode
+
+    def _shard_overlap(self):
+        """Rows a message needs after the row it starts at (0 for plain sources)."""
+        return 0
+
+    def _shard_range(self, total):
+        """
+        Rows [start, stop) of ``total`` read by this contiguous shard.
+
+        The positions messages start at are split evenly between shards. Every
+        shard but the last also reads the ``_shard_overlap()`` rows its last
+        windows extend into, so no window is lost or emitted twice.
+        """
+        overlap = self._shard_overlap()
+        starts = max(total - overlap, 0)
+        low = self.shard_id * starts // self.num_shards
+        if self.shard_id == self.num_shards - 1:
+            return low, total
+        high = (self.shard_id + 1) * starts // self.num_shards
+        return low, high + overlap if high > low else low
+
+    def _observe(self, x):
+        """Records the event time of a row just pulled from the source."""
+        if self.replayer is not None:
+            self._event_time = x[self.replay_column]
+
+    def _release(self, message):
+        """Holds a message back until its event time is due when replaying."""
+        stats = self._stats
+        if stats is not None:
+            self._stats_end()
+        if self.replayer is not None and self._event_time is not None:
+            if stats is None:
+                self.replayer.wait(self._event_time)
+            else:
+                start = time.perf_counter_ns()
+                self.replayer.wait(self._event_time)
+                stats.sleep_ns += time.perf_counter_ns() - start
+        return message
+
+    def replay_stats(self):
+        """Requested vs achieved replay speed, or None if not replaying."""
+        return self.replayer.stats() if self.replayer is not None else None
+
+    def enable_stats(self, callback=None, every=1000):
+        """
+        Starts collecting counters and timers for this generator.
+
+        Args:
+            callback: Called with a ``stats()`` snapshot every ``every``
+                messages, e.g. to push metrics to a monitoring system
+            every: Message interval between callback invocations
+        """
+        self._stats = GeneratorStats(callback=callback, every=every)
+
+    def disable_stats(self):
+        """Stops collecting stats and discards the collected values."""
+        self._stats = None
+
+    def stats(self):
+        """
+        Snapshot of the collected counters and timers, or None if stats are
+        not enabled. See ``fluvialgen.instrumentation.GeneratorStats``.
+        """
+        if self._stats is None:
+            return None
+        return self._stats.snapshot(self._buffer_occupancy())
+
+    def _buffer_occupancy(self):
+        """(used, capacity) of the generator's buffer, or None if it has none."""
+        buffer = getattr(self, "buffer", None)
+        if buffer is None:
+            return None
+        return len(buffer), getattr(buffer, "capacity", None)
+
+    def _stats_end(self):
+        if self._stats.end(self._emits_windows):
+            self._stats.callback(self.stats())
+
+    def _timed_fetch(self, fn, *args):
+        """Calls fn(*args), recording the time as source fetch time."""
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        stats = self._stats
+        stats.fetch_ns += time.perf_counter_ns() - start
+        stats.source_items += 1
+        return result
+
+    def _timed_convert(self, fn, *args):
+        """Calls fn(*args), recording the time as output conversion time."""
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        self._stats.convert_ns += time.perf_counter_ns() - start
+        return result
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """
+        Async counterpart of ``__next__`` for use with ``async for``.
+
+        Pacing awaits ``asyncio.sleep`` instead of blocking the event loop, and
+        ``get_message`` (which may parse files or read datasets) runs in the
+        loop's default executor. Messages of one generator are still produced
+        one at a time and in order.
+        """
+        delay = self._pacing_delay()
+        if delay > 0:
+            await self._asleep(delay)
+        self.last_message_time = time.time()
+        loop = asyncio.get_running_loop()
+        message = await loop.run_in_executor(None, self._next_message)
+        if message is _EXHAUSTED:
+            raise StopAsyncIteration
+        if self.replayer is not None and self._event_time is not None:
+            delay = self.replayer.delay(self._event_time)
+            if delay > 0:
+                await self._asleep(delay)
+        return message
+
+    async def _asleep(self, delay):
+        if self._stats is None:
+            await asyncio.sleep(delay)
+        else:
+            start = time.perf_counter_ns()
+            await asyncio.sleep(delay)
+            self._stats.sleep_ns += time.perf_counter_ns() - start
+
+    def _next_message(self):
+        if self._stats is not None:
+            self._stats.begin()
+        try:
+            message = self.get_message()
+        except StopIteration:
+            return _EXHAUSTED
+        if self._stats is not None:
+            self._stats_end()
+        return message
+
+    @classmethod
+    async def acreate(cls, *args, **kwargs):
+        """
+        Builds the generator in the default executor and returns it.
+
+        Use it from async code for generators whose constructor does blocking
+        work, such as parsing a whole CSV file.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: cls(*args, **kwargs))
+
     def stop(self):
         """Function to be called when stream is finished."""
         pass
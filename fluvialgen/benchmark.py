@@ -0,0 +1,286 @@
+"""
+Reproducible throughput, latency and memory benchmarks for the generators.
+
+Run the suite on synthetic data and write the results as JSON::
+
+    python -m fluvialgen.benchmark run --rows 100000 --output results.json
+
+Compare two result files and flag regressions (exit status 1 if any)::
+
+    python -m fluvialgen.benchmark compare baseline.json results.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+
+SCHEMA_VERSION = 1
+
+# Whether a larger value of a metric is better; used by compare
+HIGHER_IS_BETTER = {
+    "rows_per_sec": True,
+    "messages_per_sec": True,
+    "startup_s": False,
+    "first_row_s": False,
+    "latency_p50_us": False,
+    "latency_p90_us": False,
+    "latency_p99_us": False,
+    "latency_max_us": False,
+    "peak_memory_mb": False,
+}
+
+
+class SyntheticDataset:
+    """In-memory River-style dataset of gauge-like rows with a ``take`` method."""
+
+    def __init__(self, n_rows: int, n_features: int = 5, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        values = rng.normal(size=(n_rows, n_features))
+        start = datetime(2024, 1, 1)
+        self.rows = [
+            ({"moment": start + timedelta(minutes=i), **{f"f{j}": float(v) for j, v in enumerate(row)}},
+             float(row.sum()))
+            for i, row in enumerate(values)
+        ]
+
+    def take(self, n: int):
+        return iter(self.rows[:n])
+
+
+def write_synthetic_csv(path: str, n_rows: int, n_features: int = 5, seed: int = 0):
+    """Writes a CSV with a timestamp column, numeric features and a ``target`` column."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=[f"f{j}" for j in range(n_features)])
+    df.insert(0, "moment", pd.date_range("2024-01-01", periods=n_rows, freq="min"))
+    df["target"] = df.iloc[:, 1:].sum(axis=1)
+    df.to_csv(path, index=False)
+
+
+def _latencies(generator) -> np.ndarray:
+    """Drains a generator and returns the time each message took, in ns."""
+    samples = []
+    append = samples.append
+    clock = time.perf_counter_ns
+    while True:
+        start = clock()
+        try:
+            next(generator)
+        except StopIteration:
+            break
+        append(clock() - start)
+    return np.asarray(samples, dtype=np.int64)
+
+
+def _peak_memory_mb(fn: Callable[[], None]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _stream_metrics(make: Callable, unit: str, repeat: int) -> Dict[str, float]:
+    """Throughput and latency percentiles (best of ``repeat``) plus peak memory."""
+    best = None
+    for _ in range(repeat):
+        generator = make()
+        start = time.perf_counter()
+        samples = _latencies(generator)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, samples)
+    elapsed, samples = best
+    metrics = {
+        unit: len(samples) / elapsed if elapsed > 0 else 0.0,
+        "messages": int(len(samples)),
+    }
+    if len(samples):
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99]) / 1e3
+        metrics.update(latency_p50_us=p50, latency_p90_us=p90, latency_p99_us=p99,
+                       latency_max_us=samples.max() / 1e3)
+    metrics["peak_memory_mb"] = _peak_memory_mb(lambda: _latencies(make()))
+    return metrics
+
+
+def bench_csv(path: str, repeat: int) -> Dict[str, dict]:
+    """CSVDatasetGenerator startup time, rows/sec, latency and memory, eager and chunked."""
+    results = {}
+    for name, kwargs in (("csv_eager", {}), ("csv_chunked", {"chunksize": 10_000})):
+        def make():
+            return CSVDatasetGenerator(path, target_column="target", parse_dates=["moment"], **kwargs)
+
+        startup = min(_timed(make) for _ in range(repeat))
+        first_row = min(_timed(lambda: next(make())) for _ in range(repeat))
+        metrics = _stream_metrics(make, "rows_per_sec", repeat)
+        metrics.update(startup_s=startup, first_row_s=first_row)
+        results[name] = metrics
+    return results
+
+
+def bench_batchers(dataset: SyntheticDataset, window_sizes: List[int], repeat: int) -> Dict[str, dict]:
+    """MovingWindowBatcher and PastForecastBatcher messages/sec across window sizes."""
+    n = len(dataset.rows)
+    results = {}
+    for size in window_sizes:
+        results[f"moving_window_{size}"] = _stream_metrics(
+            lambda: MovingWindowBatcher(dataset=dataset, instance_size=size, batch_size=4, n_instances=n),
+            "messages_per_sec", repeat,
+        )
+        results[f"past_forecast_{size}"] = _stream_metrics(
+            lambda: PastForecastBatcher(dataset=dataset, past_size=size, forecast_size=1, n_instances=n),
+            "messages_per_sec", repeat,
+        )
+    return results
+
+
+def _timed(fn: Callable) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_suite(rows: int = 100_000, window_sizes: Optional[List[int]] = None, repeat: int = 3,
+              workdir: Optional[str] = None) -> dict:
+    """
+    Runs every benchmark and returns the results as a JSON-serializable dict.
+
+    Args:
+        rows: Number of synthetic rows for each source
+        window_sizes: Window (instance/past) sizes for the batcher benchmarks
+        repeat: Runs per timing; the best one is kept
+        workdir: Directory for the synthetic CSV (a temporary one by default)
+    """
+    window_sizes = window_sizes or [8, 32, 128]
+    own_dir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="fluvialgen-bench-")
+    try:
+        path = os.path.join(workdir, "synthetic.csv")
+        write_synthetic_csv(path, rows)
+        results = bench_csv(path, repeat)
+        results.update(bench_batchers(SyntheticDataset(rows), window_sizes, repeat))
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "rows": rows,
+            "window_sizes": window_sizes,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> List[dict]:
+    """
+    Compares two result sets metric by metric.
+
+    Returns one row per metric present in both, with the relative change
+    (positive means better) and whether it is a regression, i.e. worse by
+    more than ``threshold``.
+    """
+    rows = []
+    for bench, metrics in sorted(current["results"].items()):
+        old_metrics = baseline["results"].get(bench)
+        if old_metrics is None:
+            continue
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            if metric not in metrics or metric not in old_metrics or not old_metrics[metric]:
+                continue
+            old, new = old_metrics[metric], metrics[metric]
+            change = (new - old) / old
+            if not higher_is_better:
+                change = -change
+            rows.append({
+                "benchmark": bench,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": change < -threshold,
+            })
+    return rows
+
+
+def _print_results(results: dict):
+    for bench, metrics in results["results"].items():
+        shown = ", ".join(
+            f"{k}={v:,.3g}" for k, v in metrics.items() if k in HIGHER_IS_BETTER
+        )
+        print(f"{bench:<20} {shown}")
+
+
+def _print_comparison(rows: List[dict]):
+    print(f"{'benchmark':<20} {'metric':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark']:<20} {row['metric']:<16} {row['baseline']:>12,.3g} "
+              f"{row['current']:>12,.3g} {row['change']:>+7.1%}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m fluvialgen.benchmark", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--rows", type=int, default=100_000)
+    run.add_argument("--window-sizes", type=int, nargs="+", default=[8, 32, 128])
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--output", "-o", help="JSON file to write (default: stdout)")
+
+    cmp = sub.add_parser("compare", help="compare two JSON result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.1,
+                     help="relative slowdown reported as a regression (default: 0.1)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run_suite(rows=args.rows, window_sizes=args.window_sizes, repeat=args.repeat)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            _print_results(results)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    _print_comparison(rows)
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Memory-mapped binary cache of parsed CSV columns."""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_SAMPLE_BYTES = 1 << 20
+
+
+def source_fingerprint(filepath: str) -> dict:
+    """
+    Returns the size, mtime and a sampled content hash of a file.
+
+    The hash covers the first and last MiB of the file, which catches in-place
+    rewrites that keep size and mtime without reading multi-GB files in full.
+    """
+    stat = os.stat(filepath)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        digest.update(f.read(_SAMPLE_BYTES))
+        if stat.st_size > _SAMPLE_BYTES:
+            f.seek(max(_SAMPLE_BYTES, stat.st_size - _SAMPLE_BYTES))
+            digest.update(f.read(_SAMPLE_BYTES))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sample_hash": digest.hexdigest()}
+
+
+class CSVCache:
+    """
+    An on-disk cache of the typed columns parsed from a CSV file.
+
+    Each cached column is a raw binary file that is memory-mapped on load.
+    Numeric columns are stored as is, datetimes as int64 nanoseconds and all
+    other (object) columns as integer codes into a pickled list of values.
+    A ``meta.json`` file written last records the cache key; if the source
+    file or the parsing arguments change, the key no longer matches and the
+    cache is rebuilt.
+
+    Args:
+        filepath: Path to the source CSV file
+        options: Parsing arguments that affect the cached content
+        cache_dir: Directory for the cache. If None, the cache is stored next
+                   to the source file.
+    """
+
+    VERSION = 1
+
+    def __init__(self, filepath: str, options: dict, cache_dir: Optional[str] = None):
+        self.filepath = filepath
+        base = os.path.basename(os.path.abspath(filepath))
+        if cache_dir is None:
+            cache_dir = os.path.dirname(os.path.abspath(filepath))
+        self.directory = os.path.join(cache_dir, base + ".fgcache")
+        self.key = {
+            "version": self.VERSION,
+            "source": source_fingerprint(filepath),
+            "options": options,
+        }
+
+    def load(self) -> Optional["CachedColumns"]:
+        """Returns the cached columns, or None if the cache is missing or stale."""
+        try:
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != json.loads(json.dumps(self.key)):
+            return None
+        return CachedColumns(self.directory, meta)
+
+    def writer(self, header: List[str], columns: List[str]) -> "CacheWriter":
+        """Returns a writer that stores ``columns`` of the parsed frames."""
+        return CacheWriter(self, header, columns)
+
+
+class CachedColumns:
+    """Memory-mapped columns loaded from a CSVCache."""
+
+    def __init__(self, directory: str, meta: dict):
+        self.header = meta["header"]
+        self.rows = meta["rows"]
+        self._columns = []
+        for info in meta["columns"]:
+            path = os.path.join(directory, info["file"])
+            dtype = np.dtype(info["storage"])
+            if self.rows == 0:
+                data = np.empty(0, dtype=dtype)
+            else:
+                data = np.memmap(path, dtype=dtype, mode="r", shape=(self.rows,))
+            categories = None
+            if info["kind"] == "category":
+                with open(path + ".values", "rb") as f:
+                    categories = np.array(pickle.load(f) + [np.nan], dtype=object)
+            self._columns.append((info, data, categories))
+
+    @property
+    def columns(self) -> List[str]:
+        return [info["name"] for info, _, _ in self._columns]
+
+    def frame(self, start: int, stop: int, step: int = 1) -> pd.DataFrame:
+        """Rebuilds rows [start, stop) (every ``step``-th) as a DataFrame with the original dtypes."""
+        data = {}
+        for info, values, categories in self._columns:
+            values = values[start:stop:step]
+            if info["kind"] == "numeric":
+                data[info["name"]] = np.asarray(values)
+            elif info["kind"] == "datetime":
+                series = pd.Series(np.asarray(values).view(info["dtype"]))
+                if info["tz"] is not None:
+                    series = series.dt.tz_localize("UTC").dt.tz_convert(info["tz"])
+                data[info["name"]] = series.to_numpy() if info["tz"] is None else series.array
+            else:
+                # Code -1 (missing) maps to the trailing NaN category
+                data[info["name"]] = categories[np.asarray(values)]
+        return pd.DataFrame(data, columns=self.columns)
+
+    def frames(self, chunksize: int, start: int = 0, stop: Optional[int] = None,
+               step: int = 1) -> Iterator[pd.DataFrame]:
+        """Yields consecutive DataFrames of at most ``chunksize`` rows over rows [start, stop), every ``step``-th."""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        span = chunksize * step
+        for start in range(start, stop, span):
+            yield self.frame(start, min(start + span, stop), step)
+
+
+class CacheWriter:
+    """
+    Appends parsed frames to a new cache and publishes it on ``commit``.
+
+    If the frames disagree on a column dtype (which can happen across chunks),
+    or a column type cannot be stored, the writer gives up and the cache is
+    simply not created.
+    """
+
+    def __init__(self, cache: CSVCache, header: List[str], columns: List[str]):
+        self.cache = cache
+        self.header = list(header)
+        self.columns = list(columns)
+        self.rows = 0
+        self.failed = False
+        self._tmp = f"{cache.directory}.tmp-{os.getpid()}"
+        self._infos = None
+        self._files = []
+        self._categories = []
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        os.makedirs(self._tmp)
+
+    @staticmethod
+    def _describe(series: pd.Series) -> Optional[dict]:
+        dtype = series.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            return {"kind": "datetime", "dtype": f"datetime64[{dtype.unit}]", "tz": str(dtype.tz),
+                    "storage": "int64"}
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Stored like strings; the codes are remapped to the cache's own categories
+            return {"kind": "category", "dtype": "object", "tz": None, "storage": "int64"}
+        if not isinstance(dtype, np.dtype):
+            return None
+        if dtype.kind in "biuf":
+            return {"kind": "numeric", "dtype": dtype.str, "tz": None, "storage": dtype.str}
+        if dtype.kind == "M":
+            return {"kind": "datetime", "dtype": dtype.str, "tz": None, "storage": "int64"}
+        if dtype.kind == "O":
+            return {"kind": "category", "dtype": "object", "tz": None, "storage": "int64"}
+        return None
+
+    def append(self, df: pd.DataFrame):
+        """Adds the rows of a parsed frame to the cache."""
+        if self.failed:
+            return
+        infos = [self._describe(df[col]) for col in self.columns]
+        if self._infos is None:
+            if any(info is None for info in infos):
+                return self.abort()
+            self._infos = infos
+            for i, info in enumerate(infos):
+                info["name"] = self.columns[i]
+                info["file"] = f"{i}.bin"
+                self._files.append(open(os.path.join(self._tmp, info["file"]), "wb"))
+                self._categories.append({} if info["kind"] == "category" else None)
+        elif any(
+            info is None or info["dtype"] != known["dtype"] or info["tz"] != known["tz"]
+            for info, known in zip(infos, self._infos)
+        ):
+            return self.abort()
+
+        for info, f, categories, col in zip(self._infos, self._files, self._categories, self.columns):
+            series = df[col]
+            if info["kind"] == "numeric":
+                values = series.to_numpy()
+            elif info["kind"] == "datetime":
+                if info["tz"] is not None:
+                    series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                values = series.to_numpy().view("int64")
+            else:
+                # Factorize the chunk, then map its uniques onto the global codes
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                mapping = np.array(
+                    [categories.setdefault(value, len(categories)) for value in uniques] + [-1],
+                    dtype=np.int64,
+                )
+                values = mapping[codes]
+            f.write(np.ascontiguousarray(values).tobytes())
+        self.rows += len(df)
+
+    def commit(self):
+        """Publishes the cache by writing its metadata and moving it into place."""
+        if self.failed:
+            return
+        if self._infos is None:
+            # No frame was appended (empty file); nothing worth caching
+            return self.abort()
+        for f in self._files:
+            f.close()
+        for info, categories in zip(self._infos, self._categories):
+            if categories is not None:
+                with open(os.path.join(self._tmp, info["file"] + ".values"), "wb") as f:
+                    pickle.dump(list(categories), f)
+        meta = {
+            "key": self.cache.key,
+            "header": self.header,
+            "rows": self.rows,
+            "columns": self._infos,
+        }
+        with open(os.path.join(self._tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        shutil.rmtree(self.cache.directory, ignore_errors=True)
+        os.replace(self._tmp, self.cache.directory)
+
+    def abort(self):
+        """Discards everything written so far."""
+        self.failed = True
+        for f in self._files:
+            f.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
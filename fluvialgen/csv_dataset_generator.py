@@ -1,10 +1,51 @@
+import itertools
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
-from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.csv_cache import CSVCache
+from fluvialgen.csv_index import CSVRowIndex, _line_offset
+from fluvialgen.tabular_source import TabularSourceMixin
+
+# Files pandas decompresses on the fly; their byte offsets cannot be seeked to
+_COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zip", ".xz", ".zst", ".tar")
+
+# Rows parsed to infer dtype_plan="auto"
+_PLAN_SAMPLE_ROWS = 10_000
+
+
+def _infer_dtype_plan(sample: pd.DataFrame, category_ratio: float = 0.5) -> Dict[str, str]:
+    """
+    Proposes compact dtypes for the columns of a parsed sample: float32 for
+    float64 columns, int64 epoch nanoseconds for datetimes and categorical
+    codes for string columns with at most ``category_ratio`` distinct values
+    per row.
+    """
+    plan = {}
+    for col in sample.columns:
+        series = sample[col]
+        if series.dtype == np.float64:
+            plan[col] = "float32"
+        elif series.dtype.kind == "M" or isinstance(series.dtype, pd.DatetimeTZDtype):
+            plan[col] = "epoch"
+        elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+            values = series.dropna()
+            if values.nunique() <= category_ratio * len(values):
+                plan[col] = "category"
+    return plan
+
+
+def _plan_spec(spec) -> str:
+    """Normalizes a dtype plan entry to a string (a pandas dtype, "category" or "epoch")."""
+    if spec in ("category", "epoch"):
+        return spec
+    return str(pd.api.types.pandas_dtype(spec))
 
 
-class CSVDatasetGenerator(BaseGenerator):
+class CSVDatasetGenerator(TabularSourceMixin, BaseGenerator):
     """
     Stream-like generator over a CSV file that yields (x, y) tuples.
     Uses the same Base (BaseGenerator) timing/iteration behavior as other generators.
@@ -22,81 +63,478 @@ class CSVDatasetGenerator(BaseGenerator):
         columns except the targets will be used.
     parse_dates: Optional[Sequence[str]]
         Column names to parse as dates.
+    chunksize: Optional[int]
+        If given, the CSV is streamed in chunks of this many rows instead of
+        being loaded up front. Rows are emitted as soon as the first chunk is
+        parsed and memory stays bounded by the chunk size.
+    compact_records: bool
+        If True, x (and multi-target y) are emitted as read-only ``Record``
+        mappings sharing one ``FeatureSchema`` instead of per-row dicts.
+    cache: Union[bool, str]
+        Opt-in binary cache of the parsed columns. True stores it next to the
+        CSV file, a string names the cache directory. Later runs memory-map the
+        cache instead of re-parsing; it is rebuilt automatically when the file
+        or the parsing arguments change.
+    index: Union[bool, str]
+        Opt-in sidecar row-offset index (see ``CSVRowIndex``). True stores it
+        next to the CSV file, a string names the index directory. It is built
+        with one scan on first use and makes ``seek``, item access and
+        ``start_row`` jump straight to a row instead of scanning up to it.
+    start_row: int
+        First data row (0-based) to emit. Earlier rows are not parsed.
+    stop_row: Optional[int]
+        Data row at which to stop (exclusive). None reads to the end.
+    shard_id: int
+        Index of this worker's shard, in [0, num_shards).
+    num_shards: int
+        Number of disjoint shards the rows in [start_row, stop_row) are split into.
+        Each shard only parses its own rows.
+    dtype_plan: Optional[Union[str, Dict[str, str]]]
+        Dtypes to parse the used columns with. None keeps pandas' defaults.
+        "auto" infers a compact plan for the feature columns from the first rows:
+        float32 for floats, categorical codes for repeated strings and int64
+        epoch nanoseconds for the ``parse_dates`` columns. Planned numeric
+        columns are emitted as NumPy scalars of their planned dtype. A dict maps columns to a pandas dtype,
+        "category" or "epoch". The resolved plan is kept in ``dtype_plan``.
+    shard_mode: str
+        "contiguous" gives each shard one block of rows (finding the block needs
+        the row count, taken from the index or cache or a newline scan), plus the
+        overlap the past/forecast batchers need. "round_robin" gives it every
+        num_shards-th row and is not available for batchers.
+    replay_column: Optional[str]
+        Timestamp feature column for event-time replay. When given, messages are
+        released at the pace of the gaps between consecutive timestamps instead
+        of a constant period.
+    replay_speed: float
+        Replay speed multiplier (1.0 is the original cadence, 10.0 ten times faster).
     stream_period: int
         Delay between consecutive messages (ms).
     timeout: int
         Maximum wait time (ms). Included for API completeness.
     """
 
+    _source_label = "CSV"
+
     def __init__(
         self,
         filepath: str,
         target_column,  # Can be str or Sequence[str] for multi-target
         feature_columns: Optional[Sequence[str]] = None,
         parse_dates: Optional[Sequence[str]] = None,
+        chunksize: Optional[int] = None,
+        compact_records: bool = False,
+        cache: Union[bool, str] = False,
+        index: Union[bool, str] = False,
+        start_row: int = 0,
+        stop_row: Optional[int] = None,
+        shard_id: int = 0,
+        num_shards: int = 1,
+        shard_mode: str = "contiguous",
+        dtype_plan: Optional[Union[str, Dict[str, str]]] = None,
+        replay_column: Optional[str] = None,
+        replay_speed: float = 1.0,
         stream_period: int = 0,
         timeout: int = 30000,
         **kwargs
     ):
         super().__init__(stream_period=stream_period, timeout=timeout)
         self.filepath = filepath
-        
-        # Handle both single target and multi-target
-        if isinstance(target_column, str):
-            self.target_columns = [target_column]
-            self.is_multi_target = False
-        else:
-            self.target_columns = list(target_column)
-            self.is_multi_target = True
-        
-        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        self._init_columns(target_column, feature_columns, compact_records)
+        self._init_replay(replay_column, replay_speed)
         self.parse_dates = list(parse_dates) if parse_dates is not None else None
+        if chunksize is not None and chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        self.chunksize = chunksize
+        if start_row < 0 or (stop_row is not None and stop_row < start_row):
+            raise ValueError("Expected 0 <= start_row <= stop_row")
+        self._init_shards(shard_id, num_shards, shard_mode)
+        self._compressed = self.filepath.endswith(_COMPRESSED_SUFFIXES)
+        self.row_index: Optional[CSVRowIndex] = None
+        if index:
+            if self._compressed:
+                raise ValueError("A row index needs an uncompressed CSV file")
+            self.row_index = CSVRowIndex.open(self.filepath, index_dir=index if isinstance(index, str) else None)
+        self._reader = None
+        self._cache_writer = None
+        self._handle = None
+        self._line_hint = (0, 0)
+        if dtype_plan is not None and dtype_plan != "auto":
+            if not isinstance(dtype_plan, Mapping):
+                raise ValueError("dtype_plan must be None, 'auto' or a dict of column dtypes")
+            dtype_plan = {col: _plan_spec(spec) for col, spec in dtype_plan.items()}
+
+        store = None
+        cached = None
+        if cache:
+            store = CSVCache(
+                self.filepath,
+                options={
+                    "target_columns": self.target_columns,
+                    "feature_columns": self.feature_columns,
+                    "parse_dates": self.parse_dates,
+                    "dtype_plan": dtype_plan,
+                },
+                cache_dir=cache if isinstance(cache, str) else None,
+            )
+            cached = store.load()
+
+        self._cached = cached
+        if cached is not None:
+            self.header = list(cached.header)
+        else:
+            # Only the header is read up front
+            self.header = list(pd.read_csv(self.filepath, nrows=0).columns)
+        self._resolve_columns(self.header)
+        self._init_projection(dtype_plan)
+
+        self.start_row = start_row
+        self.stop_row = stop_row
+        self._row_step = 1
+        if num_shards > 1:
+            self._apply_shard()
+        start_row, stop_row = self.start_row, self.stop_row
+        # Absolute row of the next message is _base_row + (_count - _base_count) * _row_step
+        self._base_row = start_row
+        self._base_count = 0
+        ranged = start_row > 0 or stop_row is not None or self._row_step > 1
+        if cached is not None:
+            stop = cached.rows if stop_row is None else min(stop_row, cached.rows)
+            if self.chunksize is None:
+                self._data = self._frame_to_rows(cached.frame(start_row, stop, self._row_step))
+                self._iterator = iter(self._data)
+            else:
+                self._iterator = self._iter_chunks(
+                    cached.frames(self.chunksize, start=start_row, stop=stop, step=self._row_step),
+                    planned=True,
+                )
+        elif ranged:
+            # Only the requested rows are parsed; a partial read cannot fill the cache
+            if self.chunksize is None:
+                self._data = self._frame_to_rows(
+                    self._read_range(start_row, stop_row, keep_open=False, step=self._row_step)
+                )
+                self._iterator = iter(self._data)
+            else:
+                self._reader = self._read_range(start_row, stop_row, step=self._row_step)
+                self._iterator = self._iter_chunks(self._reader)
+        elif self.chunksize is None:
+            df = self._planned(self._read_csv(self.filepath))
+            if store is not None:
+                writer = store.writer(self.header, self._used_columns())
+                writer.append(df)
+                writer.commit()
+
+            # Build in-memory list of (x, y) where y can be single value or dict
+            self._data: List[Tuple[dict, Union[float, dict]]] = self._frame_to_rows(df)
+            self._iterator = iter(self._data)
+        else:
+            # Rows are parsed chunk by chunk
+            self._reader = self._read_csv(self.filepath, chunksize=self.chunksize)
+            if store is not None:
+                self._cache_writer = store.writer(self.header, self._used_columns())
+            self._iterator = self._iter_chunks(self._reader)
+
+    def _init_projection(self, dtype_plan):
+        """
+        Restricts parsing to the feature and target columns and resolves the
+        dtype plan. Columns outside them are never converted.
+        """
+        used = self._used_columns()
+        self._usecols = None if set(used) == set(self.header) else used
+        dates = [c for c in self.parse_dates or () if c in used] or None
+        if dtype_plan == "auto":
+            sample = pd.read_csv(self.filepath, usecols=self._usecols, parse_dates=dates,
+                                 nrows=_PLAN_SAMPLE_ROWS)
+            # Targets keep their parsed dtype unless planned explicitly
+            dtype_plan = _infer_dtype_plan(sample[[c for c in used if c not in self.target_columns]])
+        dtype_plan = dict(dtype_plan or {})
+        for col in dtype_plan:
+            if col not in used:
+                raise ValueError(f"dtype_plan column '{col}' is not a feature or target column")
+        self.dtype_plan: Dict[str, str] = dtype_plan
+        self._epoch_columns = [col for col, spec in dtype_plan.items() if spec == "epoch"]
+        self._replay_epoch = self.replay_column in self._epoch_columns
+        # Numeric and categorical dtypes are cast after parsing, which is cheaper than
+        # making the parser produce them; text dtypes must be parsed as such
+        self._cast_dtypes = {}
+        parse_dtypes = {}
+        for col, spec in dtype_plan.items():
+            if spec == "category" or (spec != "epoch" and pd.api.types.pandas_dtype(spec).kind in "biuf"):
+                self._cast_dtypes[col] = spec
+            elif spec != "epoch":
+                parse_dtypes[col] = spec
+        # Epoch columns are parsed as dates, then converted by _planned
+        missing = [col for col in self._epoch_columns if col not in (dates or [])]
+        self._parse_dates = (dates or []) + missing if missing else dates
+        self._parse_dtypes = parse_dtypes or None
+        self._columnwise_values = self._usecols is not None or bool(dtype_plan)
+
+    def _read_csv(self, source, **kwargs):
+        """pd.read_csv restricted to the used columns, with the dtype plan applied."""
+        if self._usecols is not None:
+            kwargs["usecols"] = self._usecols
+        if self._parse_dtypes is not None:
+            kwargs["dtype"] = self._parse_dtypes
+        return pd.read_csv(source, parse_dates=self._parse_dates, **kwargs)
+
+    def _planned(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Casts a parsed frame to the dtype plan; epoch columns become int64
+        nanoseconds since 1970 (UTC).
+        """
+        for col, spec in self._cast_dtypes.items():
+            if df[col].dtype != spec:
+                df[col] = df[col].astype(spec)
+        for col in self._epoch_columns:
+            series = df[col]
+            if series.dtype.kind in "iu":
+                continue  # Already converted (e.g. read back from the cache)
+            if series.dtype == object:
+                series = pd.to_datetime(series)
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+            df[col] = series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return df
+
+    def _apply_shard(self):
+        """Narrows [start_row, stop_row) and the row step to this worker's shard."""
+        if self.shard_mode == "round_robin":
+            self.start_row += self.shard_id
+            if self.stop_row is not None:
+                self.start_row = min(self.start_row, self.stop_row)
+            self._row_step = self.num_shards
+            return
+        stop = self.stop_row
+        if stop is None:
+            stop = self.num_rows
+        start, stop = self._shard_range(max(stop - self.start_row, 0))
+        self.start_row, self.stop_row = self.start_row + start, self.start_row + stop
+
+    def _read_range(self, start: int, stop: Optional[int], keep_open: bool = True, step: int = 1):
+        """
+        Parses data rows start, start + step, ... before stop into a DataFrame,
+        or a chunk reader when streaming. Uncompressed files are opened at the
+        row's byte offset; the handle stays open (in ``_handle``) while a chunk
+        reader uses it. Skipped rows are split into fields but not converted.
+        """
+        nrows = None if stop is None else max(-(-(stop - start) // step), 0)
+        chunksize = self.chunksize if keep_open else None
+        if self._compressed:
+            if step == 1:
+                skiprows = range(1, start + 1)
+            else:
+                def skiprows(line):
+                    return 0 < line and (line <= start or (line - 1 - start) % step != 0)
+            result = self._read_csv(self.filepath, chunksize=chunksize, skiprows=skiprows, nrows=nrows)
+            return result if chunksize is not None else self._planned(result)
+        options = {} if step == 1 else {"skiprows": lambda line: line % step != 0}
+        handle = open(self.filepath, "rb")
+        try:
+            handle.seek(self._byte_offset(start))
+            result = self._read_csv(
+                handle, header=None, names=self.header, chunksize=chunksize, nrows=nrows, **options
+            )
+        except BaseException:
+            handle.close()
+            raise
+        if chunksize is None:
+            handle.close()
+            return self._planned(result)
+        self._handle = handle
+        return result
 
-        df = pd.read_csv(self.filepath, parse_dates=self.parse_dates)
+    def _byte_offset(self, row: int) -> int:
+        """Byte offset where data row ``row`` starts (line 0 is the header)."""
+        if self.row_index is not None:
+            return self.row_index.offset(row)
+        # Without an index, scan forward from the last known position when possible
+        hint = self._line_hint if self._line_hint[0] <= row + 1 else (0, 0)
+        offset = _line_offset(self.filepath, row + 1, hint)
+        self._line_hint = (row + 1, offset)
+        return offset
 
-        # Validate target columns
-        for col in self.target_columns:
-            if col not in df.columns:
-                raise ValueError(f"Target column '{col}' not found in CSV")
+    @property
+    def position(self) -> int:
+        """Absolute (0-based) data row of the next message."""
+        return self._base_row + (self._count - self._base_count) * self._row_step
 
-        if self.feature_columns is None:
-            self.feature_columns = [c for c in df.columns if c not in self.target_columns]
+    @property
+    def num_rows(self) -> int:
+        """Number of data rows in the whole file (regardless of start_row/stop_row)."""
+        if self.row_index is not None:
+            return self.row_index.rows
+        if self._cached is not None:
+            return self._cached.rows
+        if hasattr(self, "_data") and self.start_row == 0 and self.stop_row is None and self._row_step == 1:
+            return len(self._data)
+        if self._compressed:
+            return sum(len(chunk) for chunk in pd.read_csv(self.filepath, usecols=[0], chunksize=1 << 16))
+        # Keep the scan as an in-memory index for later lookups
+        self.row_index = CSVRowIndex.build(self.filepath)
+        return self.row_index.rows
+
+    def seek(self, row: int):
+        """
+        Repositions the stream so that the next message is data row ``row``
+        (0-based, absolute). It must lie within [start_row, stop_row], and in
+        a round-robin shard be one of its rows; with a row index the jump costs
+        the same anywhere in the file.
+        """
+        stop = self.stop_row
+        if row < self.start_row or (stop is not None and row > stop):
+            raise IndexError(f"Row {row} is outside [{self.start_row}, {stop}]")
+        if (row - self.start_row) % self._row_step:
+            raise ValueError(f"Row {row} does not belong to shard {self.shard_id}")
+        self._open_at(row)
+        self._drained = False
+
+    def _open_at(self, row: int):
+        """Points the row iterator at data row ``row``, keeping the stop_row bound."""
+        if self._cache_writer is not None:
+            # A stream that skips rows never sees the whole file, so it cannot build the cache
+            self._cache_writer.abort()
+            self._cache_writer = None
+        if hasattr(self, "_data"):
+            self._iterator = itertools.islice(self._data, (row - self.start_row) // self._row_step, None)
+        elif self._cached is not None:
+            stop = self._cached.rows if self.stop_row is None else min(self.stop_row, self._cached.rows)
+            self._iterator = self._iter_chunks(
+                self._cached.frames(self.chunksize, start=row, stop=stop, step=self._row_step),
+                planned=True,
+            )
         else:
-            for col in self.feature_columns:
-                if col not in df.columns:
-                    raise ValueError(f"Feature column '{col}' not found in CSV")
-
-        # Build in-memory list of (x, y) where y can be single value or dict
-        self._data: List[Tuple[dict, Union[float, dict]]] = []
-        for _, row in df.iterrows():
-            x = {col: row[col] for col in self.feature_columns}
-            if self.is_multi_target:
-                y = {col: row[col] for col in self.target_columns}
+            self._close_reader()
+            self._reader = self._read_range(row, self.stop_row, step=self._row_step)
+            self._iterator = self._iter_chunks(self._reader)
+        self._base_row = row
+        self._base_count = self._count
+
+    def __getitem__(self, key):
+        """
+        Returns data row ``key`` as an (x, y) tuple, or a list of them for a
+        slice. Indices are absolute rows of the file and negative ones count
+        from its end. Only the requested rows are parsed and the stream
+        position is left untouched.
+        """
+        if isinstance(key, slice):
+            if (key.step is None or key.step > 0) and key.stop is not None and min(
+                    key.start or 0, key.stop) >= 0:
+                rows = range(key.start or 0, key.stop, key.step or 1)
             else:
-                y = row[self.target_columns[0]]
-            self._data.append((x, y))
+                rows = range(*key.indices(self.num_rows))
+            if not rows:
+                return []
+            low, high = min(rows), max(rows) + 1
+            block = self._rows(low, high)
+            return [block[r - low] for r in rows if r - low < len(block)]
+        row = int(key)
+        if row < 0:
+            row += self.num_rows
+        block = self._rows(row, row + 1) if row >= 0 else []
+        if not block:
+            raise IndexError(f"Row {key} is out of range")
+        return block[0]
 
-        self._iterator = iter(self._data)
+    def _rows(self, start: int, stop: int):
+        """Data rows [start, stop) as (x, y) tuples, read without moving the stream."""
+        if hasattr(self, "_data") and self._row_step == 1 and self.start_row <= start and (
+                self.stop_row is None or stop <= self.stop_row):
+            return self._data[start - self.start_row:stop - self.start_row]
+        if self._cached is not None:
+            stop = min(stop, self._cached.rows)
+            if start >= stop:
+                return []
+            return self._frame_to_rows(self._cached.frame(start, stop))
+        return self._frame_to_rows(self._read_range(start, stop, keep_open=False))
+
+    def _iter_chunks(self, frames, planned: bool = False) -> Iterator[Tuple[dict, Union[float, dict]]]:
+        """
+        Yields (x, y) tuples one chunk at a time, feeding the cache writer if
+        any. Cached frames were planned before being stored.
+        """
+        for chunk in frames:
+            if not planned:
+                chunk = self._planned(chunk)
+            if self._cache_writer is not None:
+                self._cache_writer.append(chunk)
+            yield from self._frame_to_rows(chunk)
+        if self._cache_writer is not None:
+            self._cache_writer.commit()
+            self._cache_writer = None
 
     def __next__(self):
         # Respect BaseGenerator timing logic
         super().__next__()
-        return self.get_message()
+        return self._release(self.get_message())
 
     def get_message(self):
         try:
-            x, y = next(self._iterator)
+            if self._stats is None:
+                x, y = next(self._iterator)
+            else:
+                x, y = self._timed_fetch(next, self._iterator)
+            self._observe(x)
             self._count += 1
             return x, y
         except StopIteration:
             self.stop()
             raise
 
+    def _observe(self, x):
+        super()._observe(x)
+        if self._replay_epoch:
+            # Epoch nanoseconds, which plain numbers would be taken as seconds
+            self._event_time = np.datetime64(int(self._event_time), "ns")
+
     def get_count(self):
         return self._count
 
+    def state_dict(self):
+        """
+        Adds the number of rows consumed and, for uncompressed files, the byte
+        offset of the next row (assuming one line per row).
+        """
+        state = super().state_dict()
+        state["offset"] = self.position
+        state["byte_offset"] = None
+        if not self._compressed:
+            # Incremental (or indexed), so periodic checkpoints stay cheap
+            state["byte_offset"] = self._byte_offset(self.position)
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Resumes at the row following the checkpoint. In chunked mode the file
+        is reopened at the saved byte offset, so earlier rows are not read
+        again; cached files resume from the row offset.
+        """
+        if self._count:
+            raise RuntimeError("load_state_dict must be called before iterating")
+        super().load_state_dict(state)
+        offset = state["offset"]
+        if offset == self._base_row:
+            self._base_count = self._count
+            return
+        if state.get("byte_offset") is not None and self.row_index is None:
+            # Saves the scan up to the checkpoint
+            self._line_hint = (offset + 1, state["byte_offset"])
+        self._open_at(offset)
+
+    def _close_reader(self):
+        if getattr(self, "_reader", None) is not None:
+            self._reader.close()
+            self._reader = None
+        if getattr(self, "_handle", None) is not None:
+            self._handle.close()
+            self._handle = None
+
     def stop(self):
-        # Nothing to close explicitly; set iterator to None for GC symmetry
+        # Close the chunk reader if streaming; set iterator to None for GC symmetry.
+        # A cache that was only partially written is discarded.
+        if getattr(self, "_cache_writer", None) is not None:
+            self._cache_writer.abort()
+            self._cache_writer = None
+        self._close_reader()
         if hasattr(self, "_iterator"):
             self._iterator = None
 
@@ -0,0 +1,161 @@
+"""Sparse line-offset index of a CSV file for random row access."""
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from fluvialgen.csv_cache import source_fingerprint
+
+_BLOCK_BYTES = 1 << 20
+
+
+def _line_offset(path: str, lines: int, hint: Tuple[int, int] = (0, 0)) -> int:
+    """
+    Returns the byte offset just after the ``lines``-th newline of a file,
+    scanning forward from a known ``(lines, offset)`` position.
+    """
+    done, position = hint
+    with open(path, "rb") as f:
+        f.seek(position)
+        while done < lines:
+            block = f.read(_BLOCK_BYTES)
+            if not block:
+                break
+            newlines = block.count(b"\n")
+            if done + newlines < lines:
+                done += newlines
+                position += len(block)
+                continue
+            index = -1
+            for _ in range(lines - done):
+                index = block.index(b"\n", index + 1)
+            position += index + 1
+            done = lines
+    return position
+
+
+class CSVRowIndex:
+    """
+    Byte offsets of every ``stride``-th data row of a CSV file.
+
+    The index is built with a single newline scan of the file (no parsing)
+    and locates any row by jumping to the nearest indexed offset and scanning
+    at most ``stride - 1`` lines from there. Like checkpoint byte offsets, it
+    assumes a header line followed by one line per row (no quoted newlines).
+
+    Use ``CSVRowIndex.open`` to load the sidecar file saved next to the CSV
+    (or in ``index_dir``), building and saving it first if it is missing or
+    the file changed since.
+
+    Args:
+        filepath: Path to the CSV file
+        offsets: Byte offset of data rows 0, stride, 2 * stride, ...
+        rows: Number of data rows in the file
+        stride: Rows between consecutive indexed offsets
+        fingerprint: ``source_fingerprint`` of the file the index was built from
+    """
+
+    VERSION = 1
+
+    def __init__(self, filepath: str, offsets: np.ndarray, rows: int, stride: int,
+                 fingerprint: Optional[dict] = None):
+        self.filepath = filepath
+        self.offsets = offsets
+        self.rows = rows
+        self.stride = stride
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, filepath: str, stride: int = 1024) -> "CSVRowIndex":
+        """Scans the file once and records the offset of every ``stride``-th row."""
+        if stride <= 0:
+            raise ValueError("stride must be a positive integer")
+        fingerprint = source_fingerprint(filepath)
+        parts = []
+        newlines = 0  # Newlines seen before the current block
+        position = 0
+        last = b"\n"
+        with open(filepath, "rb") as f:
+            while True:
+                block = f.read(_BLOCK_BYTES)
+                if not block:
+                    break
+                ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                # Newline k (1-based) ends line k - 1, so data row r starts after newline r + 1
+                first = (-newlines) % stride
+                parts.append(ends[first::stride] + (position + 1))
+                newlines += len(ends)
+                position += len(block)
+                last = block[-1:]
+        rows = max(newlines - 1, 0)
+        if last != b"\n" and newlines > 0:
+            # The last row has no trailing newline
+            rows += 1
+        offsets = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        offsets = offsets.astype(np.int64)[: (rows + stride - 1) // stride]
+        return cls(filepath, offsets, rows, stride, fingerprint)
+
+    @staticmethod
+    def sidecar_path(filepath: str, index_dir: Optional[str] = None) -> str:
+        """Where the index of ``filepath`` is saved."""
+        if index_dir is None:
+            index_dir = os.path.dirname(os.path.abspath(filepath))
+        return os.path.join(index_dir, os.path.basename(filepath) + ".fgindex.npz")
+
+    def save(self, index_dir: Optional[str] = None):
+        """Writes the index to its sidecar file, replacing any previous one."""
+        path = self.sidecar_path(self.filepath, index_dir)
+        meta = {"version": self.VERSION, "source": self.fingerprint,
+                "rows": self.rows, "stride": self.stride}
+        tmp = f"{path}.tmp-{os.getpid()}.npz"
+        np.savez(tmp, offsets=self.offsets, meta=np.array(json.dumps(meta)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, filepath: str, stride: int = 1024,
+             index_dir: Optional[str] = None) -> Optional["CSVRowIndex"]:
+        """Returns the saved index, or None if it is missing, stale or has another stride."""
+        try:
+            with np.load(cls.sidecar_path(filepath, index_dir)) as saved:
+                meta = json.loads(str(saved["meta"]))
+                offsets = saved["offsets"]
+        except (OSError, ValueError, KeyError):
+            return None
+        fingerprint = source_fingerprint(filepath)
+        if (meta.get("version") != cls.VERSION or meta.get("stride") != stride
+                or meta.get("source") != fingerprint):
+            return None
+        return cls(filepath, offsets, meta["rows"], stride, fingerprint)
+
+    @classmethod
+    def open(cls, filepath: str, stride: int = 1024, index_dir: Optional[str] = None) -> "CSVRowIndex":
+        """Loads the saved index, building and saving it if needed."""
+        index = cls.load(filepath, stride, index_dir)
+        if index is None:
+            index = cls.build(filepath, stride)
+            try:
+                index.save(index_dir)
+            except OSError:
+                # Read-only location: the in-memory index still works
+                pass
+        return index
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def offset(self, row: int) -> int:
+        """
+        Returns the byte offset where data row ``row`` starts. Rows at or
+        past the end map to the end of the file.
+        """
+        if row < 0:
+            raise IndexError("row must be non-negative")
+        if row >= self.rows:
+            return os.path.getsize(self.filepath)
+        anchor = row // self.stride
+        start = int(self.offsets[anchor])
+        skip = row - anchor * self.stride
+        if not skip:
+            return start
+        return _line_offset(self.filepath, skip, (0, start))
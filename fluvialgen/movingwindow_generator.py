@@ -1,11 +1,22 @@
+from fluvialgen.output_formats import get_output_format
 from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.ring_buffer import ArrayRingBuffer, RingBuffer
+from fluvialgen.window_store import ColumnarStore
+import numbers
+import numpy as np
 import pandas as pd
 import itertools
+from typing import Optional, Sequence
+
+PADDING_POLICIES = ("duplicate", "drop", "ragged", "mask")
+
 
 class MovingWindowBatcher(RiverDatasetGenerator):
     """
     A generator for moving windows over a River dataset with batching support.
     """
+    _emits_windows = True
+
     def __init__(
         self,
         dataset,
@@ -14,6 +25,11 @@ class MovingWindowBatcher(RiverDatasetGenerator):
         stream_period: int = 0,
         timeout: int = 30000,
         n_instances: int = 1000,
+        array_mode: bool = False,
+        feature_columns: Optional[Sequence[str]] = None,
+        output_format="pandas",
+        lazy: bool = False,
+        padding: str = "duplicate",
         **kwargs
     ):
         """
@@ -24,7 +40,41 @@ class MovingWindowBatcher(RiverDatasetGenerator):
             stream_period: Delay between consecutive messages (ms)
             timeout: Maximum wait time (ms)
             n_instances: Maximum number of instances to process
+            array_mode: If True, numeric features are kept in a contiguous NumPy
+                       buffer and each batch is returned as read-only strided views
+                       X of shape (batch_size, instance_size, n_features) and y of
+                       shape (batch_size, instance_size), without per-row copies.
+                       The views are only valid until the next message is requested.
+            feature_columns: Features to place in the array buffer (array_mode only).
+                            If None, the numeric keys of the first x are used.
+            output_format: Name of a registered output format ("pandas", "dict", "numpy",
+                          "arrow", "river" or a custom one) or an OutputFormat instance.
+                          Not applicable in array_mode.
+            lazy: If True, rows are stored once in a shared ColumnarStore and each
+                  message is a WindowBatch of (start, length) references that is
+                  converted to the output format only when accessed. Unpacking it
+                  (X, y = batch) materializes it.
+            padding: What to do when fewer than batch_size windows are available
+                    at the end of the stream:
+                    - "duplicate": repeat the last window (the default). The
+                      buffer is only filled up to instance_size rows, so every
+                      batch repeats a single window.
+                    - "drop": stop instead of emitting an incomplete batch
+                    - "ragged": emit a shorter batch with only the available windows
+                    - "mask": repeat the last window and return (X, y, mask), where
+                      mask is a boolean array that is False for the padded windows,
+                      with one entry per row of X (per window in array_mode)
+                    Except for "duplicate", the buffer is filled so that every batch
+                    but the last ones holds batch_size distinct windows.
+            **kwargs: Forwarded to RiverDatasetGenerator (e.g. shard_id and num_shards;
+                     shards overlap so that every batch is emitted by exactly one shard)
         """
+        if padding not in PADDING_POLICIES:
+            raise ValueError(f"Unknown padding '{padding}', expected one of {PADDING_POLICIES}")
+        # Set before the source is built: they determine the shard overlap
+        self.instance_size = instance_size
+        self.batch_size = batch_size
+        self.padding = padding
         super().__init__(
             dataset=dataset,
             stream_period=stream_period,
@@ -32,14 +82,33 @@ class MovingWindowBatcher(RiverDatasetGenerator):
             n_instances=n_instances,
             **kwargs
         )
-        self.instance_size = instance_size
-        self.batch_size = batch_size
         self.current_window = []
         self._count = 0
         self.current_batch = []
-        self.buffer = []
+        self.array_mode = array_mode
+        self._output = get_output_format(output_format)
+        self.output_format = self._output.name
+        if self.array_mode and self.output_format != "pandas":
+            raise ValueError("output_format cannot be combined with array_mode")
+        if self.array_mode and lazy:
+            raise ValueError("lazy cannot be combined with array_mode")
+        self.lazy = lazy
+        # Padded batches at the end of a shard other than the last hold windows of the next shard
+        self._cut_tail = padding != "duplicate" and self.shard_id < self.num_shards - 1
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        # Large enough to hold batch_size overlapping windows; in array mode the
+        # buffer is allocated once the feature columns are known
+        if self.array_mode:
+            self.buffer = None
+        elif self.lazy:
+            self.buffer = None
+            self._store = ColumnarStore()
+            self._position = 0  # Absolute position of the first window of the next batch
+        else:
+            self.buffer = RingBuffer(instance_size + batch_size - 1)
         self.windows = []
         self.window_idx = 0
+        self._source_done = False
 
     def _convert_to_pandas(self, batch):
         """
@@ -71,56 +140,186 @@ class MovingWindowBatcher(RiverDatasetGenerator):
         
         return X, y
 
+    def _convert_output(self, batch):
+        """
+        Converts a batch of instances with the configured output format.
+
+        Returns:
+            tuple: (X, y) built by the format's frame and vector converters
+        """
+        if self.output_format == "pandas":
+            return self._convert_to_pandas(batch)
+        all_x_data = [x for instance in batch for x, _ in instance]
+        all_y_data = [y for instance in batch for _, y in instance]
+        return self._output.frame(all_x_data), self._output.vector(all_y_data)
+
+    def _shard_overlap(self):
+        """Rows after its first row that a batch spans."""
+        if self.padding == "duplicate":
+            return self.instance_size - 1
+        return self.instance_size + self.batch_size - 2
+
+    def _buffered(self):
+        """Returns the number of buffered rows (the array buffer is allocated lazily)."""
+        if self.lazy:
+            return self._store.end - self._position
+        return 0 if self.buffer is None else len(self.buffer)
+
+    def _buffer_occupancy(self):
+        if self.lazy:
+            return self._buffered(), None
+        return super()._buffer_occupancy()
+
+    def _lazy_batch(self, n_windows, size):
+        """
+        References size windows in the store, the first n_windows distinct and
+        the rest repeating the last one, and slides the next batch by one row.
+        """
+        starts = list(range(self._position, self._position + n_windows))
+        starts += [starts[-1]] * (size - n_windows)
+        batch = self._store.batch(starts, self.instance_size, self._output)
+        self._position += 1
+        self._store.release(self._position)
+        return batch
+
+    def _append_array_row(self, x, y):
+        """Appends (x, y) to the array buffer, allocating it on the first row."""
+        if self.buffer is None:
+            if self.feature_columns is None:
+                self.feature_columns = [
+                    k for k, v in x.items() if isinstance(v, (numbers.Real, np.number))
+                ]
+            self.buffer = ArrayRingBuffer(
+                self.instance_size + self.batch_size - 1, len(self.feature_columns)
+            )
+        self.buffer.append([x.get(c, np.nan) for c in self.feature_columns], y)
+
+    def _array_batch(self, n_windows, size=None):
+        """
+        Builds read-only (X, y) views of size (default batch_size) windows over
+        the array buffer.
+
+        The first n_windows windows start at consecutive rows; remaining slots
+        repeat the last window. Only the cases expressible with strides (all
+        windows distinct, or a single window repeated) avoid copying.
+        """
+        size = self.batch_size if size is None else size
+        features, targets = self.buffer.window(0, n_windows + self.instance_size - 1)
+        row_stride, col_stride = features.strides
+        (y_stride,) = targets.strides
+        shape = (size, self.instance_size)
+        if n_windows == size or n_windows == 1:
+            step = row_stride if n_windows > 1 else 0
+            y_step = y_stride if n_windows > 1 else 0
+            X = np.lib.stride_tricks.as_strided(
+                features,
+                shape=shape + (features.shape[1],),
+                strides=(step, row_stride, col_stride),
+                writeable=False,
+            )
+            y = np.lib.stride_tricks.as_strided(
+                targets, shape=shape, strides=(y_step, y_stride), writeable=False
+            )
+            return X, y
+        starts = list(range(n_windows)) + [n_windows - 1] * (size - n_windows)
+        index = np.array(starts)[:, None] + np.arange(self.instance_size)
+        X, y = features[index], targets[index]
+        X.flags.writeable = False
+        y.flags.writeable = False
+        return X, y
+
+    def _with_mask(self, batch, n_windows):
+        """Appends the validity mask of a padded batch (padding="mask")."""
+        mask = np.zeros(self.batch_size, dtype=bool)
+        mask[:n_windows] = True
+        if not self.array_mode:
+            mask = np.repeat(mask, self.instance_size)
+        if self.lazy:
+            batch.mask = mask
+            return batch
+        return batch + (mask,)
+
     def get_message(self):
         """
-        Gets the next batch of instances with sliding windows in pandas format.
+        Gets the next batch of instances with sliding windows in the configured output format.
         Always returns exactly batch_size instances, with overlap between consecutive instances.
         For example, with instance_size=2, the pattern would be:
         Batch 1: [x1,x2], [x2,x3] -> DataFrame with [x1,x2,x2,x3], Series with [y1,y2,y2,y3]
         Batch 2: [x2,x3], [x3,x4] -> DataFrame with [x2,x3,x3,x4], Series with [y2,y3,y3,y4]
         
         If there's not enough data for a full batch, the last elements will be duplicated
-        to ensure we always return exactly batch_size * instance_size elements.
+        to ensure we always return exactly batch_size * instance_size elements, unless
+        another padding policy is configured.
         """
         try:
-            # We need at least instance_size elements to form an instance
-            required_min_elements = self.instance_size
+            # We need at least instance_size elements to form an instance; the other
+            # padding policies need batch_size distinct windows before padding
+            if self.padding == "duplicate":
+                required_min_elements = self.instance_size
+            else:
+                required_min_elements = self.instance_size + self.batch_size - 1
             
             # Attempt to fill the buffer
-            while len(self.buffer) < required_min_elements and self._count < self.n_instances:
+            while (self._buffered() < required_min_elements and self._count < self.n_instances
+                   and not self._source_done):
                 try:
                     x, y = super().get_message()
-                    self.buffer.append((x, y))
+                    if self.array_mode:
+                        self._append_array_row(x, y)
+                    elif self.lazy:
+                        self._store.append(x, y)
+                    else:
+                        self.buffer.append((x, y))
                 except StopIteration:
                     # If we can't get more data, break the loop
+                    self._source_done = True
                     break
             
             # If we can't form even one instance, stop iteration
-            if len(self.buffer) < self.instance_size:
+            if self._buffered() < self.instance_size:
                 raise StopIteration("No more data available")
             
+            # Calculate how many instances we can create from the buffer
+            available_instances = max(1, self._buffered() - self.instance_size + 1)
+            n_windows = min(self.batch_size, available_instances)
+            if n_windows < self.batch_size and (self.padding == "drop" or self._cut_tail):
+                raise StopIteration("No more complete batches")
+            size = n_windows if self.padding == "ragged" else self.batch_size
+
+            if self.lazy:
+                self._count += 1
+                batch = self._lazy_batch(n_windows, size)
+                return self._with_mask(batch, n_windows) if self.padding == "mask" else batch
+
+            if self.array_mode:
+                batch = self._array_batch(n_windows, size)
+                self.buffer.popleft()
+                self._count += 1
+                return self._with_mask(batch, n_windows) if self.padding == "mask" else batch
+            
             # Create a batch with exactly batch_size instances
             batch = []
             
-            # Calculate how many instances we can create from the buffer
-            available_instances = max(1, len(self.buffer) - self.instance_size + 1)
-            
             # Create up to batch_size instances
-            for i in range(min(self.batch_size, available_instances)):
-                instance = self.buffer[i:i+self.instance_size]
+            for i in range(n_windows):
+                instance = self.buffer.window(i, self.instance_size)
                 batch.append(instance)
             
             # If we don't have enough instances to fill a batch, duplicate the last instance
-            while len(batch) < self.batch_size:
+            while len(batch) < size:
                 # Duplicate the last instance
                 batch.append(batch[-1])
             
             # Update buffer by removing the first element (sliding window)
             if len(self.buffer) > 0:
-                self.buffer.pop(0)
+                self.buffer.popleft()
             
             self._count += 1
-            return self._convert_to_pandas(batch)
+            if self._stats is None:
+                output = self._convert_output(batch)
+            else:
+                output = self._timed_convert(self._convert_output, batch)
+            return self._with_mask(output, n_windows) if self.padding == "mask" else output
             
         except StopIteration:
             self.stop()
@@ -130,4 +329,45 @@ class MovingWindowBatcher(RiverDatasetGenerator):
         """
         Returns the total number of instances processed.
         """
-        return self._count
\ No newline at end of file
+        return self._count
+
+    def _buffered_rows(self):
+        """The buffered rows as (x, y), or (feature values, y) in array mode."""
+        if self.lazy:
+            n = self._buffered()
+            return self._store.batch([self._position], n).window(0) if n else []
+        if self.array_mode:
+            if self.buffer is None:
+                return []
+            features, targets = self.buffer.window()
+            return [(values.copy(), target) for values, target in zip(features, targets.tolist())]
+        return list(self.buffer)
+
+    def state_dict(self):
+        """Adds the window buffer contents to the source position."""
+        state = super().state_dict()
+        state["buffer"] = self._buffered_rows()
+        state["feature_columns"] = self.feature_columns
+        state["source_done"] = self._source_done
+        return state
+
+    def load_state_dict(self, state):
+        """Restores the source position and refills the window buffer."""
+        super().load_state_dict(state)
+        self._source_done = state["source_done"]
+        rows = state["buffer"]
+        if self.array_mode:
+            self.feature_columns = state["feature_columns"]
+            if rows:
+                self.buffer = ArrayRingBuffer(self.instance_size + self.batch_size - 1, len(self.feature_columns))
+                for values, target in rows:
+                    self.buffer.append(values, target)
+        elif self.lazy:
+            self._store = ColumnarStore()
+            self._position = 0
+            for x, y in rows:
+                self._store.append(x, y)
+        else:
+            self.buffer.clear()
+            for row in rows:
+                self.buffer.append(row)
\ No newline at end of file
@@ -0,0 +1,226 @@
+import glob
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+
+from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.tabular_source import TabularSourceMixin
+
+
+def _stop_loaded(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().stop()
+
+
+class MultiCSVDatasetGenerator(TabularSourceMixin, BaseGenerator):
+    """
+    Stream-like generator over many CSV files that yields (x, y) tuples as one logical stream.
+
+    Files are streamed in order. While one file is being consumed, the next
+    ``prefetch`` files are parsed in background threads, so moving to the next
+    file does not stall on a full parse. Every file must have the same header
+    as the first one.
+
+    Parameters
+    ----------
+    filepaths: Union[str, Sequence[str]]
+        A glob pattern (files are taken in sorted order) or an ordered list of paths.
+    target_column: Union[str, Sequence[str]]
+        Column name(s) to use as target(s). Can be a string for single target
+        or a list/sequence of strings for multi-target.
+    feature_columns: Optional[Sequence[str]]
+        Subset of columns to use as features X (excluding targets). If None, all
+        columns of the first file except the targets will be used.
+    parse_dates: Optional[Sequence[str]]
+        Column names to parse as dates.
+    prefetch: int
+        Number of upcoming files parsed ahead in the background. 0 disables
+        read-ahead and parses each file when it is reached.
+    replay_column: Optional[str]
+        Timestamp feature column for event-time replay. When given, messages are
+        released at the pace of the gaps between consecutive timestamps instead
+        of a constant period.
+    replay_speed: float
+        Replay speed multiplier (1.0 is the original cadence, 10.0 ten times faster).
+    stream_period: int
+        Delay between consecutive messages (ms).
+    timeout: int
+        Maximum wait time (ms). Included for API completeness.
+    **kwargs:
+        Forwarded to each file's CSVDatasetGenerator (e.g. cache, compact_records).
+    """
+
+    _source_label = "CSV"
+
+    def __init__(
+        self,
+        filepaths: Union[str, Sequence[str]],
+        target_column,  # Can be str or Sequence[str] for multi-target
+        feature_columns: Optional[Sequence[str]] = None,
+        parse_dates: Optional[Sequence[str]] = None,
+        prefetch: int = 1,
+        replay_column: Optional[str] = None,
+        replay_speed: float = 1.0,
+        stream_period: int = 0,
+        timeout: int = 30000,
+        **kwargs
+    ):
+        super().__init__(stream_period=stream_period, timeout=timeout)
+        if isinstance(filepaths, str):
+            self.files: List[str] = sorted(glob.glob(filepaths))
+        else:
+            self.files = list(filepaths)
+        if not self.files:
+            raise ValueError(f"No CSV files found for {filepaths!r}")
+        if prefetch < 0:
+            raise ValueError("prefetch must be >= 0")
+
+        self._init_columns(target_column, feature_columns, kwargs.pop("compact_records", False))
+        self._init_replay(replay_column, replay_speed)
+        self.parse_dates = list(parse_dates) if parse_dates is not None else None
+        self.prefetch = prefetch
+        self._file_kwargs = kwargs
+
+        self.header = list(pd.read_csv(self.files[0], nrows=0).columns)
+        self._resolve_columns(self.header)
+
+        self.file_index = -1
+        self.current_file: Optional[str] = None
+        self._current: Optional[CSVDatasetGenerator] = None
+        self._next_to_submit = 0
+        self._pending = deque()
+        self._executor = ThreadPoolExecutor(max_workers=prefetch) if prefetch > 0 else None
+        self._fill_pending()
+
+    def _open(self, path: str) -> CSVDatasetGenerator:
+        """Validates a file's header and parses it into a CSVDatasetGenerator."""
+        columns = list(pd.read_csv(path, nrows=0).columns)
+        if columns != self.header:
+            raise ValueError(
+                f"CSV file '{path}' has columns {columns}, expected {self.header}"
+            )
+        return CSVDatasetGenerator(
+            filepath=path,
+            target_column=self.target_columns if self.is_multi_target else self.target_columns[0],
+            feature_columns=self.feature_columns,
+            parse_dates=self.parse_dates,
+            compact_records=self.compact_records,
+            **self._file_kwargs
+        )
+
+    def _fill_pending(self):
+        """Keeps up to ``prefetch`` upcoming files parsing in the background."""
+        if self._executor is None:
+            return
+        while len(self._pending) < self.prefetch and self._next_to_submit < len(self.files):
+            path = self.files[self._next_to_submit]
+            self._pending.append(self._executor.submit(self._open, path))
+            self._next_to_submit += 1
+
+    def _advance(self) -> bool:
+        """Moves to the next file. Returns False when all files are consumed."""
+        if self.file_index + 1 >= len(self.files):
+            return False
+        self.file_index += 1
+        self.current_file = self.files[self.file_index]
+        if self._executor is None:
+            self._current = self._open(self.current_file)
+        else:
+            # Re-raises any parsing or validation error from the background thread
+            self._current = self._pending.popleft().result()
+            self._fill_pending()
+        return True
+
+    def __next__(self):
+        # Respect BaseGenerator timing logic
+        super().__next__()
+        return self._release(self.get_message())
+
+    def _next_row(self):
+        """Returns the next row, moving on to the next file when one runs out."""
+        while True:
+            if self._current is None and not self._advance():
+                raise StopIteration
+            try:
+                return self._current.get_message()
+            except StopIteration:
+                self._current = None
+
+    def _bulk_messages(self, n):
+        """Takes rows from the per-file generators in bulk, moving across files."""
+        rows = []
+        while len(rows) < n:
+            if self._current is None and not self._advance():
+                break
+            rows.extend(self._current.next_batch(n - len(rows)))
+            if self._current._drained:
+                self._current = None
+        self._count += len(rows)
+        if len(rows) < n:
+            self.stop()
+        return rows
+
+    def get_message(self):
+        try:
+            if self._stats is None:
+                x, y = self._next_row()
+            else:
+                x, y = self._timed_fetch(self._next_row)
+            self._observe(x)
+            self._count += 1
+            return x, y
+        except StopIteration:
+            self.stop()
+            raise
+
+    def get_count(self):
+        return self._count
+
+    def state_dict(self):
+        """Adds the current file index and the position within that file."""
+        state = super().state_dict()
+        state["file_index"] = self.file_index
+        state["file"] = self._current.state_dict() if self._current is not None else None
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Reopens the file being read at the checkpoint and resumes it at its
+        saved position; earlier files are not read. Read-ahead restarts from
+        the following file.
+        """
+        if self._count:
+            raise RuntimeError("load_state_dict must be called before iterating")
+        super().load_state_dict(state)
+        index = state["file_index"]
+        if index < 0:
+            return
+        self._cancel_pending()
+        self.file_index = index
+        self.current_file = self.files[index]
+        if state["file"] is not None:
+            self._current = self._open(self.current_file)
+            self._current.load_state_dict(state["file"])
+        self._next_to_submit = index + 1
+        self._fill_pending()
+
+    def _cancel_pending(self):
+        for future in self._pending:
+            if not future.cancel():
+                # Already parsing: release the generator once it is built
+                future.add_done_callback(_stop_loaded)
+        self._pending.clear()
+
+    def stop(self):
+        """Cancels pending reads and releases all per-file generators."""
+        if getattr(self, "_current", None) is not None:
+            self._current.stop()
+            self._current = None
+        if getattr(self, "_pending", None):
+            self._cancel_pending()
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
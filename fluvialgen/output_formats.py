@@ -0,0 +1,116 @@
+"""Registry of output formats the batchers can convert their messages to."""
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class OutputFormat:
+    """
+    A named pair of converters used by the batchers to build their output.
+
+    Args:
+        name: Name the format is registered under
+        frame: Converts a list of feature rows (dicts) into a tabular object
+        vector: Converts a list of targets into a one-dimensional object.
+                If None, the targets are returned as a list.
+    """
+
+    def __init__(self, name: str, frame: Callable, vector: Optional[Callable] = None):
+        self.name = name
+        self.frame = frame
+        self.vector = vector if vector is not None else list
+
+    def __repr__(self):
+        return f"OutputFormat({self.name!r})"
+
+
+_FORMATS: Dict[str, OutputFormat] = {}
+
+
+def register_output_format(
+    name: str,
+    frame: Callable,
+    vector: Optional[Callable] = None,
+    overwrite: bool = False,
+) -> OutputFormat:
+    """
+    Registers a custom output format so batchers accept ``output_format=name``.
+
+    Args:
+        name: Name to register the format under
+        frame: Converts a list of feature rows (dicts) into a tabular object
+        vector: Converts a list of targets into a one-dimensional object
+        overwrite: Allow replacing an already registered format
+
+    Returns:
+        OutputFormat: The registered format
+    """
+    if name in _FORMATS and not overwrite:
+        raise ValueError(f"Output format '{name}' is already registered")
+    fmt = OutputFormat(name, frame, vector)
+    _FORMATS[name] = fmt
+    return fmt
+
+
+def get_output_format(fmt: Union[str, OutputFormat]) -> OutputFormat:
+    """Returns the registered format for a name (formats are passed through)."""
+    if isinstance(fmt, OutputFormat):
+        return fmt
+    try:
+        return _FORMATS[fmt]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output format '{fmt}'. Available formats: {available_output_formats()}"
+        ) from None
+
+
+def available_output_formats() -> List[str]:
+    """Returns the names of all registered output formats."""
+    return sorted(_FORMATS)
+
+
+def _columns(rows: Sequence[Mapping]) -> List[str]:
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _numpy_frame(rows):
+    columns = _columns(rows)
+    return np.array([[row.get(c, np.nan) for c in columns] for row in rows]).reshape(
+        len(rows), len(columns)
+    )
+
+
+def _arrow_frame(rows):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("The 'arrow' output format requires pyarrow to be installed") from None
+    return pa.RecordBatch.from_pylist(list(rows))
+
+
+def _arrow_vector(values):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("The 'arrow' output format requires pyarrow to be installed") from None
+    return pa.array(values)
+
+
+def _river_vector(values):
+    # learn_many expects a Series for single targets and a DataFrame for multi-target
+    if values and isinstance(values[0], Mapping):
+        return pd.DataFrame(values)
+    return pd.Series(values)
+
+
+register_output_format("pandas", pd.DataFrame, pd.Series)
+register_output_format("dict", list, list)
+register_output_format("numpy", _numpy_frame, np.asarray)
+register_output_format("arrow", _arrow_frame, _arrow_vector)
+register_output_format("river", pd.DataFrame, _river_vector)
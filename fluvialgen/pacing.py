@@ -0,0 +1,261 @@
+"""Drift-free pacing of message emission on absolute monotonic deadlines."""
+import datetime
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CATCH_UP = "catch_up"
+SKIP = "skip"
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _sleep_until(deadline: int, spin_ns: int) -> int:
+    """Sleeps until ``spin_ns`` before a monotonic deadline, spins the rest, returns now."""
+    remaining = deadline - time.monotonic_ns()
+    if remaining > spin_ns:
+        time.sleep((remaining - spin_ns) / 1e9)
+    now = time.monotonic_ns()
+    while now < deadline:
+        now = time.monotonic_ns()
+    return now
+
+
+def to_ns(value) -> int:
+    """
+    Converts an event timestamp to integer nanoseconds.
+
+    Accepts pandas/NumPy datetimes, ``datetime.datetime`` and plain numbers,
+    which are taken as seconds (e.g. Unix epochs).
+    """
+    if isinstance(value, pd.Timestamp):
+        return value.value
+    if isinstance(value, datetime.datetime):
+        # Naive datetimes are taken as UTC; only differences matter for pacing
+        epoch = _EPOCH if value.tzinfo is None else _EPOCH_UTC
+        return (value - epoch) // _MICROSECOND * 1000
+    if isinstance(value, np.datetime64):
+        return int(value.astype("datetime64[ns]").astype(np.int64))
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return int(round(float(value) * 1e9))
+    raise TypeError(f"Cannot use {type(value).__name__} value {value!r} as an event time")
+
+
+class Pacer:
+    """
+    Schedules messages on a fixed grid of ``time.monotonic_ns`` deadlines.
+
+    The first message is released immediately and anchors the schedule;
+    deadline ``k`` is then ``start + k * period``, so sleep overshoot and
+    per-message work never accumulate into drift. Waiting sleeps until ``spin_ns`` before
+    the deadline and busy-waits the rest, which keeps sub-millisecond periods
+    accurate at the cost of some CPU.
+
+    When the consumer falls behind, the ``catch_up`` policy emits the missed
+    messages back to back until the schedule is met again (the average rate is
+    preserved), while ``skip`` emits the late message at once, drops the other
+    missed slots and continues on the grid (no bursts; the average rate may
+    fall short).
+
+    Args:
+        period_ms: Time between messages in milliseconds (fractions allowed)
+        rate: Messages per second, as an alternative to ``period_ms``
+        policy: "catch_up" or "skip"
+        spin_ns: How long before a deadline to stop sleeping and spin
+    """
+
+    def __init__(
+        self,
+        period_ms: Optional[float] = None,
+        rate: Optional[float] = None,
+        policy: str = SKIP,
+        spin_ns: int = 200_000,
+    ):
+        if (period_ms is None) == (rate is None):
+            raise ValueError("Give exactly one of period_ms or rate")
+        if period_ms is not None and period_ms <= 0:
+            raise ValueError("period_ms must be positive")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if policy not in (CATCH_UP, SKIP):
+            raise ValueError(f"Unknown policy '{policy}', expected '{CATCH_UP}' or '{SKIP}'")
+        self.period_ns = int(round(period_ms * 1e6)) if period_ms is not None else int(round(1e9 / rate))
+        if self.period_ns <= 0:
+            raise ValueError("period is below the 1ns clock resolution")
+        self.policy = policy
+        self.spin_ns = spin_ns
+        self.reset()
+
+    @property
+    def period_ms(self) -> float:
+        return self.period_ns / 1e6
+
+    @property
+    def rate(self) -> float:
+        """The requested rate in messages per second."""
+        return 1e9 / self.period_ns
+
+    def reset(self):
+        """Restarts the schedule: the next message is released at once and anchors it."""
+        self._start = None
+        self._slot = 0
+        self.emitted = 0
+        self.skipped = 0
+        self.late = 0
+        self._first_emit = None
+        self._last_emit = None
+
+    def _reserve(self, now: int) -> int:
+        """Claims the next slot and returns its deadline."""
+        if self._start is None:
+            self._start = now
+            return now
+        self._slot += 1
+        deadline = self._start + self._slot * self.period_ns
+        if deadline < now:
+            self.late += 1
+            if self.policy == SKIP:
+                # Realign on the first grid point at or after now
+                behind = (now - deadline) // self.period_ns
+                self._slot += behind
+                self.skipped += behind
+                deadline = self._start + self._slot * self.period_ns
+                if deadline < now:
+                    deadline = now
+        return deadline
+
+    def _record(self, when: int):
+        if self._first_emit is None:
+            self._first_emit = when
+        self._last_emit = when
+        self.emitted += 1
+
+    def wait(self):
+        """Blocks until the next message is due."""
+        deadline = self._reserve(time.monotonic_ns())
+        self._record(_sleep_until(deadline, self.spin_ns))
+
+    def delay(self) -> float:
+        """
+        Claims the next slot and returns the seconds until it is due, without waiting.
+
+        Meant for callers that wait on their own, such as ``asyncio.sleep``.
+        """
+        now = time.monotonic_ns()
+        deadline = self._reserve(now)
+        self._record(max(deadline, now))
+        return max(deadline - now, 0) / 1e9
+
+    def achieved_rate(self) -> float:
+        """Messages per second actually emitted so far (0 before two messages)."""
+        if self.emitted < 2 or self._last_emit == self._first_emit:
+            return 0.0
+        return (self.emitted - 1) * 1e9 / (self._last_emit - self._first_emit)
+
+    def stats(self) -> dict:
+        """Requested vs achieved rate and how often the schedule was missed."""
+        return {
+            "requested_rate": self.rate,
+            "achieved_rate": self.achieved_rate(),
+            "emitted": self.emitted,
+            "late": self.late,
+            "skipped": self.skipped,
+            "policy": self.policy,
+        }
+
+    def __repr__(self):
+        return f"Pacer(period_ms={self.period_ms!r}, policy={self.policy!r})"
+
+
+class EventTimePacer:
+    """
+    Releases messages at the pace of their own timestamps, scaled by ``speed``.
+
+    The first event anchors the replay; an event ``t`` is then due at
+    ``anchor + (t - first_event) / speed`` on the monotonic clock. Like Pacer,
+    deadlines are absolute, so skipped or short waits never drift. Waits
+    shorter than ``min_wait_ns`` are not taken at all: at high speeds, events
+    that are close together are released back to back without a timer call,
+    and the next real wait absorbs the difference.
+
+    Events that are out of order or already overdue are released at once.
+
+    Args:
+        speed: Replay speed multiplier (1.0 is real time, 10.0 is ten times faster)
+        spin_ns: How long before a deadline to stop sleeping and spin
+        min_wait_ns: Shortest wait worth a timer call
+    """
+
+    def __init__(self, speed: float = 1.0, spin_ns: int = 200_000, min_wait_ns: int = 50_000):
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self.spin_ns = spin_ns
+        self.min_wait_ns = min_wait_ns
+        self.reset()
+
+    def reset(self):
+        """Forgets the anchor; the next event is released at once."""
+        self._origin_event = None
+        self._origin_clock = None
+        self._last_event = None
+        self._last_emit = None
+        self.emitted = 0
+        self.late = 0
+        self.max_lag_ns = 0
+
+    def _deadline(self, event_ns: int, now: int) -> int:
+        if self._origin_event is None:
+            self._origin_event = event_ns
+            self._origin_clock = now
+            return now
+        return self._origin_clock + int((event_ns - self._origin_event) / self.speed)
+
+    def _record(self, event_ns: int, deadline: int, when: int):
+        if when - deadline > self.min_wait_ns:
+            self.late += 1
+            self.max_lag_ns = max(self.max_lag_ns, when - deadline)
+        self._last_event = event_ns
+        self._last_emit = when
+        self.emitted += 1
+
+    def wait(self, event_time):
+        """Blocks until the event with timestamp ``event_time`` is due."""
+        event_ns = to_ns(event_time)
+        now = time.monotonic_ns()
+        deadline = self._deadline(event_ns, now)
+        if deadline - now >= self.min_wait_ns:
+            now = _sleep_until(deadline, self.spin_ns)
+        self._record(event_ns, deadline, now)
+
+    def delay(self, event_time) -> float:
+        """Returns the seconds until the event is due, without waiting."""
+        event_ns = to_ns(event_time)
+        now = time.monotonic_ns()
+        deadline = self._deadline(event_ns, now)
+        wait = deadline - now if deadline - now >= self.min_wait_ns else 0
+        self._record(event_ns, deadline, now + wait)
+        return wait / 1e9
+
+    def achieved_speed(self) -> float:
+        """Event time covered per unit of wall time so far (0 before two events)."""
+        if self._last_emit is None or self._last_emit == self._origin_clock:
+            return 0.0
+        return (self._last_event - self._origin_event) / (self._last_emit - self._origin_clock)
+
+    def stats(self) -> dict:
+        """Requested vs achieved speed and how far releases lagged behind."""
+        return {
+            "requested_speed": self.speed,
+            "achieved_speed": self.achieved_speed(),
+            "emitted": self.emitted,
+            "late": self.late,
+            "max_lag_ms": self.max_lag_ns / 1e6,
+        }
+
+    def __repr__(self):
+        return f"EventTimePacer(speed={self.speed!r})"
@@ -0,0 +1,258 @@
+"""Runs many generators (one per file, station or shard) on a process pool."""
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from typing import Callable, Optional, Sequence
+
+from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.prefetch_generator import _POLL_INTERVAL, _portable_error
+
+_ITEMS = "items"
+_END = "end"
+_ERROR = "error"
+
+
+def _put(out, message, stop_event) -> bool:
+    """Puts a message on a bounded queue unless a stop is requested first."""
+    while not stop_event.is_set():
+        try:
+            out.put(message, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _run_shards(factories, tasks, channels, stop_event, batch_size):
+    """
+    Worker loop: builds the generator of each assigned shard and streams its
+    messages, ``batch_size`` at a time, to the channel named by the task.
+    """
+    try:
+        while not stop_event.is_set():
+            try:
+                task = tasks.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if task is None:
+                return
+            shard, channel = task
+            out = channels[channel]
+            generator = None
+            try:
+                generator = factories[shard]()
+                items = []
+                for message in generator:
+                    items.append(message)
+                    if len(items) >= batch_size:
+                        if not _put(out, (shard, _ITEMS, items), stop_event):
+                            return
+                        items = []
+                if items and not _put(out, (shard, _ITEMS, items), stop_event):
+                    return
+                _put(out, (shard, _END, None), stop_event)
+            except Exception as e:
+                _put(out, (shard, _ERROR, _portable_error(e)), stop_event)
+            finally:
+                if generator is not None:
+                    generator.stop()
+    finally:
+        if stop_event.is_set():
+            # Do not block process exit on messages nobody will read
+            for out in channels:
+                out.cancel_join_thread()
+
+
+class ParallelRunner(BaseGenerator):
+    """
+    Spreads generators over a pool of worker processes and merges their output.
+
+    Each factory is a picklable zero-argument callable (e.g. a
+    ``functools.partial``) that builds one generator, typically one per file,
+    station or shard. Workers take shards one at a time, iterate them (so each
+    generator's own pacing applies), call ``stop()`` on them when done and
+    stream their messages back through bounded queues in batches of
+    ``batch_size`` to amortize inter-process overhead.
+
+    With ``ordered=True`` the output is every message of shard 0, then of
+    shard 1, and so on. Each in-flight shard gets its own channel and at most
+    ``n_workers + 1`` shards are in flight, so workers run ahead of the
+    consumer by a bounded amount. With ``ordered=False`` all shards share one
+    channel and messages are yielded as soon as any worker produces them,
+    which keeps every worker busy.
+
+    Exceptions raised while building or iterating a shard are re-raised by
+    ``get_message`` (as RuntimeError if they cannot be pickled).
+
+    Args:
+        factories: One callable per shard, each returning a generator
+        n_workers: Number of worker processes (default: CPU count, at most one per shard)
+        ordered: Keep shard order (True) or interleave shards as they produce (False)
+        depth: Maximum number of message batches buffered per channel
+        batch_size: Number of messages sent per inter-process transfer
+        with_shard: If True, messages are yielded as (shard_index, message)
+        stream_period: Delay between consecutive messages (ms)
+        timeout: Maximum wait time (ms)
+    """
+
+    def __init__(
+        self,
+        factories: Sequence[Callable[[], BaseGenerator]],
+        n_workers: Optional[int] = None,
+        ordered: bool = True,
+        depth: int = 8,
+        batch_size: int = 64,
+        with_shard: bool = False,
+        stream_period: int = 0,
+        timeout: int = 30000,
+        **kwargs
+    ):
+        super().__init__(stream_period=stream_period, timeout=timeout)
+        self.factories = list(factories)
+        if not self.factories:
+            raise ValueError("At least one generator factory is required")
+        if depth <= 0 or batch_size <= 0:
+            raise ValueError("depth and batch_size must be positive integers")
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        self.n_workers = max(1, min(n_workers, len(self.factories)))
+        self.ordered = ordered
+        self.depth = depth
+        self.batch_size = batch_size
+        self.with_shard = with_shard
+        self._finished = False
+        self._items = deque()
+        self._current_shard = None
+
+        ctx = multiprocessing.get_context()
+        n_channels = self.n_workers + 1 if ordered else 1
+        self._channels = [ctx.Queue(maxsize=depth) for _ in range(n_channels)]
+        self._tasks = ctx.Queue()
+        self._stop_event = ctx.Event()
+        self._workers = [
+            ctx.Process(
+                target=_run_shards,
+                args=(self.factories, self._tasks, self._channels, self._stop_event, batch_size),
+                daemon=True,
+            )
+            for _ in range(self.n_workers)
+        ]
+
+        if ordered:
+            # In-flight shards in output order, each with the channel it writes to
+            self._free_channels = list(range(n_channels))
+            self._in_flight = deque()
+            self._next_shard = 0
+            self._schedule()
+        else:
+            for shard in range(len(self.factories)):
+                self._tasks.put((shard, 0))
+            self._remaining = len(self.factories)
+        for worker in self._workers:
+            worker.start()
+
+    def _schedule(self):
+        """Hands the next shards to the workers while channels are free."""
+        while self._free_channels and self._next_shard < len(self.factories):
+            channel = self._free_channels.pop()
+            self._tasks.put((self._next_shard, channel))
+            self._in_flight.append((self._next_shard, channel))
+            self._next_shard += 1
+
+    def _take(self, channel):
+        out = self._channels[channel]
+        while True:
+            try:
+                return out.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if not any(w.is_alive() for w in self._workers):
+                    try:
+                        return out.get(timeout=_POLL_INTERVAL)
+                    except queue.Empty:
+                        raise RuntimeError("All workers exited before the stream finished")
+
+    def __next__(self):
+        # Respect BaseGenerator timing logic
+        super().__next__()
+        return self._release(self.get_message())
+
+    def get_message(self):
+        try:
+            while not self._items:
+                if self._finished:
+                    raise StopIteration
+                if self.ordered:
+                    if not self._in_flight:
+                        raise StopIteration
+                    channel = self._in_flight[0][1]
+                elif self._remaining == 0:
+                    raise StopIteration
+                else:
+                    channel = 0
+                stats = self._stats
+                start = time.perf_counter_ns() if stats is not None else 0
+                shard, kind, payload = self._take(channel)
+                if stats is not None:
+                    stats.fetch_ns += time.perf_counter_ns() - start
+                if kind == _ITEMS:
+                    if stats is not None:
+                        stats.source_items += len(payload)
+                    self._current_shard = shard
+                    self._items.extend(payload)
+                elif kind == _END:
+                    if self.ordered:
+                        self._in_flight.popleft()
+                        self._free_channels.append(channel)
+                        self._schedule()
+                    else:
+                        self._remaining -= 1
+                else:
+                    raise payload
+            message = self._items.popleft()
+            self._count += 1
+            return (self._current_shard, message) if self.with_shard else message
+        except (StopIteration, Exception):
+            self.stop()
+            raise
+
+    def state_dict(self):
+        # Shards are built and run inside the workers, which may interleave them,
+        # so there is no single source position to save
+        raise TypeError(
+            "ParallelRunner does not support checkpoints; checkpoint the shard generators instead"
+        )
+
+    def load_state_dict(self, state):
+        raise TypeError(
+            "ParallelRunner does not support checkpoints; checkpoint the shard generators instead"
+        )
+
+    def get_count(self):
+        return self._count
+
+    def stop(self):
+        """Stops every worker; each one calls ``stop()`` on the generator it is running."""
+        if self._finished:
+            return
+        self._finished = True
+        self._items.clear()
+        self._stop_event.set()
+        for _ in self._workers:
+            self._tasks.put(None)
+        # Unblock workers waiting on full channels
+        for out in self._channels:
+            try:
+                while True:
+                    out.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        for q in self._channels + [self._tasks]:
+            q.close()
+            q.cancel_join_thread()
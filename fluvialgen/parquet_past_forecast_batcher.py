@@ -0,0 +1,52 @@
+from typing import Optional, Sequence
+
+from fluvialgen.parquet_dataset_generator import ParquetDatasetGenerator
+from fluvialgen.past_forecast_window import PastForecastWindowMixin
+
+
+class ParquetPastForecastBatcher(PastForecastWindowMixin, ParquetDatasetGenerator):
+    """
+    A generator for creating instances with past data and forecast windows from Parquet files.
+    The forecast_size parameter determines which future data point to include in the past_y.
+    Uses the same Base (ParquetDatasetGenerator -> BaseGenerator) as other generators.
+    """
+    def __init__(
+        self,
+        filepath: str,
+        target_column,  # Can be str or Sequence[str] for multi-target
+        feature_columns: Optional[Sequence[str]] = None,
+        past_size: int = 3,
+        forecast_size=0,
+        stream_period: int = 0,
+        timeout: int = 30000,
+        output_format="pandas",
+        **kwargs
+    ):
+        """
+        Args:
+            filepath: Path to the Parquet file
+            target_column: Column name(s) to use as target(s). Can be a string for single target
+                          or a list/sequence of strings for multi-target.
+            feature_columns: Subset of columns to use as features X (excluding targets).
+                           If None, all columns except the targets will be used.
+            past_size: Number of past instances to include in each window
+            forecast_size: Number of future instances to include as offset (0 means next element after past data,
+                          1 means one more step ahead, etc.). A list or range of offsets emits one
+                          target per horizon from a single pass.
+            stream_period: Delay between consecutive messages (ms)
+            timeout: Maximum wait time (ms)
+            output_format: Name of a registered output format ("pandas", "dict", "numpy",
+                          "arrow", "river" or a custom one) or an OutputFormat instance
+                          used to build X_past
+            **kwargs: Forwarded to ParquetDatasetGenerator (e.g. compact_records)
+        """
+        self._init_window(past_size, forecast_size, output_format)
+
+        super().__init__(
+            filepath=filepath,
+            target_column=target_column,
+            feature_columns=feature_columns,
+            stream_period=stream_period,
+            timeout=timeout,
+            **kwargs
+        )
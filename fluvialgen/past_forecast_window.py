@@ -0,0 +1,226 @@
+"""Past/forecast windowing shared by the past-forecast batchers."""
+import operator
+from collections.abc import Mapping
+from typing import Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from fluvialgen.output_formats import OutputFormat, get_output_format
+from fluvialgen.ring_buffer import RingBuffer
+
+
+def resolve_horizons(forecast_size: Union[int, Sequence[int]]) -> Tuple[Optional[Tuple[int, ...]], int]:
+    """
+    Splits a forecast_size argument into (horizons, largest horizon).
+
+    An integer (NumPy integers included) is a single horizon and gives
+    ``None`` horizons; a list or range gives the tuple of horizons in the
+    order they were given.
+    """
+    try:
+        # Any integer, including NumPy integers
+        return None, operator.index(forecast_size)
+    except TypeError:
+        pass
+    horizons = tuple(int(h) for h in forecast_size)
+    if not horizons:
+        raise ValueError("forecast_size must contain at least one horizon")
+    if min(horizons) < 0:
+        raise ValueError("Forecast horizons must be non-negative")
+    if len(set(horizons)) != len(horizons):
+        raise ValueError("Forecast horizons must be unique")
+    return horizons, max(horizons)
+
+
+def horizon_targets(output: OutputFormat, horizons: Sequence[int], ys: list):
+    """
+    Builds the target of a multi-horizon instance from the y of each horizon.
+
+    With pandas output, single targets give a Series and multi-target dicts a
+    DataFrame, both indexed by horizon. Other formats use their vector (or,
+    for multi-target, frame) converter.
+    """
+    multi = isinstance(ys[0], Mapping)
+    if multi:
+        ys = [dict(y) for y in ys]
+    if output.name == "pandas":
+        index = pd.Index(horizons, name="horizon")
+        return pd.DataFrame(ys, index=index) if multi else pd.Series(ys, index=index)
+    return output.frame(ys) if multi else output.vector(ys)
+
+
+class PastForecastWindowMixin:
+    """
+    Builds (X_past, y_forecast) instances on top of a generator yielding (x, y).
+
+    Must precede the source generator in the bases so that ``super().get_message()``
+    pulls the next (x, y) element from the source.
+    """
+    _emits_windows = True
+
+    def _init_window(self, past_size: int, forecast_size: Union[int, Sequence[int]],
+                     output_format="pandas"):
+        """Sets up the window buffer; call before initializing the source."""
+        self.past_size = past_size
+        self.forecast_size = forecast_size
+        self.horizons, self._max_horizon = resolve_horizons(forecast_size)
+        self._output = get_output_format(output_format)
+        self.output_format = self._output.name
+        # The buffer only grows to the largest horizon
+        self.buffer = RingBuffer(past_size + 1 + self._max_horizon)
+        self._batch_count = 0  # Count of batches produced, not individual elements
+        self._last_element = None
+
+    def _shard_overlap(self):
+        """Rows after its first row that an instance spans (past window and largest horizon)."""
+        return self.past_size + self._max_horizon
+
+    def _can_fill(self):
+        """Whether more rows may be pulled from the source to fill the window."""
+        return True
+
+    def _count_instance(self):
+        """Counts an emitted instance (see ``get_count``)."""
+        self._batch_count += 1
+
+    def _convert_to_pandas(self, instance):
+        """
+        Converts an instance to pandas objects.
+        
+        Args:
+            instance: A tuple (past_x, past_y)
+            
+        Returns:
+            tuple: (pd.DataFrame, Union[float, dict]) where:
+            - X_past is a DataFrame with all past x data
+            - y_past is the forecast value(s) - single value for single target, dict for multi-target
+        """
+        past_x, past_y = instance
+        
+        # Create DataFrame (past_y is already a single value or dict, no need to convert)
+        past_x_df = pd.DataFrame(past_x)
+        
+        return past_x_df, past_y
+
+    def _convert_output(self, instance):
+        """
+        Converts an instance with the configured output format.
+
+        Returns:
+            tuple: (X_past, y_past) where X_past is built by the format's frame converter
+        """
+        if self.output_format == "pandas":
+            return self._convert_to_pandas(instance)
+        past_x, past_y = instance
+        return self._output.frame(past_x), past_y
+
+    def get_message(self):
+        """
+        Gets the next instance with past and forecast windows in the configured output format.
+        The forecast_size parameter determines which future data to include.
+        
+        For example, with past_size=3 and forecast_size=0:
+        At time t=4:
+        - X_past = DataFrame with [x1, x2, x3]
+        - y_past = y4 (value at past_size + forecast_size position)
+        
+        With past_size=3 and forecast_size=1:
+        - X_past = DataFrame with [x1, x2, x3]
+        - y_past = y5 (value at past_size + forecast_size position)
+
+        With past_size=3 and forecast_size=[0, 2]:
+        - X_past = DataFrame with [x1, x2, x3]
+        - y_past = Series [y4, y6] indexed by horizon (a DataFrame for multi-target)
+        """
+        try:
+            # We need at least past_size + 1 + forecast_size elements to form an instance
+            # (the largest horizon when several are requested)
+            required_min_elements = self.past_size + 1 + self._max_horizon
+            
+            # Try to get the next element
+            try:
+                x, y = super().get_message()
+                self.buffer.append((x, y))
+                self._last_element = (x, y)
+            except StopIteration:
+                # If we can't get more data and we don't have enough elements, stop
+                if len(self.buffer) < required_min_elements:
+                    raise StopIteration("No more data available")
+            
+            # If we don't have enough elements yet, try to get more
+            while len(self.buffer) < required_min_elements and self._can_fill():
+                try:
+                    x, y = super().get_message()
+                    self.buffer.append((x, y))
+                    self._last_element = (x, y)
+                except StopIteration:
+                    # If we can't get more data and we don't have enough elements, stop
+                    if len(self.buffer) < required_min_elements:
+                        raise StopIteration("No more data available")
+                    break
+
+            # The source may stop short of a full window (e.g. n_instances reached)
+            if len(self.buffer) < required_min_elements:
+                raise StopIteration("No more data available")
+
+            # Get past data
+            past_data = self.buffer.window(0, self.past_size)
+            past_x = [x for x, _ in past_data]
+            
+            # Get past_y values including the forecast position
+            
+            # Add the forecast element y-value based on forecast_size
+            forecast_position = self.past_size + self._max_horizon
+            if len(self.buffer) <= forecast_position:
+                raise StopIteration(f"Not enough data for forecast at position {forecast_position}")
+            
+            
+            if self.horizons is None:
+                past_y = self.buffer[forecast_position][1]
+            else:
+                # One target per horizon, all read from the same buffer
+                past_y = horizon_targets(
+                    self._output,
+                    self.horizons,
+                    [self.buffer[self.past_size + h][1] for h in self.horizons],
+                )
+            
+
+            # Create instance
+            instance = (past_x, past_y)
+            
+            # Remove the first element if we have more elements
+            if len(self.buffer) > self.past_size:
+                self.buffer.popleft()
+            
+            self._count_instance()
+            if self._stats is None:
+                return self._convert_output(instance)
+            return self._timed_convert(self._convert_output, instance)
+            
+        except StopIteration:
+            self.stop()
+            raise
+
+    def get_count(self):
+        """
+        Returns the total number of instances processed.
+        """
+        return self._batch_count
+
+    def state_dict(self):
+        """Adds the window buffer contents to the source position."""
+        state = super().state_dict()
+        state["buffer"] = list(self.buffer)
+        state["last_element"] = self._last_element
+        state["batch_count"] = self._batch_count
+        return state
+
+    def load_state_dict(self, state):
+        """Restores the source position and refills the window buffer."""
+        super().load_state_dict(state)
+        self.buffer.clear()
+        for row in state["buffer"]:
+            self.buffer.append(row)
+        self._last_element = state["last_element"]
+        self._batch_count = state["batch_count"]
@@ -0,0 +1,301 @@
+"""Runs any generator in the background so data production overlaps consumption."""
+import functools
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Union
+
+from fluvialgen.base_generator import BaseGenerator
+
+_ITEM = "item"
+_END = "end"
+_ERROR = "error"
+_STATE = "state"
+_STATE_ERROR = "state_error"
+
+# How often blocked producers and consumers re-check for a stop request (s)
+_POLL_INTERVAL = 0.1
+
+
+def _portable_error(exc: BaseException) -> BaseException:
+    """Returns ``exc`` if it survives pickling, else a RuntimeError describing it."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+def _resume(factory, state):
+    """Builds a generator with ``factory`` and loads a checkpoint into it."""
+    generator = factory()
+    generator.load_state_dict(state)
+    return generator
+
+
+def _produce(source, out, stop_event, snapshot_event, portable=False):
+    """
+    Pulls messages from ``source`` into ``out`` until it is exhausted or stopped.
+
+    Runs in the background thread or process; ``source`` may be a generator or a
+    zero-argument callable that builds one there. When ``snapshot_event`` is
+    set, the source's ``state_dict`` is put on ``out`` after the messages
+    produced so far.
+    """
+    generator = None
+    try:
+        generator = source() if not isinstance(source, BaseGenerator) else source
+        while not stop_event.is_set():
+            if snapshot_event.is_set():
+                snapshot_event.clear()
+                try:
+                    message = (_STATE, generator.state_dict())
+                except Exception as e:
+                    message = (_STATE_ERROR, _portable_error(e) if portable else e)
+            else:
+                try:
+                    message = (_ITEM, next(generator))
+                except StopIteration:
+                    message = (_END, None)
+                except Exception as e:
+                    message = (_ERROR, _portable_error(e) if portable else e)
+            while not stop_event.is_set():
+                try:
+                    out.put(message, timeout=_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    continue
+            if message[0] in (_END, _ERROR):
+                return
+    except Exception as e:
+        # Building the generator failed
+        out.put((_ERROR, _portable_error(e) if portable else e))
+    finally:
+        if generator is not None:
+            generator.stop()
+        if portable and stop_event.is_set():
+            # Do not block process exit on messages nobody will read
+            out.cancel_join_thread()
+
+
+class PrefetchGenerator(BaseGenerator):
+    """
+    Wraps a generator and produces its messages ahead of time in the background.
+
+    The wrapped generator is advanced with ``next`` (so its own stream_period
+    still applies) in a background thread or process, and its messages are
+    handed over through a bounded queue of ``depth`` messages. Exceptions raised
+    by the source are re-raised by ``get_message`` in the consumer, and the end
+    of the source ends this generator. ``stop`` stops the producer, which in
+    turn calls the source's ``stop``.
+
+    Threads suit sources that release the GIL (file and network I/O, pandas
+    parsing). Processes run pure-Python work truly in parallel, at the cost of
+    pickling every message; with the "spawn" start method the source must be
+    picklable, so pass a factory such as ``functools.partial(CSVDatasetGenerator, ...)``.
+
+    The background worker starts with the first message (or ``state_dict``), so
+    that ``load_state_dict`` can first position the source. Checkpoints hold the
+    source's state and the messages it produced ahead of the consumer, which are
+    emitted again on resume.
+
+    Args:
+        source: The generator to wrap, or a zero-argument callable returning one
+        depth: Maximum number of messages produced ahead of the consumer
+        mode: "thread" or "process"
+        stream_period: Delay between consecutive messages (ms)
+        timeout: Maximum wait time (ms)
+    """
+
+    def __init__(
+        self,
+        source: Union[BaseGenerator, Callable[[], BaseGenerator]],
+        depth: int = 8,
+        mode: str = "thread",
+        stream_period: int = 0,
+        timeout: int = 30000,
+        **kwargs
+    ):
+        super().__init__(stream_period=stream_period, timeout=timeout)
+        if depth <= 0:
+            raise ValueError("depth must be a positive integer")
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown mode '{mode}', expected 'thread' or 'process'")
+        if not isinstance(source, BaseGenerator) and not callable(source):
+            raise TypeError("source must be a BaseGenerator or a callable returning one")
+        self.source = source
+        self.depth = depth
+        self.mode = mode
+        self._finished = False
+        self._build = source  # What the worker produces from (a resumed factory after load_state_dict)
+        self._worker = None
+        self._exhausted = False  # Resumed from a checkpoint taken after the source ended
+        # Messages taken off the queue by state_dict (or restored) but not yet consumed
+        self._pending = deque()
+
+        if mode == "thread":
+            self._queue = queue.Queue(maxsize=depth)
+            self._stop_event = threading.Event()
+            self._snapshot_event = threading.Event()
+        else:
+            ctx = multiprocessing.get_context()
+            self._queue = ctx.Queue(maxsize=depth)
+            self._stop_event = ctx.Event()
+            self._snapshot_event = ctx.Event()
+
+    def _start(self):
+        """Starts the background producer unless it is running or not needed."""
+        if self._worker is not None or self._finished or self._exhausted:
+            return
+        args = (self._build, self._queue, self._stop_event, self._snapshot_event)
+        if self.mode == "thread":
+            self._worker = threading.Thread(target=_produce, args=args, daemon=True)
+        else:
+            ctx = multiprocessing.get_context()
+            self._worker = ctx.Process(target=_produce, args=args + (True,), daemon=True)
+        self._worker.start()
+
+    def __next__(self):
+        # Respect BaseGenerator timing logic
+        super().__next__()
+        return self._release(self.get_message())
+
+    def _take(self):
+        while True:
+            try:
+                return self._queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._worker.is_alive():
+                    # The worker may have put its last message just before exiting
+                    try:
+                        return self._queue.get(timeout=_POLL_INTERVAL)
+                    except queue.Empty:
+                        raise RuntimeError("Prefetch worker exited without finishing the stream")
+
+    def get_message(self):
+        if self._finished:
+            raise StopIteration
+        if self._pending:
+            # Production resumes behind the pending messages
+            self._start()
+            kind, payload = self._pending.popleft()
+            return self._handle(kind, payload, 0)
+        self._start()
+        stats = self._stats
+        start = time.perf_counter_ns() if stats is not None else 0
+        try:
+            kind, payload = self._take()
+        except RuntimeError:
+            self.stop()
+            raise
+        return self._handle(kind, payload, start)
+
+    def _handle(self, kind, payload, start):
+        """Returns a produced message, or ends the stream on its end or error."""
+        stats = self._stats
+        if stats is not None and start:
+            stats.fetch_ns += time.perf_counter_ns() - start
+        if kind == _ITEM:
+            if stats is not None:
+                stats.source_items += 1
+            self._count += 1
+            return payload
+        self.stop()
+        if kind == _END:
+            raise StopIteration
+        raise payload
+
+    def state_dict(self):
+        """
+        Adds the source's state and the messages it produced ahead of the
+        consumer (at most ``depth + 1``). The producer reports the state after
+        its current message; the queue up to that report is drained into the
+        pending messages.
+        """
+        state = super().state_dict()
+        self._start()
+        source_state = None
+        ended = self._finished or any(kind != _ITEM for kind, _ in self._pending)
+        if not ended:
+            self._snapshot_event.set()
+            while True:
+                try:
+                    kind, payload = self._take()
+                except RuntimeError:
+                    self.stop()
+                    raise
+                if kind == _STATE:
+                    source_state = payload
+                    break
+                if kind == _STATE_ERROR:
+                    raise payload
+                self._pending.append((kind, payload))
+                if kind != _ITEM:
+                    # The source ended (or failed) before taking the snapshot
+                    break
+        if any(kind == _ERROR for kind, _ in self._pending):
+            raise RuntimeError("The prefetched source failed; there is no position to checkpoint")
+        state["source"] = source_state
+        state["pending"] = [payload for kind, payload in self._pending if kind == _ITEM]
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Loads the source's state into the source (or, for a factory, into each
+        generator it builds) and queues the pending messages to be emitted first.
+        """
+        if self._worker is not None or self._count or self._pending:
+            raise RuntimeError("load_state_dict must be called before iterating")
+        super().load_state_dict(state)
+        self._pending.extend((_ITEM, message) for message in state["pending"])
+        if state["source"] is None:
+            # The source was exhausted; only the pending messages remain
+            self._exhausted = True
+            self._pending.append((_END, None))
+        elif isinstance(self.source, BaseGenerator):
+            self.source.load_state_dict(state["source"])
+        else:
+            self._build = functools.partial(_resume, self.source, state["source"])
+
+    def _buffer_occupancy(self):
+        try:
+            return self._queue.qsize(), self.depth
+        except NotImplementedError:
+            # multiprocessing queues have no qsize on some platforms
+            return None
+
+    def get_count(self):
+        return self._count
+
+    def stop(self):
+        """Stops the background producer and waits for it to clean up the source."""
+        if self._finished:
+            return
+        self._finished = True
+        self._pending.clear()
+        if self._worker is None:
+            # Never started: nothing to join, but the source is still released
+            if isinstance(self.source, BaseGenerator):
+                self.source.stop()
+            if self.mode == "process":
+                self._queue.close()
+            return
+        self._stop_event.set()
+        # Unblock a producer waiting on a full queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except (queue.Empty, OSError, ValueError):
+            pass
+        self._worker.join(timeout=5)
+        if self.mode == "process":
+            if self._worker.is_alive():
+                self._worker.terminate()
+                self._worker.join()
+            self._queue.close()
+            if isinstance(self.source, BaseGenerator):
+                # Release this process's copy of the source as well
+                self.source.stop()
@@ -0,0 +1,172 @@
+"""Fixed-capacity ring buffer used as the sliding window of the batchers."""
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    A fixed-capacity FIFO buffer with O(1) append/evict and contiguous window slices.
+
+    Every item is written twice, at ``i`` and ``i + capacity`` of a backing list
+    of length ``2 * capacity``. Any run of up to ``capacity`` consecutive items
+    therefore sits contiguously in the backing list, so the current window is a
+    single list slice instead of a reassembly of two wrapped halves.
+
+    Appending to a full buffer evicts the oldest item.
+
+    Args:
+        capacity: Maximum number of items held at once
+    """
+
+    __slots__ = ("capacity", "_items", "_start", "_size")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.capacity = capacity
+        self._items: List[Any] = [None] * (2 * capacity)
+        self._start = 0
+        self._size = 0
+
+    def append(self, item):
+        """Adds an item at the end, evicting the oldest one if the buffer is full."""
+        if self._size == self.capacity:
+            self.popleft()
+        pos = self._start + self._size
+        if pos >= self.capacity:
+            pos -= self.capacity
+        self._items[pos] = item
+        self._items[pos + self.capacity] = item
+        self._size += 1
+
+    def popleft(self):
+        """Removes and returns the oldest item."""
+        if self._size == 0:
+            raise IndexError("pop from an empty RingBuffer")
+        item = self._items[self._start]
+        self._items[self._start] = None
+        self._items[self._start + self.capacity] = None
+        self._start += 1
+        if self._start == self.capacity:
+            self._start = 0
+        self._size -= 1
+        return item
+
+    def clear(self):
+        """Removes all items."""
+        self._items = [None] * (2 * self.capacity)
+        self._start = 0
+        self._size = 0
+
+    def window(self, start: int = 0, length: Optional[int] = None) -> List[Any]:
+        """
+        Returns ``length`` consecutive items beginning at ``start`` (oldest is 0).
+
+        The result is a single contiguous slice of the backing storage.
+        """
+        if length is None:
+            length = self._size - start
+        if start < 0 or length < 0 or start + length > self._size:
+            raise IndexError("window out of range")
+        begin = self._start + start
+        return self._items[begin:begin + length]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.window())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            if step != 1:
+                return self.window()[index]
+            return self.window(start, max(0, stop - start))
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return self._items[self._start + index]
+
+    def __eq__(self, other):
+        if isinstance(other, RingBuffer):
+            return self.window() == other.window()
+        if isinstance(other, (list, tuple)):
+            return self.window() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"RingBuffer(capacity={self.capacity}, items={self.window()!r})"
+
+
+class ArrayRingBuffer:
+    """
+    A fixed-capacity ring buffer of numeric rows backed by contiguous NumPy arrays.
+
+    Uses the same double-write layout as RingBuffer: features live in a
+    ``(2 * capacity, n_features)`` float64 array and targets in a
+    ``(2 * capacity,)`` array, so any run of consecutive rows is a contiguous
+    view that can be re-strided into overlapping windows without copying.
+
+    Args:
+        capacity: Maximum number of rows held at once
+        n_features: Number of feature columns per row
+    """
+
+    __slots__ = ("capacity", "n_features", "features", "targets", "_start", "_size")
+
+    def __init__(self, capacity: int, n_features: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.capacity = capacity
+        self.n_features = n_features
+        self.features = np.zeros((2 * capacity, n_features), dtype=np.float64)
+        self.targets = np.zeros(2 * capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def append(self, x_values, y_value):
+        """Adds a row, evicting the oldest one if the buffer is full."""
+        if self._size == self.capacity:
+            self.popleft()
+        pos = self._start + self._size
+        if pos >= self.capacity:
+            pos -= self.capacity
+        self.features[pos] = x_values
+        self.features[pos + self.capacity] = x_values
+        self.targets[pos] = y_value
+        self.targets[pos + self.capacity] = y_value
+        self._size += 1
+
+    def popleft(self):
+        """Evicts the oldest row."""
+        if self._size == 0:
+            raise IndexError("pop from an empty ArrayRingBuffer")
+        self._start += 1
+        if self._start == self.capacity:
+            self._start = 0
+        self._size -= 1
+
+    def clear(self):
+        """Removes all rows."""
+        self._start = 0
+        self._size = 0
+
+    def window(self, start: int = 0, length: Optional[int] = None):
+        """
+        Returns ``(features, targets)`` views over ``length`` consecutive rows.
+
+        The views share memory with the buffer and are only valid until the
+        buffer is modified again.
+        """
+        if length is None:
+            length = self._size - start
+        if start < 0 or length < 0 or start + length > self._size:
+            raise IndexError("window out of range")
+        begin = self._start + start
+        return self.features[begin:begin + length], self.targets[begin:begin + length]
+
+    def __len__(self) -> int:
+        return self._size
@@ -1,26 +1,61 @@
 """Implements a wraper for river datasets."""
 
 from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.schema import FeatureSchema
 import gc
+import itertools
 
 
 class RiverDatasetGenerator(BaseGenerator):
 
-    def __init__(self, dataset, stream_period=0, timeout=30000, n_instances=1000, **kwargs):
+    def __init__(self, dataset, stream_period=0, timeout=30000, n_instances=1000,
+                 compact_records=False, replay_column=None, replay_speed=1.0,
+                 shard_id=0, num_shards=1, shard_mode="contiguous", **kwargs):
         """
         Args:
             stream_period (int): Delay between two consecutive messages, in ms.
             timeout (int): (Optional) Not used in this example, but included for completeness.
+            compact_records (bool): If True, x is emitted as a read-only Record mapping
+                sharing a FeatureSchema (inferred from the keys of the first x) instead
+                of the dataset's dict.
+            replay_column (str): (Optional) Key of a timestamp in x. When given, messages
+                are released at the pace of the gaps between consecutive timestamps.
+            replay_speed (float): Replay speed multiplier (1.0 is the original cadence).
+            shard_id (int): Index of this worker's shard, in [0, num_shards).
+            num_shards (int): Number of disjoint shards the stream is split into.
+            shard_mode (str): "contiguous" gives each shard one block of the first
+                n_instances items (or the dataset's n_samples, if smaller), plus
+                the overlap window batchers need. "round_robin" gives it every
+                num_shards-th item and is not available for batchers. River
+                datasets cannot seek, so items before a shard are still read.
         """
         super().__init__(stream_period=stream_period, timeout=timeout)
+        self._init_replay(replay_column, replay_speed)
+        self._init_shards(shard_id, num_shards, shard_mode)
         self.n_instances = n_instances
-        self._iterator = iter(dataset.take(n_instances))
+        self.compact_records = compact_records
+        self.schema = None
+        self._iterator = self._shard(iter(dataset.take(n_instances)), dataset)
+        self._offset = 0  # Items taken from the dataset
         self._dataset = dataset  # Store dataset reference for cleanup
         self._file = None
         # Get the file object if it exists
         if hasattr(dataset, '_file'):
             self._file = dataset._file
 
+    def _shard(self, iterator, dataset):
+        """Restricts the item iterator to this worker's shard."""
+        if self.num_shards == 1:
+            return iterator
+        if self.shard_mode == "round_robin":
+            return itertools.islice(iterator, self.shard_id, None, self.num_shards)
+        total = self.n_instances
+        n_samples = getattr(dataset, "n_samples", None)
+        if n_samples is not None:
+            total = min(total, n_samples)
+        start, stop = self._shard_range(total)
+        return itertools.islice(iterator, start, stop)
+
     def __next__(self):
         """
         We override __next__ so that it:
@@ -31,7 +66,7 @@ class RiverDatasetGenerator(BaseGenerator):
         super().__next__()
 
         # Step 2: fetch the next message (x, y)
-        return self.get_message()
+        return self._release(self.get_message())
 
     def get_message(self):
         """
@@ -39,15 +74,63 @@ class RiverDatasetGenerator(BaseGenerator):
         If the dataset is exhausted, it calls stop() and raises StopIteration.
         """
         try:
-            x, y = next(self._iterator)
+            if self._stats is None:
+                x, y = next(self._iterator)
+            else:
+                x, y = self._timed_fetch(next, self._iterator)
             # Return the data in whichever format you prefer.
             # For instance, a tuple, dict, or list:
+            if self.compact_records:
+                x = self._to_record(x)
+            self._observe(x)
+            self._offset += 1
             self._count += 1
             return x, y
         except StopIteration:
             self.stop()     # Optionally perform any cleanup here
             raise
 
+    def _bulk_messages(self, n):
+        # Batchers built on this class emit windows, not dataset items
+        if self._emits_windows:
+            return super()._bulk_messages(n)
+        if self._iterator is None:
+            return []
+        items = list(itertools.islice(self._iterator, n))
+        if self.compact_records:
+            items = [(self._to_record(x), y) for x, y in items]
+        self._offset += len(items)
+        self._count += len(items)
+        if len(items) < n:
+            self.stop()
+        return items
+
+    def state_dict(self):
+        state = super().state_dict()
+        state["offset"] = self._offset
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Skips the items consumed before the checkpoint. River datasets cannot
+        seek, so the skipped items are still read (but not processed).
+        """
+        if self._offset:
+            raise RuntimeError("load_state_dict must be called before iterating")
+        super().load_state_dict(state)
+        offset = state["offset"]
+        if offset:
+            skipped = sum(1 for _ in itertools.islice(self._iterator, offset))
+            if skipped < offset:
+                raise ValueError(f"The dataset has only {skipped} items, cannot resume at {offset}")
+        self._offset = offset
+
+    def _to_record(self, x):
+        """Packs x into a Record, starting a new schema if the keys change."""
+        if self.schema is None or tuple(x) != self.schema.names:
+            self.schema = FeatureSchema(tuple(x))
+        return self.schema.record(x.values())
+
     def get_count(self):
         return self._count
 
@@ -0,0 +1,134 @@
+"""Compact, schema-backed row records shared by the generators."""
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+class FeatureSchema:
+    """
+    Column names, their positions and (optionally) their dtypes, shared by many records.
+
+    When every dtype is a floating point type the schema is *packed*: record
+    values are stored as raw doubles in an ``array('d')`` instead of a tuple of
+    Python objects, which removes the per-value object overhead. Records built
+    together with ``records`` share one flat block of doubles.
+
+    Args:
+        names: Column names in record order
+        dtypes: Optional dtypes matching ``names``
+    """
+
+    __slots__ = ("names", "dtypes", "positions", "packed")
+
+    def __init__(self, names: Sequence[str], dtypes: Optional[Sequence[Any]] = None):
+        self.names = tuple(names)
+        if dtypes is not None:
+            dtypes = tuple(np.dtype(d) for d in dtypes)
+            if len(dtypes) != len(self.names):
+                raise ValueError("dtypes must have the same length as names")
+        self.dtypes = dtypes
+        self.positions: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.packed = bool(self.names) and dtypes is not None and all(
+            d.kind == "f" for d in dtypes
+        )
+
+    @classmethod
+    def from_frame(cls, df, columns: Sequence[str]) -> "FeatureSchema":
+        """Builds a schema for ``columns`` using the dtypes of a DataFrame."""
+        return cls(columns, [df[c].dtype if isinstance(df[c].dtype, np.dtype) else object
+                             for c in columns])
+
+    def record(self, values) -> "Record":
+        """Creates a record from values given in schema order."""
+        values = array("d", values) if self.packed else tuple(values)
+        if len(values) != len(self.names):
+            raise ValueError("Number of values does not match the schema")
+        return Record(self, values)
+
+    def records(self, rows) -> List["Record"]:
+        """
+        Creates one record per row of values given in schema order.
+
+        For packed schemas all rows are stored in a single shared block.
+        """
+        if not self.packed:
+            return [Record(self, tuple(values)) for values in rows]
+        block = array("d")
+        for values in rows:
+            block.extend(values)
+        width = len(self.names)
+        return [Record(self, block, offset) for offset in range(0, len(block), width)]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other):
+        if not isinstance(other, FeatureSchema):
+            return NotImplemented
+        return self.names == other.names and self.dtypes == other.dtypes
+
+    def __hash__(self):
+        return hash((self.names, self.dtypes))
+
+    def __repr__(self):
+        return f"FeatureSchema(names={list(self.names)!r})"
+
+
+class Record(Mapping):
+    """
+    A read-only mapping over one row of values laid out by a FeatureSchema.
+
+    Behaves like the ``dict`` River models expect (``x[name]``, ``x.items()``,
+    ``x.get(name)``, comparison with dicts), while only storing a reference to
+    the shared schema and a compact value container.
+
+    Args:
+        schema: The schema describing the values
+        values: Values in schema order (tuple or array), or a block holding
+                several rows back to back
+        offset: Position of this record's first value inside ``values``
+    """
+
+    __slots__ = ("_schema", "_values", "_offset")
+
+    def __init__(self, schema: FeatureSchema, values, offset: int = 0):
+        if offset < 0 or offset + len(schema.names) > len(values):
+            raise ValueError("Number of values does not match the schema")
+        self._schema = schema
+        self._values = values
+        self._offset = offset
+
+    @property
+    def schema(self) -> FeatureSchema:
+        return self._schema
+
+    def __getitem__(self, key):
+        return self._values[self._offset + self._schema.positions[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema.names)
+
+    def __len__(self) -> int:
+        return len(self._schema.names)
+
+    def __contains__(self, key) -> bool:
+        return key in self._schema.positions
+
+    def _own_values(self):
+        return self._values[self._offset:self._offset + len(self._schema.names)]
+
+    def copy(self) -> dict:
+        """Returns a mutable ``dict`` copy, like ``dict.copy``."""
+        return dict(zip(self._schema.names, self._own_values()))
+
+    def to_dict(self) -> dict:
+        return self.copy()
+
+    def __reduce__(self):
+        # Only this record's values are pickled, not a shared block
+        return Record, (self._schema, self._own_values())
+
+    def __repr__(self):
+        return f"Record({self.copy()!r})"
@@ -0,0 +1,133 @@
+"""Column handling shared by the file-backed (tabular) generators."""
+import itertools
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.schema import FeatureSchema
+
+
+def _column_values(series: pd.Series, keep_dtype: bool = False) -> list:
+    """
+    Values of a column as a list: Python numbers and booleans for numeric
+    columns, Timestamps for datetimes and the stored objects otherwise.
+    ``keep_dtype`` keeps numeric values as NumPy scalars of the column's dtype
+    (e.g. float32 or int64 epoch columns of a dtype plan).
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        values = series.to_numpy()
+        return list(values) if keep_dtype else values.tolist()
+    return list(series.to_numpy(dtype=object))
+
+
+class TabularSourceMixin:
+    """
+    Target/feature column resolution and row materialization for generators
+    reading tabular files (CSV, Parquet) that yield (x, y) tuples.
+    """
+
+    _source_label = "file"
+    # Set by sources that read a column subset or apply a dtype plan (see _frame_to_rows)
+    _columnwise_values = False
+
+    def _init_columns(self, target_column, feature_columns: Optional[Sequence[str]],
+                      compact_records: bool = False):
+        """Sets up target and feature columns (features may be resolved later)."""
+        # Handle both single target and multi-target
+        if isinstance(target_column, str):
+            self.target_columns = [target_column]
+            self.is_multi_target = False
+        else:
+            self.target_columns = list(target_column)
+            self.is_multi_target = True
+
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        self.compact_records = compact_records
+        self.schema: Optional[FeatureSchema] = None
+        self.target_schema: Optional[FeatureSchema] = None
+
+    def _bulk_messages(self, n):
+        """Slices up to n rows off the row iterator (see BaseGenerator.next_batch)."""
+        # The past/forecast batchers reuse these sources but emit windows
+        if self._emits_windows:
+            return super()._bulk_messages(n)
+        if self._iterator is None:
+            return []
+        rows = list(itertools.islice(self._iterator, n))
+        self._count += len(rows)
+        if len(rows) < n:
+            self.stop()
+        return rows
+
+    def _used_columns(self) -> List[str]:
+        """Feature and target columns, without duplicates."""
+        return list(dict.fromkeys(self.feature_columns + self.target_columns))
+
+    def _resolve_columns(self, columns):
+        """Validates target/feature columns against the source's columns."""
+        # Validate target columns
+        for col in self.target_columns:
+            if col not in columns:
+                raise ValueError(f"Target column '{col}' not found in {self._source_label}")
+
+        if self.feature_columns is None:
+            self.feature_columns = [c for c in columns if c not in self.target_columns]
+        else:
+            for col in self.feature_columns:
+                if col not in columns:
+                    raise ValueError(f"Feature column '{col}' not found in {self._source_label}")
+
+        replay_column = getattr(self, "replay_column", None)
+        if replay_column is not None and replay_column not in self.feature_columns:
+            raise ValueError(f"replay_column '{replay_column}' must be one of the feature columns")
+
+    def _frame_to_rows(self, df: pd.DataFrame) -> List[Tuple[dict, Union[float, dict]]]:
+        """Converts a parsed frame into a list of (x, y) tuples.
+
+        Columns are extracted in bulk with the same interleaved dtype that
+        ``DataFrame.iterrows`` would use for each row, so values (and their
+        types) are identical to a row-by-row walk without the per-row Series.
+        Sources that only read some columns or apply a dtype plan convert each
+        column on its own instead (see ``_column_values``), so a value's type
+        does not depend on which other columns are read.
+        """
+        if len(df) == 0:
+            return []
+        if self._columnwise_values:
+            planned = getattr(self, "dtype_plan", None) or {}
+
+            def column(col):
+                return _column_values(df[col], keep_dtype=col in planned)
+        else:
+            # iterrows upcasts every row to the frame's common dtype; datetime-only
+            # frames come back as Timestamps, which object conversion preserves
+            dtype = df.iloc[:0].to_numpy().dtype
+            if dtype.kind in "mM":
+                dtype = object
+
+            def column(col):
+                return list(df[col].to_numpy(dtype=dtype))
+
+        xs = zip(*[column(col) for col in self.feature_columns])
+        if self.compact_records:
+            self.schema = self._shared_schema(self.schema, df, self.feature_columns)
+            x_rows = self.schema.records(xs)
+        else:
+            x_rows = [dict(zip(self.feature_columns, values)) for values in xs]
+        if self.is_multi_target:
+            ys = zip(*[column(col) for col in self.target_columns])
+            if self.compact_records:
+                self.target_schema = self._shared_schema(self.target_schema, df, self.target_columns)
+                y_rows = self.target_schema.records(ys)
+            else:
+                y_rows = [dict(zip(self.target_columns, values)) for values in ys]
+        else:
+            y_rows = column(self.target_columns[0])
+        return list(zip(x_rows, y_rows))
+
+    @staticmethod
+    def _shared_schema(current, df, columns):
+        """Reuses the current schema unless this frame's dtypes differ (e.g. across chunks)."""
+        schema = FeatureSchema.from_frame(df, columns)
+        return current if schema == current else schema
@@ -0,0 +1,128 @@
+"""Fan-out of one generator to several consumers through a shared buffer."""
+import threading
+from collections import deque
+from typing import Iterator, List, Optional
+
+from fluvialgen.base_generator import BaseGenerator
+
+
+class Tee:
+    """
+    Reads a generator once and replays its messages to several branches.
+
+    Each branch behaves like a River dataset (it has ``take(n)`` and can be
+    iterated), so it can be passed as the ``dataset`` of any batcher built on
+    RiverDatasetGenerator. Messages are pulled from the source on demand by
+    whichever branch is ahead and kept in one shared buffer until every open
+    branch has consumed them, so memory is bounded by the lag between the
+    fastest and the slowest branch. Closing a branch (batchers do this in
+    ``stop()``) releases what it was holding back; the source is stopped once
+    every branch is closed.
+
+    Args:
+        source: Generator yielding the messages to share, e.g. a
+                RiverDatasetGenerator or CSVDatasetGenerator
+        max_lag: If given, a branch that would make the buffer exceed this
+                 many messages raises RuntimeError instead of growing it
+    """
+
+    def __init__(self, source: BaseGenerator, max_lag: Optional[int] = None):
+        if max_lag is not None and max_lag <= 0:
+            raise ValueError("max_lag must be a positive integer")
+        self.source = source
+        self.max_lag = max_lag
+        self._buffer = deque()
+        self._base = 0  # Position of the first buffered message
+        self._exhausted = False
+        self._branches: List["TeeBranch"] = []
+        self._lock = threading.Lock()
+        self.max_buffered = 0
+
+    @property
+    def buffered(self) -> int:
+        """Number of messages currently held for slower branches."""
+        return len(self._buffer)
+
+    def branch(self) -> "TeeBranch":
+        """
+        Creates a new branch starting at the oldest message still buffered.
+
+        Create all branches before consuming any of them to have each one see
+        the whole stream.
+        """
+        with self._lock:
+            branch = TeeBranch(self, self._base)
+            self._branches.append(branch)
+            return branch
+
+    def _get(self, branch: "TeeBranch"):
+        """Returns the message at the branch's position, pulling from the source if needed."""
+        with self._lock:
+            offset = branch.position - self._base
+            if offset == len(self._buffer):
+                if self._exhausted:
+                    raise StopIteration
+                if self.max_lag is not None and len(self._buffer) >= self.max_lag:
+                    raise RuntimeError(
+                        f"Tee buffer reached max_lag={self.max_lag}: a branch is too far behind"
+                    )
+                try:
+                    self._buffer.append(next(self.source))
+                except StopIteration:
+                    self._exhausted = True
+                    raise
+                self.max_buffered = max(self.max_buffered, len(self._buffer))
+            message = self._buffer[offset]
+            branch.position += 1
+            self._evict()
+            return message
+
+    def _evict(self):
+        """Drops messages every open branch has consumed."""
+        if not self._branches:
+            return
+        slowest = min(b.position for b in self._branches)
+        while self._base < slowest:
+            self._buffer.popleft()
+            self._base += 1
+
+    def _close(self, branch: "TeeBranch"):
+        with self._lock:
+            if branch in self._branches:
+                self._branches.remove(branch)
+            if self._branches:
+                self._evict()
+            else:
+                self._buffer.clear()
+                self.source.stop()
+
+
+class TeeBranch:
+    """One consumer's view of a Tee; see ``Tee.branch``."""
+
+    def __init__(self, tee: Tee, position: int):
+        self._tee = tee
+        self.position = position
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        return self._tee._get(self)
+
+    def take(self, n: int) -> Iterator:
+        """Yields at most ``n`` messages, like ``river.datasets`` ``take``."""
+        for _ in range(n):
+            try:
+                yield next(self)
+            except StopIteration:
+                return
+
+    def close(self):
+        """Stops this branch and releases the messages it was holding back."""
+        if not self.closed:
+            self.closed = True
+            self._tee._close(self)
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+async def _collect(gen):
+    return [message async for message in gen]
+
+
+class TestAsyncIteration(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [({"x": float(i)}, i) for i in range(6)]
+
+    def test_async_for_matches_sync_iteration(self):
+        expected = list(RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=6))
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=6)
+        self.assertEqual(asyncio.run(_collect(gen)), expected)
+        self.assertEqual(gen.get_count(), 6)
+
+    def test_async_batcher(self):
+        gen = MovingWindowBatcher(
+            dataset=MockDataset(self.data), instance_size=2, batch_size=1, n_instances=6
+        )
+        expected = list(MovingWindowBatcher(
+            dataset=MockDataset(self.data), instance_size=2, batch_size=1, n_instances=6
+        ))
+        batches = asyncio.run(_collect(gen))
+        self.assertEqual(len(batches), len(expected))
+        for (X, y), (X_sync, y_sync) in zip(batches, expected):
+            pd.testing.assert_frame_equal(X, X_sync)
+            pd.testing.assert_series_equal(y, y_sync)
+
+    def test_paced_streams_share_the_event_loop(self):
+        async def run_all():
+            gens = [
+                RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=4, stream_period=100)
+                for _ in range(5)
+            ]
+            return await asyncio.gather(*(_collect(g) for g in gens))
+
+        start = time.perf_counter()
+        results = asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+        self.assertEqual([len(r) for r in results], [4] * 5)
+        # Five streams of four 100ms-paced messages run concurrently (~0.4s),
+        # not back to back (~2s)
+        self.assertLess(elapsed, 1.2)
+
+    def test_acreate_builds_csv_generator_off_loop(self):
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+        tmp.close()
+        pd.DataFrame({"value": [1, 2, 3], "c1": [0.5, 1.5, 2.5]}).to_csv(tmp.name, index=False)
+        try:
+            async def main():
+                gen = await CSVDatasetGenerator.acreate(tmp.name, target_column="value")
+                return await _collect(gen)
+
+            rows = asyncio.run(main())
+            self.assertEqual(rows, [({"c1": 0.5}, 1), ({"c1": 1.5}, 2), ({"c1": 2.5}, 3)])
+        finally:
+            os.unlink(tmp.name)
+
+
+class TestNextBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [({"x": float(i)}, i) for i in range(10)]
+
+    def test_river_chunks_match_iteration(self):
+        expected = list(RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=10))
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=10)
+        chunks = list(gen.iter_chunks(4))
+        self.assertEqual([len(c) for c in chunks], [4, 4, 2])
+        self.assertEqual([m for c in chunks for m in c], expected)
+        self.assertEqual(gen.get_count(), 10)
+        self.assertEqual(gen.next_batch(4), [])
+
+    def test_exact_multiple_ends_with_empty_batch(self):
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=8)
+        self.assertEqual(len(gen.next_batch(4)), 4)
+        self.assertEqual(len(gen.next_batch(4)), 4)
+        self.assertEqual(gen.next_batch(4), [])
+        self.assertEqual(len(list(RiverDatasetGenerator(
+            dataset=MockDataset(self.data), n_instances=8).iter_chunks(4))), 2)
+
+    def test_compact_records(self):
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=3, compact_records=True)
+        x, y = gen.next_batch(3)[2]
+        self.assertEqual(dict(x), {"x": 2.0})
+        self.assertEqual(x.schema, gen.schema)
+
+    def test_csv_bulk_read(self):
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+        tmp.close()
+        self.addCleanup(os.unlink, tmp.name)
+        pd.DataFrame({"value": range(7), "c1": [i / 2 for i in range(7)]}).to_csv(tmp.name, index=False)
+        for kwargs in ({}, {"chunksize": 3}):
+            expected = list(CSVDatasetGenerator(tmp.name, target_column="value", **kwargs))
+            gen = CSVDatasetGenerator(tmp.name, target_column="value", **kwargs)
+            self.assertEqual([m for c in gen.iter_chunks(5) for m in c], expected)
+            self.assertEqual(gen.get_count(), 7)
+
+    def test_batcher_windows(self):
+        expected = list(MovingWindowBatcher(
+            dataset=MockDataset(self.data), instance_size=3, batch_size=2, n_instances=10
+        ))
+        gen = MovingWindowBatcher(dataset=MockDataset(self.data), instance_size=3, batch_size=2, n_instances=10)
+        batches = [b for c in gen.iter_chunks(2) for b in c]
+        self.assertEqual(len(batches), len(expected))
+        for (X, y), (X_e, y_e) in zip(batches, expected):
+            pd.testing.assert_frame_equal(X, X_e)
+
+    def test_paced_stream_keeps_pacing(self):
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=4, stream_period=20)
+        start = time.perf_counter()
+        self.assertEqual(len(gen.next_batch(4)), 4)
+        self.assertGreater(time.perf_counter() - start, 0.05)
+
+    def test_invalid_size(self):
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data))
+        with self.assertRaises(ValueError):
+            gen.next_batch(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
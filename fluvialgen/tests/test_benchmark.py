@@ -0,0 +1,59 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from fluvialgen import benchmark
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = benchmark.run_suite(rows=300, window_sizes=[4], repeat=1)
+
+    def test_run_suite_covers_every_generator(self):
+        self.assertEqual(self.results["schema_version"], benchmark.SCHEMA_VERSION)
+        self.assertEqual(
+            sorted(self.results["results"]),
+            ["csv_chunked", "csv_eager", "moving_window_4", "past_forecast_4"],
+        )
+        csv = self.results["results"]["csv_eager"]
+        self.assertEqual(csv["messages"], 300)
+        for key in ("rows_per_sec", "startup_s", "first_row_s", "latency_p99_us", "peak_memory_mb"):
+            self.assertGreater(csv[key], 0)
+        self.assertGreater(self.results["results"]["past_forecast_4"]["messages_per_sec"], 0)
+        # Results are plain JSON
+        json.dumps(self.results)
+
+    def test_compare_flags_regressions(self):
+        slower = copy.deepcopy(self.results)
+        slower["results"]["csv_eager"]["rows_per_sec"] *= 0.5
+        slower["results"]["csv_eager"]["peak_memory_mb"] *= 1.05
+        rows = {(r["benchmark"], r["metric"]): r for r in benchmark.compare(self.results, slower, 0.1)}
+        self.assertTrue(rows[("csv_eager", "rows_per_sec")]["regression"])
+        self.assertAlmostEqual(rows[("csv_eager", "rows_per_sec")]["change"], -0.5)
+        # Within the threshold
+        self.assertFalse(rows[("csv_eager", "peak_memory_mb")]["regression"])
+        self.assertFalse(any(r["regression"] for r in benchmark.compare(self.results, self.results)))
+
+    def test_compare_command_exit_status(self):
+        slower = copy.deepcopy(self.results)
+        slower["results"]["moving_window_4"]["latency_p50_us"] *= 2
+        with tempfile.TemporaryDirectory() as tmp:
+            base, new = os.path.join(tmp, "base.json"), os.path.join(tmp, "new.json")
+            for path, data in ((base, self.results), (new, slower)):
+                with open(path, "w") as f:
+                    json.dump(data, f)
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(benchmark.main(["compare", base, base]), 0)
+                self.assertEqual(benchmark.main(["compare", base, new]), 1)
+            self.assertIn("REGRESSION", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
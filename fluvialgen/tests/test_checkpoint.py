@@ -0,0 +1,215 @@
+import functools
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.csv_past_forecast_batcher import CSVPastForecastBatcher
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.multi_csv_dataset_generator import MultiCSVDatasetGenerator
+from fluvialgen.parallel_runner import ParallelRunner
+from fluvialgen.parquet_dataset_generator import ParquetDatasetGenerator
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.prefetch_generator import PrefetchGenerator
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+def _assert_same(test, a, b):
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b)
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b)
+    elif isinstance(a, np.ndarray):
+        np.testing.assert_array_equal(a, b)
+    elif isinstance(a, (tuple, list)) and not isinstance(a, str):
+        test.assertEqual(len(a), len(b))
+        for item_a, item_b in zip(a, b):
+            _assert_same(test, item_a, item_b)
+    else:
+        test.assertEqual(a, b)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        start = datetime(2024, 1, 1)
+        self.rows = [({"moment": start + timedelta(hours=i), "rain": float(i % 7)}, float(i)) for i in range(40)]
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "gauge.csv")
+        pd.DataFrame({
+            "moment": pd.date_range("2024-01-01", periods=40, freq="h"),
+            "rain": [float(i % 7) for i in range(40)],
+            "level": [float(i) for i in range(40)],
+        }).to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _check_resume(self, make, cuts=(0, 1, 5, 17)):
+        expected = list(make())
+        for cut in cuts:
+            gen = make()
+            for _ in range(cut):
+                next(gen)
+            state = pickle.loads(pickle.dumps(gen.state_dict()))
+            resumed = make()
+            resumed.load_state_dict(state)
+            rest = list(resumed)
+            self.assertEqual(len(rest), len(expected) - cut, f"cut={cut}")
+            _assert_same(self, rest, expected[cut:])
+
+    def test_river_source(self):
+        self._check_resume(lambda: RiverDatasetGenerator(MockDataset(self.rows), n_instances=40))
+
+    def test_moving_window_batcher(self):
+        for kwargs in ({}, {"lazy": True}, {"array_mode": True}, {"padding": "mask"}):
+            def make():
+                return MovingWindowBatcher(MockDataset(self.rows), instance_size=4, batch_size=3,
+                                           n_instances=40, **kwargs)
+            if kwargs.get("lazy"):
+                self._check_resume(lambda: _Materialized(make()))
+            elif kwargs.get("array_mode"):
+                self._check_resume(lambda: _Copied(make()))
+            else:
+                self._check_resume(make)
+
+    def test_past_forecast_batcher(self):
+        self._check_resume(lambda: PastForecastBatcher(
+            MockDataset(self.rows), past_size=3, forecast_size=[0, 2], n_instances=40
+        ))
+
+    def test_csv_modes(self):
+        for kwargs in ({}, {"chunksize": 6}, {"chunksize": 6, "cache": self.tmpdir},
+                       {"chunksize": 6, "index": True, "start_row": 2}, {"start_row": 2, "stop_row": 35}):
+            self._check_resume(lambda: CSVDatasetGenerator(
+                self.csv, target_column="level", parse_dates=["moment"], **kwargs
+            ))
+
+    def test_chunked_csv_resumes_at_byte_offset(self):
+        gen = CSVDatasetGenerator(self.csv, target_column="level", parse_dates=["moment"], chunksize=6)
+        for _ in range(17):
+            next(gen)
+        state = gen.state_dict()
+        with open(self.csv, "rb") as f:
+            lines = f.readlines()
+        self.assertEqual(state["byte_offset"], sum(len(line) for line in lines[:18]))
+        resumed = CSVDatasetGenerator(self.csv, target_column="level", parse_dates=["moment"], chunksize=6)
+        with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv", wraps=pd.read_csv) as read_csv:
+            resumed.load_state_dict(state)
+        # Reopened at the offset instead of skipping rows
+        self.assertNotIn("skiprows", read_csv.call_args.kwargs)
+        self.assertEqual(next(resumed)[1], 17.0)
+
+    def test_csv_past_forecast_batcher(self):
+        self._check_resume(lambda: CSVPastForecastBatcher(
+            self.csv, target_column="level", parse_dates=["moment"], past_size=4, forecast_size=1, chunksize=5
+        ))
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_parquet_skips_row_groups(self):
+        path = os.path.join(self.tmpdir, "gauge.parquet")
+        pd.read_csv(self.csv, parse_dates=["moment"]).to_parquet(path, row_group_size=8)
+        self._check_resume(lambda: ParquetDatasetGenerator(path, target_column="level"), cuts=(0, 8, 17))
+
+    def test_multi_csv(self):
+        paths = []
+        for part in range(3):
+            path = os.path.join(self.tmpdir, f"part_{part}.csv")
+            pd.DataFrame({"rain": range(part * 10, part * 10 + 7), "level": range(7)}).to_csv(path, index=False)
+            paths.append(path)
+        self._check_resume(lambda: MultiCSVDatasetGenerator(paths, target_column="level"), cuts=(0, 3, 7, 12, 21))
+
+    def test_load_after_iterating_or_wrong_type_fails(self):
+        gen = RiverDatasetGenerator(MockDataset(self.rows), n_instances=40)
+        state = gen.state_dict()
+        next(gen)
+        with self.assertRaises(RuntimeError):
+            gen.load_state_dict(state)
+        batcher = PastForecastBatcher(MockDataset(self.rows), past_size=3)
+        with self.assertRaises(ValueError):
+            batcher.load_state_dict(state)
+
+    def _check_prefetch_resume(self, make, cuts=(0, 1, 5, 17, 40)):
+        expected = list(make())
+        for cut in cuts:
+            gen = make()
+            try:
+                head = [next(gen) for _ in range(cut)]
+                state = pickle.loads(pickle.dumps(gen.state_dict()))
+                # Checkpointing does not disturb the stream
+                _assert_same(self, head + list(gen), expected)
+            finally:
+                gen.stop()
+            resumed = make()
+            resumed.load_state_dict(state)
+            _assert_same(self, list(resumed), expected[cut:])
+            self.assertEqual(resumed.get_count(), len(expected))
+
+    def test_prefetch(self):
+        self._check_prefetch_resume(lambda: PrefetchGenerator(
+            RiverDatasetGenerator(MockDataset(self.rows), n_instances=40), depth=3
+        ))
+        factory = functools.partial(CSVDatasetGenerator, self.csv, target_column="level",
+                                    parse_dates=["moment"], chunksize=6)
+        self._check_prefetch_resume(lambda: PrefetchGenerator(factory, depth=4))
+        self._check_prefetch_resume(lambda: PrefetchGenerator(factory, depth=4, mode="process"), cuts=(5, 40))
+
+    def test_parallel_runner_is_not_checkpointable(self):
+        factory = functools.partial(RiverDatasetGenerator, MockDataset(self.rows), n_instances=40)
+        runner = ParallelRunner([factory], n_workers=1)
+        try:
+            with self.assertRaises(TypeError):
+                runner.state_dict()
+            with self.assertRaises(TypeError):
+                runner.load_state_dict({})
+        finally:
+            runner.stop()
+
+
+class _Wrapped:
+    """Iterates a batcher, post-processing each message; forwards checkpoint calls."""
+
+    def __init__(self, gen):
+        self.gen = gen
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.convert(next(self.gen))
+
+    def state_dict(self):
+        return self.gen.state_dict()
+
+    def load_state_dict(self, state):
+        self.gen.load_state_dict(state)
+
+
+class _Materialized(_Wrapped):
+    @staticmethod
+    def convert(batch):
+        return tuple(batch)
+
+
+class _Copied(_Wrapped):
+    @staticmethod
+    def convert(batch):
+        # Array mode views are only valid until the next message
+        return tuple(a.copy() for a in batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
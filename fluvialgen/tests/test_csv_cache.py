@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fluvialgen.csv_cache import CSVCache
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+
+
+def _typed_rows(rows):
+    def typed(value):
+        return (type(value), repr(value))
+
+    def mapping(m):
+        return [(k, typed(v)) for k, v in m.items()]
+
+    return [(mapping(x), mapping(y) if isinstance(y, dict) else typed(y)) for x, y in rows]
+
+
+class TestCSVCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmpdir, "data.csv")
+        pd.DataFrame(
+            {
+                "moment": [f"2024-01-01 00:{i:02d}" for i in range(5)],
+                "value": [1, 2, 3, 4, 5],
+                "c1": [0.5, None, 1.5, 2.5, 3.5],
+                "station": ["a", "b", None, "a", "b"],
+                "unused": [9, 9, 9, 9, 9],
+            }
+        ).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _make(self, **kwargs):
+        options = dict(
+            filepath=self.csv_path,
+            target_column="value",
+            feature_columns=["moment", "c1", "station"],
+            parse_dates=["moment"],
+            cache=True,
+        )
+        options.update(kwargs)
+        return CSVDatasetGenerator(**options)
+
+    def test_cache_roundtrip_is_identical(self):
+        plain = CSVDatasetGenerator(
+            filepath=self.csv_path,
+            target_column="value",
+            feature_columns=["moment", "c1", "station"],
+            parse_dates=["moment"],
+        )
+        first = self._make()
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir, "data.csv.fgcache", "meta.json")))
+
+        with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv") as read_csv:
+            second = self._make()
+            read_csv.assert_not_called()
+        self.assertEqual(_typed_rows(second._data), _typed_rows(plain._data))
+        self.assertEqual(_typed_rows(first._data), _typed_rows(plain._data))
+
+    def test_chunked_writes_and_reads_cache(self):
+        plain = self._make(cache=False)
+        chunked = self._make(chunksize=2)
+        rows = list(chunked)
+        self.assertEqual(_typed_rows(rows), _typed_rows(plain._data))
+
+        with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv") as read_csv:
+            cached = self._make(chunksize=2)
+            self.assertEqual(_typed_rows(list(cached)), _typed_rows(plain._data))
+            read_csv.assert_not_called()
+
+    def test_partial_stream_does_not_publish_cache(self):
+        gen = self._make(chunksize=2)
+        gen.get_message()
+        gen.stop()
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, "data.csv.fgcache")))
+        self.assertEqual(os.listdir(self.tmpdir), ["data.csv"])
+
+    def test_invalidated_by_arguments_and_source(self):
+        self._make()
+        store = CSVCache(
+            self.csv_path,
+            options={"target_columns": ["value"], "feature_columns": ["c1"], "parse_dates": None},
+        )
+        self.assertIsNone(store.load())
+
+        gen = self._make(feature_columns=["c1"])
+        self.assertEqual(list(gen._data[0][0]), ["c1"])
+
+        with open(self.csv_path, "a") as f:
+            f.write("2024-01-01 00:05,6,4.5,a,9\n")
+        gen = self._make()
+        self.assertEqual(len(gen._data), 6)
+        self.assertEqual(gen._data[-1][1], 6)
+
+    def test_custom_cache_dir_and_timezones(self):
+        cache_dir = os.path.join(self.tmpdir, "cache")
+        os.makedirs(cache_dir)
+        pd.DataFrame(
+            {"moment": pd.date_range("2024-01-01", periods=3, freq="h", tz="Europe/Madrid"),
+             "value": [1.0, 2.0, 3.0]}
+        ).to_csv(self.csv_path, index=False)
+        options = dict(filepath=self.csv_path, target_column="value",
+                       parse_dates=["moment"], cache=cache_dir)
+        plain = CSVDatasetGenerator(**options)
+        self.assertTrue(os.path.isdir(os.path.join(cache_dir, "data.csv.fgcache")))
+        cached = CSVDatasetGenerator(**options)
+        self.assertEqual(_typed_rows(cached._data), _typed_rows(plain._data))
+
+    def test_inconsistent_chunk_dtypes_skip_cache(self):
+        with open(self.csv_path, "w") as f:
+            f.write("value,c1\n1.0,1\n2.0,2\n3.0,\n")
+        gen = CSVDatasetGenerator(
+            filepath=self.csv_path, target_column="value", chunksize=2, cache=True
+        )
+        self.assertEqual(len(list(gen)), 3)
+        self.assertEqual(os.listdir(self.tmpdir), ["data.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
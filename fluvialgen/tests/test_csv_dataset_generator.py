@@ -1,9 +1,13 @@
 import os
+import shutil
+import time
 import unittest
 import tempfile
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+from unittest import mock
 
 from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
 
@@ -164,6 +168,292 @@ class TestCSVDatasetGenerator(unittest.TestCase):
         finally:
             os.unlink(csv_path)
 
+    def test_chunked_matches_eager(self):
+        df = pd.DataFrame(
+            {
+                "moment": [f"2024-01-01 00:{i:02d}" for i in range(7)],
+                "value": [1, 2, 3, 4, 5, 6, 7],
+                "c1": [10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            eager = CSVDatasetGenerator(
+                filepath=csv_path,
+                target_column="value",
+                parse_dates=["moment"],
+            )
+            chunked = CSVDatasetGenerator(
+                filepath=csv_path,
+                target_column="value",
+                parse_dates=["moment"],
+                chunksize=3,
+            )
+            self.assertFalse(hasattr(chunked, "_data"))
+            self.assertEqual(chunked.feature_columns, ["moment", "c1"])
+
+            for _ in range(7):
+                x, y = eager.get_message()
+                cx, cy = chunked.get_message()
+                self.assertEqual(cx, x)
+                self.assertEqual(cy, y)
+                self.assertTrue(isinstance(cx["moment"], pd.Timestamp))
+            self.assertEqual(chunked.get_count(), 7)
+
+            with self.assertRaises(StopIteration):
+                chunked.get_message()
+            self.assertIsNone(chunked._reader)
+        finally:
+            os.unlink(csv_path)
+
+    def test_chunked_validates_columns(self):
+        df = pd.DataFrame({"moment": ["2024-01-01 00:00"], "value": [1]})
+        csv_path = _write_temp_csv(df)
+        try:
+            with self.assertRaises(ValueError):
+                CSVDatasetGenerator(
+                    filepath=csv_path,
+                    target_column="value",
+                    feature_columns=["c1"],
+                    chunksize=10,
+                )
+            with self.assertRaises(ValueError):
+                CSVDatasetGenerator(
+                    filepath=csv_path,
+                    target_column="value",
+                    chunksize=0,
+                )
+        finally:
+            os.unlink(csv_path)
+
+    def test_rows_match_iterrows(self):
+        df = pd.DataFrame(
+            {
+                "moment": ["2024-01-01 00:00", "2024-01-01 00:01"],
+                "target1": [1, 2],
+                "target2": [10.5, 20.5],
+                "c1": [0.1, None],
+                "c2": ["a", "b"],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            for target in ("target1", ["target1", "target2"]):
+                gen = CSVDatasetGenerator(
+                    filepath=csv_path,
+                    target_column=target,
+                    parse_dates=["moment"],
+                )
+                parsed = pd.read_csv(csv_path, parse_dates=["moment"])
+                for (x, y), (_, row) in zip(gen._data, parsed.iterrows()):
+                    expected_x = {col: row[col] for col in gen.feature_columns}
+                    self.assertEqual(
+                        [(type(v), repr(v)) for v in x.values()],
+                        [(type(v), repr(v)) for v in expected_x.values()],
+                    )
+                    if gen.is_multi_target:
+                        self.assertEqual(y, {col: row[col] for col in gen.target_columns})
+                    else:
+                        self.assertEqual((type(y), y), (type(row["target1"]), row["target1"]))
+        finally:
+            os.unlink(csv_path)
+
+
+    def test_event_time_replay(self):
+        df = pd.DataFrame(
+            {
+                "moment": ["2024-01-01 00:00:00", "2024-01-01 00:00:01",
+                           "2024-01-01 00:00:01", "2024-01-01 00:00:04"],
+                "value": [1, 2, 3, 4],
+                "c1": [10.0, 11.0, 12.0, 13.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            gen = CSVDatasetGenerator(
+                filepath=csv_path,
+                target_column="value",
+                parse_dates=["moment"],
+                replay_column="moment",
+                replay_speed=40,
+            )
+            stamps = []
+            for _ in range(4):
+                next(gen)
+                stamps.append(time.perf_counter())
+            gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+            # 1s, 0s and 3s gaps at 40x
+            self.assertAlmostEqual(gaps[0], 0.025, delta=0.015)
+            self.assertLess(gaps[1], 0.01)
+            self.assertAlmostEqual(gaps[2], 0.075, delta=0.015)
+
+            with self.assertRaises(ValueError):
+                CSVDatasetGenerator(
+                    filepath=csv_path,
+                    target_column="value",
+                    feature_columns=["c1"],
+                    replay_column="moment",
+                )
+        finally:
+            os.unlink(csv_path)
+
+    def test_unused_columns_are_not_parsed(self):
+        df = pd.DataFrame(
+            {
+                "moment": ["2024-01-01 00:00", "2024-01-01 00:01", "2024-01-01 00:02"],
+                "notes": ["a", "b", "c"],
+                "value": [1.5, 2.5, 3.5],
+                "c1": [10.0, 11.0, 12.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            for chunksize in (None, 2):
+                with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv", wraps=pd.read_csv) as read_csv:
+                    gen = CSVDatasetGenerator(
+                        filepath=csv_path,
+                        target_column="value",
+                        feature_columns=["c1"],
+                        parse_dates=["moment"],
+                        chunksize=chunksize,
+                    )
+                    rows = list(gen)
+                self.assertEqual(read_csv.call_args.kwargs["usecols"], ["c1", "value"])
+                self.assertIsNone(read_csv.call_args.kwargs["parse_dates"])
+                self.assertEqual(rows, [({"c1": 10.0}, 1.5), ({"c1": 11.0}, 2.5), ({"c1": 12.0}, 3.5)])
+            # Without a feature subset every column is used, so nothing is projected
+            with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv", wraps=pd.read_csv) as read_csv:
+                CSVDatasetGenerator(filepath=csv_path, target_column="value")
+            self.assertNotIn("usecols", read_csv.call_args.kwargs)
+        finally:
+            os.unlink(csv_path)
+
+    def test_projection_keeps_value_types(self):
+        df = pd.DataFrame({"a": [0.1, 0.2], "n": [1, 2], "notes": ["x", "y"], "value": [1.5, 2.5]})
+        csv_path = _write_temp_csv(df)
+        try:
+            full = list(CSVDatasetGenerator(filepath=csv_path, target_column="value"))
+            projected = list(CSVDatasetGenerator(filepath=csv_path, target_column="value",
+                                                 feature_columns=["a", "n"]))
+            self.assertEqual([(type(v), v) for v in projected[0][0].values()], [(float, 0.1), (int, 1)])
+            self.assertEqual(projected, [({"a": x["a"], "n": x["n"]}, y) for x, y in full])
+        finally:
+            os.unlink(csv_path)
+
+    def test_unprojected_value_types_match_iterrows(self):
+        cache_dir = tempfile.mkdtemp()
+        paths = []
+        try:
+            for df, expected in (
+                # Numeric frames are upcast to their common dtype, like iterrows does
+                (pd.DataFrame({"c1": [0.5, 1.5], "value": [1, 2]}), (np.float64(0.5), np.float64(1.0))),
+                (pd.DataFrame({"c1": [5, 6], "value": [1, 2]}), (np.int64(5), np.int64(1))),
+            ):
+                csv_path = _write_temp_csv(df)
+                paths.append(csv_path)
+                for kwargs in ({}, {"chunksize": 1}, {"cache": cache_dir}, {"cache": cache_dir, "chunksize": 1}):
+                    x, y = next(CSVDatasetGenerator(filepath=csv_path, target_column="value", **kwargs))
+                    self.assertEqual([(type(x["c1"]), x["c1"]), (type(y), y)],
+                                     [(type(v), v) for v in expected], kwargs)
+        finally:
+            for path in paths:
+                os.unlink(path)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_replay_with_auto_dtype_plan(self):
+        df = pd.DataFrame(
+            {
+                "moment": ["2024-01-01 00:00:00", "2024-01-01 00:01:00", "2024-01-01 00:03:00"],
+                "value": [1.0, 2.0, 3.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            gen = CSVDatasetGenerator(filepath=csv_path, target_column="value", parse_dates=["moment"],
+                                      dtype_plan="auto", replay_column="moment", replay_speed=1200)
+            self.assertEqual(gen.dtype_plan, {"moment": "epoch"})
+            stamps = []
+            for _ in range(3):
+                next(gen)
+                stamps.append(time.perf_counter())
+            # 1 and 2 minute gaps at 1200x, read as nanoseconds rather than seconds
+            self.assertAlmostEqual(stamps[1] - stamps[0], 0.05, delta=0.02)
+            self.assertAlmostEqual(stamps[2] - stamps[1], 0.1, delta=0.02)
+        finally:
+            os.unlink(csv_path)
+
+    def test_auto_dtype_plan(self):
+        df = pd.DataFrame(
+            {
+                "moment": pd.date_range("2024-01-01", periods=6, freq="h").astype(str),
+                "station": ["north", "south"] * 3,
+                "label": ["a", "b", "c", "d", "e", "f"],
+                "count": [1, 2, 3, 4, 5, 6],
+                "rain": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+                "value": [0.5, 1.5, 2.5, 3.5, 4.5, 5.5],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        cache_dir = tempfile.mkdtemp()
+        try:
+            def make(**kwargs):
+                return CSVDatasetGenerator(filepath=csv_path, target_column="value", parse_dates=["moment"],
+                                           dtype_plan="auto", **kwargs)
+
+            gen = make()
+            # The target is left alone
+            self.assertEqual(gen.dtype_plan, {"moment": "epoch", "station": "category", "rain": "float32"})
+            rows = list(gen)
+            x, y = rows[1]
+            # Planned columns keep their planned dtype, the others their own type
+            self.assertEqual(
+                [(type(v), v) for v in x.values()],
+                [(np.int64, pd.Timestamp("2024-01-01 01:00").value), (str, "south"), (str, "b"),
+                 (int, 2), (np.float32, np.float32(0.2))],
+            )
+            self.assertEqual(repr(x["rain"]), repr(np.float32(0.2)))
+            self.assertEqual((type(y), y), (float, 1.5))
+            self.assertEqual(list(make(chunksize=4)), rows)
+            # The plan is part of the cache key; cached rows match a fresh parse
+            self.assertEqual(list(make(cache=cache_dir)), rows)
+            cached = make(cache=cache_dir)
+            self.assertIsNotNone(cached._cached)
+            self.assertEqual(list(cached), rows)
+            self.assertIsNone(CSVDatasetGenerator(filepath=csv_path, target_column="value",
+                                                  parse_dates=["moment"], cache=cache_dir)._cached)
+        finally:
+            os.unlink(csv_path)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_explicit_dtype_plan(self):
+        df = pd.DataFrame(
+            {
+                "moment": ["2024-01-01 00:00:00+01:00", "2024-01-01 00:01:00+01:00"],
+                "c1": [0.1, 0.2],
+                "value": [1, 2],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            gen = CSVDatasetGenerator(
+                filepath=csv_path,
+                target_column="value",
+                dtype_plan={"moment": "epoch", "c1": np.float32},
+            )
+            self.assertEqual(gen.dtype_plan, {"moment": "epoch", "c1": "float32"})
+            x, y = next(gen)
+            # Epoch timestamps are UTC nanoseconds
+            self.assertEqual(x["moment"], pd.Timestamp("2023-12-31 23:00", tz="UTC").value)
+            self.assertIsInstance(x["moment"], np.int64)
+            self.assertEqual((type(x["c1"]), x["c1"]), (np.float32, np.float32(0.1)))
+            self.assertEqual((type(y), y), (int, 1))
+            with self.assertRaises(ValueError):
+                CSVDatasetGenerator(filepath=csv_path, target_column="value", feature_columns=["c1"],
+                                    dtype_plan={"moment": "epoch"})
+            with self.assertRaises(ValueError):
+                CSVDatasetGenerator(filepath=csv_path, target_column="value", dtype_plan="compact")
+        finally:
+            os.unlink(csv_path)
 
 if __name__ == "__main__":
     unittest.main()
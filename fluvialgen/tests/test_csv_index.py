@@ -0,0 +1,161 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.csv_index import CSVRowIndex
+from fluvialgen.csv_past_forecast_batcher import CSVPastForecastBatcher
+
+
+class TestCSVRowIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "gauge.csv")
+        pd.DataFrame({
+            "moment": pd.date_range("2024-01-01", periods=50, freq="h"),
+            "rain": [float(i % 7) for i in range(50)],
+            "level": [float(i) for i in range(50)],
+        }).to_csv(self.csv, index=False)
+        with open(self.csv, "rb") as f:
+            lines = f.readlines()
+        # Byte offset of every data row
+        self.starts = [sum(len(line) for line in lines[:r + 1]) for r in range(50)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        kwargs.setdefault("index", True)
+        return CSVDatasetGenerator(self.csv, target_column="level", parse_dates=["moment"], **kwargs)
+
+    def test_offsets_match_line_starts(self):
+        for stride in (1, 3, 16, 100):
+            index = CSVRowIndex.build(self.csv, stride=stride)
+            self.assertEqual(len(index), 50)
+            self.assertEqual(len(index.offsets), -(-50 // stride))
+            self.assertEqual([index.offset(r) for r in range(50)], self.starts)
+            self.assertEqual(index.offset(50), os.path.getsize(self.csv))
+
+    def test_last_row_without_newline(self):
+        path = os.path.join(self.tmpdir, "short.csv")
+        with open(path, "w") as f:
+            f.write("a,b\n1,2\n3,4")
+        index = CSVRowIndex.build(path, stride=1)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.offset(1), 8)
+
+    def test_sidecar_is_reused_until_the_file_changes(self):
+        CSVRowIndex.open(self.csv, stride=8)
+        self.assertTrue(os.path.exists(CSVRowIndex.sidecar_path(self.csv)))
+        with mock.patch.object(CSVRowIndex, "build", wraps=CSVRowIndex.build) as build:
+            CSVRowIndex.open(self.csv, stride=8)
+            build.assert_not_called()
+            # Another stride or a rewritten file needs a new index
+            CSVRowIndex.open(self.csv, stride=4)
+            self.assertEqual(build.call_count, 1)
+            with open(self.csv, "a") as f:
+                f.write("2024-01-03 02:00:00,1.0,50.0\n")
+            self.assertEqual(len(CSVRowIndex.open(self.csv, stride=4)), 51)
+            self.assertEqual(build.call_count, 2)
+
+    def test_index_dir(self):
+        index_dir = os.path.join(self.tmpdir, "indexes")
+        os.makedirs(index_dir)
+        self._make(index=index_dir)
+        self.assertEqual(os.listdir(index_dir), ["gauge.csv.fgindex.npz"])
+
+    def test_start_and_stop_rows(self):
+        full = list(self._make(index=False))
+        for kwargs in ({}, {"chunksize": 4}, {"index": False, "chunksize": 4}, {"index": False}):
+            rows = list(self._make(start_row=17, stop_row=30, **kwargs))
+            self.assertEqual(rows, full[17:30], kwargs)
+            self.assertEqual(list(self._make(start_row=45, **kwargs)), full[45:])
+        with self.assertRaises(ValueError):
+            self._make(start_row=10, stop_row=5)
+
+    def test_range_on_cached_file(self):
+        full = list(self._make(index=False))
+        self._make(cache=True, index=False)  # builds the cache
+        for chunksize in (None, 4):
+            gen = self._make(cache=True, start_row=20, stop_row=33, chunksize=chunksize)
+            self.assertIsNotNone(gen._cached)
+            self.assertEqual(list(gen), full[20:33])
+
+    def test_seek(self):
+        full = list(self._make(index=False))
+        for kwargs in ({}, {"chunksize": 4}, {"index": False, "chunksize": 4}):
+            gen = self._make(**kwargs)
+            next(gen)
+            gen.seek(40)
+            self.assertEqual(gen.position, 40)
+            self.assertEqual(next(gen), full[40])
+            gen.seek(3)
+            self.assertEqual(gen.next_batch(2), full[3:5])
+            self.assertEqual(gen.position, 5)
+            # Seeking revives an exhausted stream
+            self.assertEqual(list(gen), full[5:])
+            gen.seek(48)
+            self.assertEqual(list(gen), full[48:])
+        gen = self._make(start_row=10, stop_row=20)
+        with self.assertRaises(IndexError):
+            gen.seek(5)
+        gen.seek(18)
+        self.assertEqual(list(gen), full[18:20])
+
+    def test_chunked_seek_reads_from_the_row_offset(self):
+        gen = self._make(chunksize=4)
+        with mock.patch("fluvialgen.csv_dataset_generator.pd.read_csv", wraps=pd.read_csv) as read_csv:
+            gen.seek(33)
+            next(gen)
+        self.assertNotIn("skiprows", read_csv.call_args.kwargs)
+        self.assertGreaterEqual(gen._handle.tell(), self.starts[33])
+
+    def test_item_access(self):
+        full = list(self._make(index=False))
+        for kwargs in ({}, {"chunksize": 4}, {"index": False, "chunksize": 4}):
+            gen = self._make(**kwargs)
+            next(gen)
+            self.assertEqual(gen[7], full[7])
+            self.assertEqual(gen[-1], full[-1])
+            self.assertEqual(gen[10:14], full[10:14])
+            self.assertEqual(gen[45:60], full[45:])
+            self.assertEqual(gen[::-9], full[::-9])
+            self.assertEqual(gen[30:20], [])
+            with self.assertRaises(IndexError):
+                gen[50]
+            # The stream position is unchanged
+            self.assertEqual(next(gen), full[1])
+
+    def test_compressed_file(self):
+        path = os.path.join(self.tmpdir, "gauge.csv.gz")
+        with open(self.csv, "rb") as src, gzip.open(path, "wb") as dst:
+            dst.write(src.read())
+        full = list(self._make(index=False))
+        gen = CSVDatasetGenerator(path, target_column="level", parse_dates=["moment"],
+                                  start_row=5, stop_row=9, chunksize=2)
+        self.assertEqual(list(gen), full[5:9])
+        self.assertEqual(gen[-2], full[-2])
+        with self.assertRaises(ValueError):
+            CSVDatasetGenerator(path, target_column="level", index=True)
+
+    def test_batcher_starts_windows_at_row(self):
+        full = list(self._make(index=False))
+        batcher = CSVPastForecastBatcher(self.csv, target_column="level", parse_dates=["moment"],
+                                         past_size=3, forecast_size=0, index=True, start_row=30)
+        X, y = next(batcher)
+        self.assertEqual(X["rain"].tolist(), [full[r][0]["rain"] for r in (30, 31, 32)])
+        self.assertEqual(y, 33.0)
+        batcher.seek(40)
+        X, y = next(batcher)
+        self.assertEqual(y, 43.0)
+        self.assertEqual(len(list(batcher)), 50 - 44)
+
+
+if __name__ == "__main__":
+    unittest.main()
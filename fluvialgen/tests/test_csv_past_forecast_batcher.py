@@ -217,6 +217,62 @@ class TestCSVPastForecastBatcher(unittest.TestCase):
         finally:
             os.unlink(csv_path)
 
+    def test_chunked_streaming(self):
+        """Test CSVPastForecastBatcher over a chunked CSV stream"""
+        df = pd.DataFrame(
+            {
+                "value": [1, 2, 3, 4, 5, 6],
+                "c1": [10.0, 11.0, 12.0, 13.0, 14.0, 15.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            batcher = CSVPastForecastBatcher(
+                filepath=csv_path,
+                target_column="value",
+                past_size=2,
+                forecast_size=1,
+                chunksize=2,
+            )
+            results = list(batcher)
+            self.assertEqual(len(results), 3)
+            X_past, y_past = results[0]
+            self.assertEqual(list(X_past["c1"]), [10.0, 11.0])
+            self.assertEqual(y_past, 4)
+            X_past, y_past = results[-1]
+            self.assertEqual(list(X_past["c1"]), [12.0, 13.0])
+            self.assertEqual(y_past, 6)
+        finally:
+            os.unlink(csv_path)
+
+
+    def test_multi_target_multiple_horizons(self):
+        df = pd.DataFrame(
+            {
+                "value": [1, 2, 3, 4, 5],
+                "flow": [10, 20, 30, 40, 50],
+                "c1": [0.1, 0.2, 0.3, 0.4, 0.5],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            batcher = CSVPastForecastBatcher(
+                filepath=csv_path,
+                target_column=["value", "flow"],
+                feature_columns=["c1"],
+                past_size=2,
+                forecast_size=range(1, 3),
+            )
+            X_past, y_past = batcher.get_message()
+            self.assertEqual(list(X_past["c1"]), [0.1, 0.2])
+            self.assertIsInstance(y_past, pd.DataFrame)
+            self.assertEqual(list(y_past.index), [1, 2])
+            self.assertEqual(y_past.loc[1].to_dict(), {"value": 4, "flow": 40})
+            self.assertEqual(y_past.loc[2].to_dict(), {"value": 5, "flow": 50})
+            with self.assertRaises(StopIteration):
+                batcher.get_message()
+        finally:
+            os.unlink(csv_path)
 
 if __name__ == "__main__":
     unittest.main()
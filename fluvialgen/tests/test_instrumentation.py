@@ -0,0 +1,119 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.instrumentation import GeneratorStats
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.prefetch_generator import PrefetchGenerator
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+def _rows(n):
+    return [({"a": float(i), "b": float(2 * i)}, float(i)) for i in range(n)]
+
+
+class TestGeneratorStats(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        gen = RiverDatasetGenerator(MockDataset(_rows(3)), n_instances=3)
+        self.assertIsNone(gen.stats())
+        self.assertEqual(len(list(gen)), 3)
+        self.assertIsNone(gen._stats)
+
+    def test_source_counts_items_and_fetch_time(self):
+        gen = RiverDatasetGenerator(MockDataset(_rows(10)), n_instances=10)
+        gen.enable_stats()
+        list(gen)
+        stats = gen.stats()
+        self.assertEqual(stats["messages"], 10)
+        self.assertEqual(stats["source_items"], 10)
+        self.assertGreater(stats["fetch_s"], 0)
+        self.assertEqual(stats["window_s"], 0)
+        self.assertGreater(stats["messages_per_sec"], 0)
+        self.assertIsNone(stats["buffer_len"])
+
+    def test_batcher_times_every_phase(self):
+        batcher = MovingWindowBatcher(MockDataset(_rows(20)), instance_size=3, batch_size=2, n_instances=20)
+        batcher.enable_stats()
+        batches = list(batcher)
+        stats = batcher.stats()
+        self.assertEqual(stats["messages"], len(batches))
+        self.assertGreaterEqual(stats["source_items"], len(batches))
+        for key in ("fetch_s", "window_s", "convert_s"):
+            self.assertGreater(stats[key], 0, key)
+        self.assertEqual(stats["buffer_capacity"], 4)
+        self.assertLessEqual(stats["buffer_len"], 4)
+
+    def test_past_forecast_batcher_counts_instances(self):
+        batcher = PastForecastBatcher(MockDataset(_rows(10)), past_size=3, forecast_size=1, n_instances=10)
+        batcher.enable_stats()
+        instances = list(batcher)
+        stats = batcher.stats()
+        self.assertEqual(stats["messages"], len(instances))
+        self.assertEqual(stats["source_items"], 10)
+        self.assertGreater(stats["convert_s"], 0)
+
+    def test_callback_is_invoked_every_n_messages(self):
+        snapshots = []
+        gen = RiverDatasetGenerator(MockDataset(_rows(10)), n_instances=10)
+        gen.enable_stats(callback=snapshots.append, every=4)
+        list(gen)
+        self.assertEqual([s["messages"] for s in snapshots], [4, 8])
+        with self.assertRaises(ValueError):
+            gen.enable_stats(every=0)
+
+    def test_sleep_time_is_recorded_when_paced(self):
+        gen = RiverDatasetGenerator(MockDataset(_rows(4)), n_instances=4, stream_period=20)
+        gen.enable_stats()
+        list(gen)
+        # Three waits of ~20ms after the first message
+        self.assertGreater(gen.stats()["sleep_s"], 0.04)
+
+    def test_disable_stats(self):
+        gen = RiverDatasetGenerator(MockDataset(_rows(4)), n_instances=4)
+        gen.enable_stats()
+        next(gen)
+        gen.disable_stats()
+        self.assertIsNone(gen.stats())
+        self.assertEqual(len(list(gen)), 3)
+
+    def test_csv_and_prefetch(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            pd.DataFrame({"a": range(5), "y": range(5)}).to_csv(f.name, index=False)
+        self.addCleanup(os.unlink, f.name)
+        source = CSVDatasetGenerator(f.name, target_column="y")
+        source.enable_stats()
+        prefetch = PrefetchGenerator(source, depth=2)
+        prefetch.enable_stats()
+        self.assertEqual(len(list(prefetch)), 5)
+        self.assertEqual(prefetch.stats()["source_items"], 5)
+        self.assertEqual(prefetch.stats()["buffer_capacity"], 2)
+        self.assertEqual(source.stats()["messages"], 5)
+
+    def test_async_iteration(self):
+        gen = RiverDatasetGenerator(MockDataset(_rows(5)), n_instances=5)
+        gen.enable_stats()
+
+        async def consume():
+            return [m async for m in gen]
+
+        self.assertEqual(len(asyncio.run(consume())), 5)
+        self.assertEqual(gen.stats()["messages"], 5)
+
+    def test_snapshot_without_generator(self):
+        stats = GeneratorStats()
+        stats.begin()
+        self.assertFalse(stats.end(windowed=True))
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["messages"], 1)
+        self.assertIsNone(snapshot["buffer_capacity"])
+
+
+if __name__ == "__main__":
+    unittest.main()
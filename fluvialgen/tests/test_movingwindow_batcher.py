@@ -111,6 +111,141 @@ class TestMovingWindowBatcher(unittest.TestCase):
         self.assertEqual(y.iloc[3], 2)
         self.assertEqual(y.iloc[4], 3)
         self.assertEqual(y.iloc[5], 4)
+    def test_array_mode_views(self):
+        """
+        Test that array mode returns read-only strided views matching pandas mode
+        """
+        pandas_batcher = MovingWindowBatcher(
+            dataset=MockDataset(self.data),
+            instance_size=self.instance_size,
+            batch_size=self.batch_size,
+            n_instances=10
+        )
+        array_batcher = MovingWindowBatcher(
+            dataset=MockDataset(self.data),
+            instance_size=self.instance_size,
+            batch_size=self.batch_size,
+            n_instances=10,
+            array_mode=True
+        )
+
+        X, y = array_batcher.get_message()
+        self.assertEqual(array_batcher.feature_columns, ['value'])
+        self.assertEqual(X.shape, (self.batch_size, self.instance_size, 1))
+        self.assertEqual(y.shape, (self.batch_size, self.instance_size))
+        self.assertFalse(X.flags.writeable)
+        self.assertFalse(y.flags.writeable)
+        # Views share the batcher's buffer instead of copying rows
+        self.assertTrue(np.shares_memory(X, array_batcher.buffer.features))
+
+        expected_X, expected_y = pandas_batcher.get_message()
+        np.testing.assert_array_equal(X.reshape(-1), expected_X['value'].to_numpy())
+        np.testing.assert_array_equal(y.reshape(-1), expected_y.to_numpy())
+
+        X, y = array_batcher.get_message()
+        np.testing.assert_array_equal(X[:, :, 0], [[2, 3, 4], [2, 3, 4]])
+
+    def test_array_mode_distinct_windows(self):
+        """
+        Test array mode windows when the buffer holds several distinct windows
+        """
+        batcher = MovingWindowBatcher(
+            dataset=MockDataset(self.data),
+            instance_size=2,
+            batch_size=3,
+            n_instances=10,
+            array_mode=True,
+            feature_columns=['value']
+        )
+        for x, y in self.data[:4]:
+            batcher._append_array_row(x, y)
+        X, y = batcher._array_batch(3)
+        np.testing.assert_array_equal(X[:, :, 0], [[1, 2], [2, 3], [3, 4]])
+        self.assertTrue(np.shares_memory(X, batcher.buffer.features))
+        X, y = batcher._array_batch(2)
+        np.testing.assert_array_equal(y, [[1, 2], [2, 3], [2, 3]])
+
+    def test_lazy_matches_eager(self):
+        for output_format in ("pandas", "dict", "numpy"):
+            eager = list(MovingWindowBatcher(
+                MockDataset(self.data), instance_size=3, batch_size=2, output_format=output_format
+            ))
+            lazy = list(MovingWindowBatcher(
+                MockDataset(self.data), instance_size=3, batch_size=2, output_format=output_format, lazy=True
+            ))
+            self.assertEqual(len(lazy), len(eager))
+            for (X, y), batch in zip(eager, lazy):
+                X_lazy, y_lazy = batch
+                if output_format == "pandas":
+                    pd.testing.assert_frame_equal(X_lazy, X)
+                    pd.testing.assert_series_equal(y_lazy, y)
+                else:
+                    np.testing.assert_array_equal(np.asarray(y_lazy), np.asarray(y))
+                    self.assertEqual(len(X_lazy), len(X))
+
+    def test_lazy_batches_materialize_on_access(self):
+        batcher = MovingWindowBatcher(self.dataset, instance_size=3, batch_size=2, lazy=True)
+        batches = list(batcher)
+        first = batches[0]
+        self.assertIsNone(first._materialized)
+        self.assertEqual(first.column("value"), [1, 2, 3, 1, 2, 3])
+        self.assertEqual(first.window(0)[2], ({'moment': datetime(2024, 1, 1, 0, 2), 'value': 3}, 3))
+        self.assertIsNone(first._materialized)
+        # Still valid after the batcher moved on
+        self.assertEqual(first.X['value'].tolist(), [1, 2, 3, 1, 2, 3])
+        self.assertIs(first.X, first[0])
+
+    def test_lazy_rejects_array_mode(self):
+        with self.assertRaises(ValueError):
+            MovingWindowBatcher(self.dataset, instance_size=3, batch_size=2, array_mode=True, lazy=True)
+
+    def _values(self, padding, **kwargs):
+        batcher = MovingWindowBatcher(
+            MockDataset(self.data), instance_size=3, batch_size=2, padding=padding, **kwargs
+        )
+        return list(batcher)
+
+    def test_padding_drop_and_ragged(self):
+        dropped = self._values("drop")
+        self.assertEqual([X['value'].tolist() for X, _ in dropped],
+                         [[1, 2, 3, 2, 3, 4], [2, 3, 4, 3, 4, 5], [3, 4, 5, 4, 5, 6]])
+        ragged = self._values("ragged")
+        self.assertEqual(len(ragged), 4)
+        X, y = ragged[-1]
+        self.assertEqual(X['value'].tolist(), [4, 5, 6])
+        self.assertEqual(y.tolist(), [4, 5, 6])
+
+    def test_padding_mask(self):
+        batches = self._values("mask")
+        self.assertEqual(len(batches), 4)
+        X, y, mask = batches[0]
+        self.assertTrue(mask.all())
+        X, y, mask = batches[-1]
+        self.assertEqual(X['value'].tolist(), [4, 5, 6, 4, 5, 6])
+        np.testing.assert_array_equal(mask, [True] * 3 + [False] * 3)
+        self.assertEqual(y[mask].tolist(), [4, 5, 6])
+
+    def test_padding_in_array_and_lazy_modes(self):
+        X, y = self._values("ragged", array_mode=True)[-1]
+        self.assertEqual(X.shape, (1, 3, 1))
+        X, y, mask = self._values("mask", array_mode=True)[-1]
+        self.assertEqual(X.shape, (2, 3, 1))
+        np.testing.assert_array_equal(mask, [True, False])
+        np.testing.assert_array_equal(X[mask][:, :, 0], [[4, 5, 6]])
+
+        eager = self._values("mask")
+        lazy = self._values("mask", lazy=True)
+        for (X, y, mask), batch in zip(eager, lazy):
+            X_lazy, y_lazy, mask_lazy = batch
+            pd.testing.assert_frame_equal(X_lazy, X)
+            np.testing.assert_array_equal(mask_lazy, mask)
+        self.assertEqual(lazy[-1].n_windows, 2)
+        self.assertEqual(self._values("ragged", lazy=True)[-1].n_windows, 1)
+
+    def test_invalid_padding(self):
+        with self.assertRaises(ValueError):
+            MovingWindowBatcher(self.dataset, instance_size=3, batch_size=2, padding="zeros")
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
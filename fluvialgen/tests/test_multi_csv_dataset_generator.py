@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from fluvialgen.multi_csv_dataset_generator import MultiCSVDatasetGenerator
+
+
+class TestMultiCSVDatasetGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = []
+        for hour in range(3):
+            df = pd.DataFrame(
+                {
+                    "value": [hour * 10 + i for i in range(4)],
+                    "c1": [float(hour * 10 + i) / 2 for i in range(4)],
+                }
+            )
+            path = os.path.join(self.tmpdir, f"hour_{hour:02d}.csv")
+            df.to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_streams_files_in_order_as_one_stream(self):
+        gen = MultiCSVDatasetGenerator(self.paths, target_column="value")
+        ys = [y for _, y in gen]
+        self.assertEqual(ys, [h * 10 + i for h in range(3) for i in range(4)])
+        self.assertEqual(gen.get_count(), 12)
+
+    def test_next_batch_crosses_files(self):
+        gen = MultiCSVDatasetGenerator(self.paths, target_column="value")
+        chunks = list(gen.iter_chunks(5))
+        self.assertEqual([len(c) for c in chunks], [5, 5, 2])
+        self.assertEqual([y for c in chunks for _, y in c], [h * 10 + i for h in range(3) for i in range(4)])
+        self.assertEqual(gen.get_count(), 12)
+
+    def test_glob_pattern_is_sorted(self):
+        gen = MultiCSVDatasetGenerator(os.path.join(self.tmpdir, "hour_*.csv"), target_column="value")
+        self.assertEqual(gen.files, sorted(self.paths))
+        x, y = gen.get_message()
+        self.assertEqual(x, {"c1": 0.0})
+        self.assertEqual(y, 0)
+        gen.stop()
+
+    def test_matches_single_file_generator_output(self):
+        expected = []
+        for path in self.paths:
+            df = pd.read_csv(path)
+            expected.extend(({"c1": row["c1"]}, row["value"]) for _, row in df.iterrows())
+        for prefetch in (0, 1, 2):
+            gen = MultiCSVDatasetGenerator(self.paths, target_column="value", prefetch=prefetch)
+            self.assertEqual(list(gen), expected)
+
+    def test_next_file_is_parsed_in_background(self):
+        gen = MultiCSVDatasetGenerator(self.paths, target_column="value", prefetch=1)
+        gen.get_message()
+        self.assertEqual(gen.current_file, self.paths[0])
+        # The second file was submitted when the first one was taken
+        self.assertEqual(len(gen._pending), 1)
+        loaded = gen._pending[0].result(timeout=5)
+        self.assertEqual(loaded.filepath, self.paths[1])
+        gen.stop()
+
+    def test_schema_mismatch_raises(self):
+        pd.DataFrame({"value": [1], "other": [2.0]}).to_csv(self.paths[1], index=False)
+        gen = MultiCSVDatasetGenerator(self.paths, target_column="value")
+        for _ in range(4):
+            gen.get_message()
+        with self.assertRaises(ValueError):
+            gen.get_message()
+        gen.stop()
+
+    def test_missing_files_and_columns(self):
+        with self.assertRaises(ValueError):
+            MultiCSVDatasetGenerator(os.path.join(self.tmpdir, "none_*.csv"), target_column="value")
+        with self.assertRaises(ValueError):
+            MultiCSVDatasetGenerator(self.paths, target_column="missing")
+
+    def test_forwards_kwargs_to_file_generators(self):
+        gen = MultiCSVDatasetGenerator(
+            self.paths, target_column="value", chunksize=2, compact_records=True
+        )
+        rows = list(gen)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[5][0].to_dict(), {"c1": 5.5})
+
+    def test_stop_releases_pending_reads(self):
+        gen = MultiCSVDatasetGenerator(self.paths, target_column="value", prefetch=2)
+        gen.get_message()
+        gen.stop()
+        self.assertIsNone(gen._executor)
+        self.assertEqual(len(gen._pending), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
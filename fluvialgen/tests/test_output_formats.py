@@ -0,0 +1,105 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.output_formats import (
+    OutputFormat,
+    available_output_formats,
+    get_output_format,
+    register_output_format,
+)
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestOutputFormats(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            ({'moment': datetime(2024, 1, 1, 0, i), 'value': i + 1}, i + 1)
+            for i in range(6)
+        ]
+
+    def test_builtin_formats_registered(self):
+        for name in ("pandas", "dict", "numpy", "arrow", "river"):
+            self.assertIn(name, available_output_formats())
+            self.assertEqual(get_output_format(name).name, name)
+
+    def test_unknown_format_raises(self):
+        with self.assertRaises(ValueError):
+            PastForecastBatcher(MockDataset(self.data), past_size=2, output_format="nope")
+
+    def test_dict_format(self):
+        batcher = MovingWindowBatcher(
+            MockDataset(self.data), instance_size=2, batch_size=2, output_format="dict"
+        )
+        X, y = batcher.get_message()
+        self.assertEqual(X, [self.data[0][0], self.data[1][0]] * 2)
+        self.assertEqual(y, [1, 2, 1, 2])
+
+    def test_numpy_format(self):
+        batcher = PastForecastBatcher(
+            MockDataset(self.data), past_size=3, output_format="numpy"
+        )
+        X_past, y_past = batcher.get_message()
+        self.assertIsInstance(X_past, np.ndarray)
+        self.assertEqual(X_past.shape, (3, 2))
+        self.assertEqual(list(X_past[:, 1]), [1, 2, 3])
+        self.assertEqual(y_past, 4)
+
+    def test_river_format(self):
+        batcher = MovingWindowBatcher(
+            MockDataset(self.data), instance_size=2, batch_size=1, output_format="river"
+        )
+        X, y = batcher.get_message()
+        self.assertIsInstance(X, pd.DataFrame)
+        self.assertIsInstance(y, pd.Series)
+        self.assertTrue(X.index.equals(y.index))
+
+        multi = [({'value': i}, {'a': i, 'b': -i}) for i in range(3)]
+        batcher = MovingWindowBatcher(
+            MockDataset(multi), instance_size=2, batch_size=1, output_format="river"
+        )
+        X, y = batcher.get_message()
+        self.assertIsInstance(y, pd.DataFrame)
+        self.assertEqual(list(y.columns), ['a', 'b'])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_format(self):
+        batcher = MovingWindowBatcher(
+            MockDataset(self.data), instance_size=2, batch_size=1, output_format="arrow"
+        )
+        X, y = batcher.get_message()
+        self.assertIsInstance(X, pyarrow.RecordBatch)
+        self.assertEqual(X.num_rows, 2)
+        self.assertEqual(y.to_pylist(), [1, 2])
+
+    def test_custom_format(self):
+        fmt = register_output_format(
+            "test-values", lambda rows: [r['value'] for r in rows], tuple, overwrite=True
+        )
+        self.assertIsInstance(fmt, OutputFormat)
+        batcher = MovingWindowBatcher(
+            MockDataset(self.data), instance_size=3, batch_size=1, output_format="test-values"
+        )
+        self.assertEqual(batcher.get_message(), ([1, 2, 3], (1, 2, 3)))
+        with self.assertRaises(ValueError):
+            register_output_format("test-values", list)
+
+    def test_array_mode_rejects_output_format(self):
+        with self.assertRaises(ValueError):
+            MovingWindowBatcher(
+                MockDataset(self.data), instance_size=2, batch_size=1,
+                array_mode=True, output_format="dict"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
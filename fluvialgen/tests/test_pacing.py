@@ -0,0 +1,169 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.pacing import EventTimePacer, Pacer, to_ns
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000_000
+
+    def __call__(self):
+        return self.now
+
+
+class TestPacer(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("fluvialgen.pacing.time.monotonic_ns", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_period_and_rate_are_equivalent(self):
+        self.assertEqual(Pacer(period_ms=0.5).period_ns, 500_000)
+        self.assertEqual(Pacer(rate=2000).period_ns, 500_000)
+        self.assertAlmostEqual(Pacer(period_ms=0.02).rate, 50_000)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Pacer()
+        with self.assertRaises(ValueError):
+            Pacer(period_ms=1, rate=1)
+        with self.assertRaises(ValueError):
+            Pacer(rate=0)
+        with self.assertRaises(ValueError):
+            Pacer(period_ms=1, policy="burst")
+
+    def test_deadlines_do_not_drift(self):
+        pacer = Pacer(period_ms=10)
+        self.assertEqual(pacer.delay(), 0.0)  # first message anchors the schedule
+        # Work of 3ms per message does not push later deadlines back
+        for _ in range(5):
+            self.clock.now += 3_000_000
+            self.assertAlmostEqual(pacer.delay(), 0.007)
+            self.clock.now += 7_000_000
+        self.assertEqual(pacer.late, 0)
+
+    def test_catch_up_bursts_missed_messages(self):
+        pacer = Pacer(period_ms=10, policy="catch_up")
+        pacer.delay()
+        self.clock.now += 35_000_000
+        delays = [pacer.delay() for _ in range(4)]
+        # Slots at 10, 20 and 30ms are overdue; the 40ms slot is 5ms away
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(delays[3], 0.005)
+        self.assertEqual(pacer.skipped, 0)
+
+    def test_skip_drops_missed_slots(self):
+        pacer = Pacer(period_ms=10, policy="skip")
+        pacer.delay()
+        self.clock.now += 35_000_000
+        self.assertEqual(pacer.delay(), 0.0)
+        self.assertAlmostEqual(pacer.delay(), 0.005)
+        self.assertEqual(pacer.skipped, 2)
+        self.assertEqual(pacer.late, 1)
+
+    def test_stats_report_achieved_rate(self):
+        pacer = Pacer(rate=100)
+        for _ in range(11):
+            self.clock.now += pacer.period_ns
+            pacer.delay()
+        stats = pacer.stats()
+        self.assertAlmostEqual(stats["requested_rate"], 100)
+        self.assertAlmostEqual(stats["achieved_rate"], 100)
+        self.assertEqual(stats["emitted"], 11)
+
+
+class TestEventTimePacer(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("fluvialgen.pacing.time.monotonic_ns", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_to_ns(self):
+        ts = pd.Timestamp("2024-01-01 00:00:01")
+        self.assertEqual(to_ns(ts), ts.value)
+        self.assertEqual(to_ns(np.datetime64("2024-01-01T00:00:01")), ts.value)
+        self.assertEqual(to_ns(datetime(2024, 1, 1, 0, 0, 1)), ts.value)
+        self.assertEqual(to_ns(1.5), 1_500_000_000)
+        with self.assertRaises(TypeError):
+            to_ns("2024-01-01")
+
+    def test_gaps_are_scaled_by_speed(self):
+        pacer = EventTimePacer(speed=10)
+        start = datetime(2024, 1, 1)
+        delays = []
+        for offset in (0, 1.0, 1.5, 3.5):
+            delay = pacer.delay(start + timedelta(seconds=offset))
+            delays.append(delay)
+            self.clock.now += int(delay * 1e9)
+        for got, expected in zip(delays, [0.0, 0.1, 0.05, 0.2]):
+            self.assertAlmostEqual(got, expected)
+        self.assertAlmostEqual(pacer.stats()["achieved_speed"], 10)
+
+    def test_short_waits_are_released_without_a_timer(self):
+        pacer = EventTimePacer(speed=1_000_000)
+        self.assertEqual(pacer.delay(0), 0.0)
+        # 1s of event time is 1us of wall time at this speed
+        self.assertEqual(pacer.delay(1), 0.0)
+        self.assertEqual(pacer.late, 0)
+
+    def test_out_of_order_and_overdue_events_are_released(self):
+        pacer = EventTimePacer(speed=1)
+        pacer.delay(10)
+        self.assertEqual(pacer.delay(5), 0.0)
+        self.clock.now += 3_000_000_000
+        self.assertEqual(pacer.delay(11), 0.0)
+        self.assertEqual(pacer.late, 2)
+
+
+class TestGeneratorPacing(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [({"x": i}, i) for i in range(200)]
+
+    def test_fractional_stream_period(self):
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=200, stream_period=0.5)
+        self.assertEqual(len(list(gen)), 200)
+        stats = gen.pacing_stats()
+        self.assertEqual(stats["requested_rate"], 2000)
+        # skip drops slots missed to scheduler noise, so allow some shortfall
+        self.assertGreater(stats["achieved_rate"], 1000)
+        self.assertLessEqual(stats["achieved_rate"], 2000 * 1.01)
+
+    def test_pacer_instance_and_no_pacing(self):
+        pacer = Pacer(rate=5000, policy="catch_up")
+        gen = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=200, stream_period=pacer)
+        self.assertIs(gen.pacer, pacer)
+        list(gen)
+        self.assertAlmostEqual(pacer.achieved_rate(), 5000, delta=500)
+        unpaced = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=10)
+        self.assertIsNone(unpaced.pacing_stats())
+
+    def test_river_event_time_replay(self):
+        start = datetime(2024, 1, 1)
+        data = [({"moment": start + timedelta(seconds=i), "x": i}, i) for i in range(6)]
+        gen = RiverDatasetGenerator(
+            dataset=MockDataset(data), n_instances=6, replay_column="moment", replay_speed=50
+        )
+        t0 = time.perf_counter()
+        self.assertEqual(len(list(gen)), 6)
+        elapsed = time.perf_counter() - t0
+        # Five 1s gaps at 50x take 0.1s
+        self.assertGreaterEqual(elapsed, 0.095)
+        self.assertLess(elapsed, 0.5)
+        self.assertAlmostEqual(gen.replay_stats()["achieved_speed"], 50, delta=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import functools
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from fluvialgen.csv_past_forecast_batcher import CSVPastForecastBatcher
+from fluvialgen.parallel_runner import ParallelRunner
+from fluvialgen.tests.test_prefetch_generator import CountingSource
+
+
+class OffsetSource(CountingSource):
+    """Yields offset + 0..n-1."""
+
+    def __init__(self, offset, n, fail_at=None):
+        super().__init__(n, fail_at=fail_at)
+        self.offset = offset
+
+    def get_message(self):
+        return self.offset + super().get_message()
+
+
+def _shards(sizes, fail=None):
+    return [
+        functools.partial(OffsetSource, 1000 * i, n, None if fail != i else 3)
+        for i, n in enumerate(sizes)
+    ]
+
+
+class TestParallelRunner(unittest.TestCase):
+
+    def test_ordered_output_matches_sequential(self):
+        sizes = [5, 130, 0, 70, 9]
+        expected = [1000 * i + j for i, n in enumerate(sizes) for j in range(n)]
+        runner = ParallelRunner(_shards(sizes), n_workers=3, batch_size=16, depth=2)
+        self.assertEqual(list(runner), expected)
+        self.assertEqual(runner.get_count(), len(expected))
+
+    def test_interleaved_output_contains_every_message(self):
+        sizes = [40, 25, 60]
+        runner = ParallelRunner(_shards(sizes), n_workers=2, ordered=False, batch_size=8, with_shard=True)
+        messages = list(runner)
+        self.assertEqual(len(messages), sum(sizes))
+        for shard, n in enumerate(sizes):
+            values = [m for s, m in messages if s == shard]
+            # Each shard's own order is preserved
+            self.assertEqual(values, [1000 * shard + j for j in range(n)])
+
+    def test_worker_exception_is_propagated(self):
+        runner = ParallelRunner(_shards([10, 10], fail=1), n_workers=2)
+        with self.assertRaises(KeyError):
+            list(runner)
+        self.assertTrue(all(not w.is_alive() for w in runner._workers))
+
+    def test_early_stop_shuts_down_workers(self):
+        runner = ParallelRunner(_shards([100_000] * 3), n_workers=2, depth=1, batch_size=4)
+        self.assertEqual(next(runner), 0)
+        runner.stop()
+        self.assertTrue(all(not w.is_alive() for w in runner._workers))
+        with self.assertRaises(StopIteration):
+            next(runner)
+
+    def test_batchers_over_many_files(self):
+        paths = []
+        try:
+            for station in range(3):
+                tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+                tmp.close()
+                pd.DataFrame({"level": [station * 10 + i for i in range(6)],
+                              "rain": [float(i) for i in range(6)]}).to_csv(tmp.name, index=False)
+                paths.append(tmp.name)
+            factories = [
+                functools.partial(CSVPastForecastBatcher, filepath=p, target_column="level", past_size=2)
+                for p in paths
+            ]
+            expected = [m for f in factories for m in f()]
+            got = list(ParallelRunner(factories, n_workers=2))
+            self.assertEqual(len(got), len(expected))
+            for (X, y), (X_e, y_e) in zip(got, expected):
+                pd.testing.assert_frame_equal(X, X_e)
+                self.assertEqual(y, y_e)
+        finally:
+            for p in paths:
+                os.unlink(p)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ParallelRunner([])
+        with self.assertRaises(ValueError):
+            ParallelRunner(_shards([1]), depth=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from fluvialgen.parquet_dataset_generator import ParquetDatasetGenerator
+from fluvialgen.parquet_past_forecast_batcher import ParquetPastForecastBatcher
+
+
+def _write_temp_parquet(df: pd.DataFrame, row_group_size: int) -> str:
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".parquet")
+    tmp.close()
+    df.to_parquet(tmp.name, index=False, row_group_size=row_group_size)
+    return tmp.name
+
+
+@unittest.skipIf(pq is None, "pyarrow is not installed")
+class TestParquetDatasetGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "moment": pd.date_range("2024-01-01", periods=6, freq="min"),
+                "value": [1, 2, 3, 4, 5, 6],
+                "c1": [10.0, 11.0, 12.0, 13.0, 14.0, 15.0],
+                "unused": ["a", "b", "c", "d", "e", "f"],
+            }
+        )
+        self.path = _write_temp_parquet(self.df, row_group_size=2)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_iteration_with_explicit_features(self):
+        gen = ParquetDatasetGenerator(
+            filepath=self.path, target_column="value", feature_columns=["moment", "c1"]
+        )
+        self.assertEqual(gen.num_row_groups, 3)
+        x, y = gen.get_message()
+        self.assertEqual(x, {"moment": pd.Timestamp("2024-01-01 00:00"), "c1": 10.0})
+        self.assertEqual(y, 1)
+        rows = list(gen)
+        self.assertEqual([y for _, y in rows], [2, 3, 4, 5, 6])
+        self.assertEqual(gen.get_count(), 6)
+
+    def test_reads_one_row_group_at_a_time_with_projection(self):
+        gen = ParquetDatasetGenerator(
+            filepath=self.path, target_column="value", feature_columns=["c1"]
+        )
+        with mock.patch.object(
+            gen._file, "read_row_group", wraps=gen._file.read_row_group
+        ) as read_row_group:
+            gen.get_message()
+            gen.get_message()
+            self.assertEqual(read_row_group.call_count, 1)
+            read_row_group.assert_called_with(0, columns=["c1", "value"])
+            gen.get_message()
+            self.assertEqual(read_row_group.call_count, 2)
+
+    def test_auto_features_and_multi_target(self):
+        gen = ParquetDatasetGenerator(filepath=self.path, target_column=["value", "c1"])
+        self.assertEqual(gen.feature_columns, ["moment", "unused"])
+        x, y = gen.get_message()
+        self.assertEqual(y, {"value": 1, "c1": 10.0})
+
+    def test_missing_columns_raise(self):
+        with self.assertRaises(ValueError):
+            ParquetDatasetGenerator(filepath=self.path, target_column="missing")
+        with self.assertRaises(ValueError):
+            ParquetDatasetGenerator(
+                filepath=self.path, target_column="value", feature_columns=["missing"]
+            )
+
+    def test_past_forecast_batcher(self):
+        batcher = ParquetPastForecastBatcher(
+            filepath=self.path,
+            target_column="value",
+            feature_columns=["c1"],
+            past_size=2,
+            forecast_size=1,
+        )
+        results = list(batcher)
+        self.assertEqual(len(results), 3)
+        X_past, y_past = results[0]
+        self.assertEqual(list(X_past["c1"]), [10.0, 11.0])
+        self.assertEqual(y_past, 4)
+        self.assertEqual(batcher.get_count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
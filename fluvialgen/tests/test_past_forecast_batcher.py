@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from fluvialgen.past_forecast_batcher import PastForecastBatcher
@@ -125,6 +126,63 @@ class TestPastForecastBatcher(unittest.TestCase):
         with self.assertRaises(StopIteration):
             self.batcher.get_message()
 
+    def test_dataset_shorter_than_window(self):
+        """Test that a stream too short for one window ends without messages"""
+        data = [({'value': 1}, 1), ({'value': 2}, 2)]
+        for n_instances in (2, 1000):
+            batcher = PastForecastBatcher(MockDataset(data), past_size=3, n_instances=n_instances)
+            self.assertEqual(list(batcher), [])
+
+
+    def test_multiple_horizons(self):
+        """Test one pass emitting a target per horizon"""
+        self.batcher = PastForecastBatcher(self.dataset, past_size=2, forecast_size=[0, 2])
+        self.assertEqual(self.batcher.buffer.capacity, 5)  # past_size + 1 + largest horizon
+
+        X_past, y_past = self.batcher.get_message()
+        self.assertEqual(list(X_past['value']), [1, 2])
+        self.assertIsInstance(y_past, pd.Series)
+        self.assertEqual(list(y_past.index), [0, 2])
+        self.assertEqual(list(y_past), [3, 5])
+
+        X_past, y_past = self.batcher.get_message()
+        self.assertEqual(list(X_past['value']), [2, 3])
+        self.assertEqual(list(y_past), [4, 6])
+
+        with self.assertRaises(StopIteration):
+            self.batcher.get_message()
+
+    def test_horizon_range_matches_single_horizon_batchers(self):
+        """Test a horizon range against one batcher per horizon"""
+        combined = list(PastForecastBatcher(MockDataset(self.data), past_size=2, forecast_size=range(3)))
+        singles = [
+            list(PastForecastBatcher(MockDataset(self.data), past_size=2, forecast_size=h))
+            for h in range(3)
+        ]
+        # The largest horizon bounds the number of instances
+        self.assertEqual(len(combined), len(singles[2]))
+        for i, (X_past, y_past) in enumerate(combined):
+            pd.testing.assert_frame_equal(X_past, singles[0][i][0])
+            self.assertEqual(list(y_past), [singles[h][i][1] for h in range(3)])
+
+    def test_numpy_integer_forecast_size(self):
+        """Test that a NumPy integer is a single horizon, like an int"""
+        batcher = PastForecastBatcher(MockDataset(self.data), past_size=2, forecast_size=np.int64(2))
+        self.assertIsNone(batcher.horizons)
+        expected = list(PastForecastBatcher(MockDataset(self.data), past_size=2, forecast_size=2))
+        self.assertEqual([y for _, y in batcher], [y for _, y in expected])
+
+    def test_horizons_with_other_output_format(self):
+        """Test multi-horizon targets with a non-pandas output format"""
+        batcher = PastForecastBatcher(self.dataset, past_size=2, forecast_size=[1, 0], output_format="dict")
+        _, y_past = batcher.get_message()
+        self.assertEqual(y_past, [4, 3])
+
+    def test_invalid_horizons(self):
+        """Test validation of horizon lists"""
+        for horizons in ([], [1, 1], [-1, 2]):
+            with self.assertRaises(ValueError):
+                PastForecastBatcher(MockDataset(self.data), past_size=2, forecast_size=horizons)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,90 @@
+import functools
+import unittest
+
+from fluvialgen.base_generator import BaseGenerator
+from fluvialgen.prefetch_generator import PrefetchGenerator
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+class CountingSource(BaseGenerator):
+    """Yields 0..n-1, optionally failing at ``fail_at``, and records stop calls."""
+
+    def __init__(self, n, fail_at=None):
+        super().__init__()
+        self.n = n
+        self.fail_at = fail_at
+        self.stopped = 0
+
+    def __next__(self):
+        super().__next__()
+        return self.get_message()
+
+    def get_message(self):
+        if self._count == self.fail_at:
+            raise KeyError("bad row")
+        if self._count >= self.n:
+            raise StopIteration
+        self._count += 1
+        return self._count - 1
+
+    def get_count(self):
+        return self._count
+
+    def stop(self):
+        self.stopped += 1
+
+
+class TestPrefetchGenerator(unittest.TestCase):
+
+    def test_thread_mode_yields_all_messages_in_order(self):
+        data = [({"x": i}, i * 2) for i in range(50)]
+        source = RiverDatasetGenerator(dataset=MockDataset(data), n_instances=50)
+        gen = PrefetchGenerator(source, depth=4)
+        self.assertEqual(list(gen), data)
+        self.assertEqual(gen.get_count(), 50)
+        # Exhausted generators keep raising StopIteration
+        with self.assertRaises(StopIteration):
+            gen.get_message()
+
+    def test_exception_is_propagated_and_source_stopped(self):
+        source = CountingSource(10, fail_at=3)
+        gen = PrefetchGenerator(source, depth=2)
+        self.assertEqual([next(gen) for _ in range(3)], [0, 1, 2])
+        with self.assertRaises(KeyError):
+            next(gen)
+        self.assertGreaterEqual(source.stopped, 1)
+
+    def test_early_stop_stops_source(self):
+        source = CountingSource(10_000)
+        gen = PrefetchGenerator(source, depth=2)
+        self.assertEqual(next(gen), 0)
+        gen.stop()
+        self.assertFalse(gen._worker.is_alive())
+        self.assertEqual(source.stopped, 1)
+        # Production is bounded by the queue depth
+        self.assertLess(source.get_count(), 10)
+        with self.assertRaises(StopIteration):
+            next(gen)
+
+    def test_process_mode_with_factory(self):
+        gen = PrefetchGenerator(functools.partial(CountingSource, 20), depth=3, mode="process")
+        self.assertEqual(list(gen), list(range(20)))
+
+    def test_process_mode_propagates_exception(self):
+        gen = PrefetchGenerator(CountingSource(5, fail_at=2), mode="process")
+        self.assertEqual([next(gen), next(gen)], [0, 1])
+        with self.assertRaises(KeyError):
+            next(gen)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PrefetchGenerator(CountingSource(1), depth=0)
+        with self.assertRaises(ValueError):
+            PrefetchGenerator(CountingSource(1), mode="fiber")
+        with self.assertRaises(TypeError):
+            PrefetchGenerator([1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from fluvialgen.ring_buffer import ArrayRingBuffer, RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_append_and_popleft(self):
+        buf = RingBuffer(3)
+        self.assertEqual(buf, [])
+        for i in range(3):
+            buf.append(i)
+        self.assertEqual(len(buf), 3)
+        self.assertEqual(buf.popleft(), 0)
+        buf.append(3)
+        self.assertEqual(list(buf), [1, 2, 3])
+        self.assertEqual(buf[0], 1)
+        self.assertEqual(buf[-1], 3)
+
+    def test_append_evicts_when_full(self):
+        buf = RingBuffer(2)
+        for i in range(5):
+            buf.append(i)
+        self.assertEqual(buf, [3, 4])
+
+    def test_window_is_contiguous_across_wraparound(self):
+        buf = RingBuffer(4)
+        for i in range(10):
+            buf.append(i)
+            if len(buf) == 4:
+                self.assertEqual(buf.window(), list(range(i - 3, i + 1)))
+                self.assertEqual(buf.window(1, 2), [i - 2, i - 1])
+                self.assertEqual(buf[1:3], [i - 2, i - 1])
+                buf.popleft()
+
+    def test_errors(self):
+        buf = RingBuffer(2)
+        with self.assertRaises(IndexError):
+            buf.popleft()
+        with self.assertRaises(IndexError):
+            buf[0]
+        buf.append(1)
+        with self.assertRaises(IndexError):
+            buf.window(0, 2)
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+    def test_clear(self):
+        buf = RingBuffer(2)
+        buf.append(1)
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+        buf.append(2)
+        self.assertEqual(buf, [2])
+
+
+class TestArrayRingBuffer(unittest.TestCase):
+
+    def test_window_views_are_contiguous(self):
+        buf = ArrayRingBuffer(3, 2)
+        for i in range(7):
+            buf.append([i, 10 * i], i)
+        features, targets = buf.window()
+        np.testing.assert_array_equal(features, [[4, 40], [5, 50], [6, 60]])
+        np.testing.assert_array_equal(targets, [4, 5, 6])
+        self.assertTrue(features.flags.c_contiguous)
+        self.assertTrue(np.shares_memory(features, buf.features))
+
+    def test_popleft(self):
+        buf = ArrayRingBuffer(2, 1)
+        buf.append([1], 1)
+        buf.popleft()
+        self.assertEqual(len(buf), 0)
+        with self.assertRaises(IndexError):
+            buf.popleft()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import pickle
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.schema import FeatureSchema, Record
+from fluvialgen.tests.test_csv_dataset_generator import _write_temp_csv
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+class TestFeatureSchema(unittest.TestCase):
+
+    def test_record_behaves_like_read_only_mapping(self):
+        schema = FeatureSchema(["a", "b"])
+        record = schema.record((1, "x"))
+        self.assertEqual(record["a"], 1)
+        self.assertEqual(record.get("c", 0), 0)
+        self.assertIn("b", record)
+        self.assertEqual(list(record.items()), [("a", 1), ("b", "x")])
+        self.assertEqual(record, {"a": 1, "b": "x"})
+        self.assertEqual(dict(record), {"a": 1, "b": "x"})
+        self.assertEqual({**record}, {"a": 1, "b": "x"})
+        self.assertIsInstance(record.copy(), dict)
+        with self.assertRaises(KeyError):
+            record["c"]
+        with self.assertRaises(TypeError):
+            record["a"] = 2
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_packed_schema(self):
+        schema = FeatureSchema(["a", "b"], [np.float64, np.float32])
+        self.assertTrue(schema.packed)
+        record = schema.record((1.5, 2.0))
+        self.assertEqual(record, {"a": 1.5, "b": 2.0})
+        self.assertFalse(FeatureSchema(["a"], [np.int64]).packed)
+        self.assertFalse(FeatureSchema(["a"]).packed)
+
+    def test_records_share_packed_block(self):
+        schema = FeatureSchema(["a", "b"], [np.float64, np.float64])
+        records = schema.records([(1.0, 2.0), (3.0, 4.0)])
+        self.assertEqual(records, [{"a": 1.0, "b": 2.0}, {"a": 3.0, "b": 4.0}])
+        self.assertIs(records[0]._values, records[1]._values)
+        self.assertEqual(len(records[1]), 2)
+        restored = pickle.loads(pickle.dumps(records[1]))
+        self.assertEqual(restored, {"a": 3.0, "b": 4.0})
+        self.assertEqual(len(restored._values), 2)
+
+    def test_length_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            FeatureSchema(["a"]).record((1, 2))
+        with self.assertRaises(ValueError):
+            FeatureSchema(["a"], [np.float64, np.float64])
+
+    def test_pickle_roundtrip(self):
+        record = FeatureSchema(["a", "b"], [np.float64, np.float64]).record((1.0, 2.0))
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertEqual(restored, record)
+        self.assertEqual(restored.schema, record.schema)
+
+
+class TestCompactRecords(unittest.TestCase):
+
+    def test_csv_compact_records(self):
+        df = pd.DataFrame(
+            {
+                "value": [1.0, 2.0, 3.0],
+                "other": [10.0, 20.0, 30.0],
+                "c1": [0.1, 0.2, 0.3],
+                "c2": [1.0, 0.0, 1.0],
+            }
+        )
+        csv_path = _write_temp_csv(df)
+        try:
+            plain = CSVDatasetGenerator(filepath=csv_path, target_column=["value", "other"])
+            compact = CSVDatasetGenerator(
+                filepath=csv_path, target_column=["value", "other"], compact_records=True
+            )
+            self.assertTrue(compact.schema.packed)
+            for (x, y), (cx, cy) in zip(plain._data, compact._data):
+                self.assertIsInstance(cx, Record)
+                self.assertIsInstance(cy, Record)
+                self.assertEqual(cx, x)
+                self.assertEqual(cy, y)
+            # All rows share a single schema
+            self.assertEqual(len({id(x.schema) for x, _ in compact._data}), 1)
+        finally:
+            os.unlink(csv_path)
+
+    def test_river_compact_records_through_batcher(self):
+        data = [({'moment': datetime(2024, 1, 1, 0, i), 'value': i}, i) for i in range(5)]
+        batcher = PastForecastBatcher(
+            MockDataset(data), past_size=2, compact_records=True
+        )
+        X_past, y_past = batcher.get_message()
+        self.assertIsInstance(batcher.buffer[0][0], Record)
+        self.assertEqual(list(X_past['value']), [0, 1])
+        self.assertEqual(list(X_past.columns), ['moment', 'value'])
+        self.assertEqual(y_past, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import gzip
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.csv_past_forecast_batcher import CSVPastForecastBatcher
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tests.test_checkpoint import _assert_same
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+class SizedDataset(MockDataset):
+    """A mock River dataset that, like River's own, knows its n_samples."""
+
+    @property
+    def n_samples(self):
+        return len(self.data)
+
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        start = datetime(2024, 1, 1)
+        self.rows = [({"moment": start + timedelta(hours=i), "rain": float(i % 7)}, float(i)) for i in range(23)]
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "gauge.csv")
+        pd.DataFrame({
+            "moment": pd.date_range("2024-01-01", periods=23, freq="h"),
+            "rain": [float(i % 7) for i in range(23)],
+            "level": [float(i) for i in range(23)],
+        }).to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _check_contiguous(self, make, num_shards=(2, 3, 5)):
+        """Shards concatenated in order give exactly the unsharded messages."""
+        expected = [_copy(m) for m in make()]
+        for k in num_shards:
+            merged = []
+            for shard in range(k):
+                merged.extend(_copy(m) for m in make(shard_id=shard, num_shards=k))
+            self.assertEqual(len(merged), len(expected), f"num_shards={k}")
+            _assert_same(self, merged, expected)
+
+    def _check_round_robin(self, make, expected):
+        for k in (2, 3, 30):
+            for shard in range(k):
+                rows = list(make(shard_id=shard, num_shards=k, shard_mode="round_robin"))
+                self.assertEqual(rows, expected[shard::k], f"shard {shard}/{k}")
+
+    def test_river_source(self):
+        def make(**kwargs):
+            return RiverDatasetGenerator(SizedDataset(self.rows), **kwargs)
+        self._check_contiguous(make, (2, 3, 5, 30))
+        self._check_round_robin(make, self.rows)
+        # Without n_samples, n_instances is the size that is split
+        shard = RiverDatasetGenerator(MockDataset(self.rows), n_instances=20, shard_id=1, num_shards=2)
+        self.assertEqual(list(shard), self.rows[10:20])
+
+    def test_moving_window_batcher(self):
+        for kwargs in ({}, {"padding": "drop"}, {"padding": "ragged"}, {"padding": "mask"},
+                       {"padding": "mask", "lazy": True}, {"padding": "ragged", "array_mode": True}):
+            def make(**shard):
+                return MovingWindowBatcher(SizedDataset(self.rows), instance_size=4, batch_size=3,
+                                           **kwargs, **shard)
+            with self.subTest(**kwargs):
+                self._check_contiguous(make)
+
+    def test_past_forecast_batchers(self):
+        self._check_contiguous(lambda **shard: PastForecastBatcher(
+            SizedDataset(self.rows), past_size=3, forecast_size=[0, 2], **shard
+        ))
+        for chunksize in (None, 4):
+            self._check_contiguous(lambda **shard: CSVPastForecastBatcher(
+                self.csv, target_column="level", parse_dates=["moment"], past_size=3, forecast_size=1,
+                chunksize=chunksize, **shard
+            ))
+
+    def test_batchers_reject_round_robin(self):
+        with self.assertRaises(ValueError):
+            MovingWindowBatcher(SizedDataset(self.rows), instance_size=4, batch_size=3,
+                                num_shards=2, shard_mode="round_robin")
+        with self.assertRaises(ValueError):
+            CSVPastForecastBatcher(self.csv, target_column="level", past_size=3,
+                                   num_shards=2, shard_mode="round_robin")
+
+    def test_invalid_options(self):
+        for kwargs in ({"num_shards": 0}, {"shard_id": 2, "num_shards": 2},
+                       {"num_shards": 2, "shard_mode": "random"}):
+            with self.assertRaises(ValueError):
+                RiverDatasetGenerator(SizedDataset(self.rows), **kwargs)
+
+    def test_csv_modes(self):
+        full = list(CSVDatasetGenerator(self.csv, target_column="level", parse_dates=["moment"]))
+        CSVDatasetGenerator(self.csv, target_column="level", parse_dates=["moment"], cache=True)
+        gz = self.csv + ".gz"
+        with open(self.csv, "rb") as src, gzip.open(gz, "wb") as dst:
+            dst.write(src.read())
+        for path, kwargs in ((self.csv, {}), (self.csv, {"chunksize": 4}), (self.csv, {"index": True}),
+                             (self.csv, {"cache": True}), (self.csv, {"cache": True, "chunksize": 2}),
+                             (gz, {}), (gz, {"chunksize": 4}),
+                             (self.csv, {"start_row": 3, "stop_row": 20, "chunksize": 4})):
+            def make(**shard):
+                return CSVDatasetGenerator(path, target_column="level", parse_dates=["moment"],
+                                           **kwargs, **shard)
+            with self.subTest(path=path, **kwargs):
+                expected = full[kwargs.get("start_row", 0):kwargs.get("stop_row")]
+                self._check_contiguous(make)
+                self._check_round_robin(make, expected)
+
+    def test_round_robin_csv_seek_and_resume(self):
+        def make():
+            return CSVDatasetGenerator(self.csv, target_column="level", chunksize=3,
+                                       shard_id=1, num_shards=3, shard_mode="round_robin")
+        gen = make()
+        self.assertEqual([y for _, y in gen.next_batch(2)], [1.0, 4.0])
+        self.assertEqual(gen.position, 7)
+        state = pickle.loads(pickle.dumps(gen.state_dict()))
+        resumed = make()
+        resumed.load_state_dict(state)
+        self.assertEqual([y for _, y in resumed], [7.0, 10.0, 13.0, 16.0, 19.0, 22.0])
+        gen.seek(16)
+        self.assertEqual(next(gen)[1], 16.0)
+        with self.assertRaises(ValueError):
+            gen.seek(17)
+
+
+def _copy(message):
+    # Lazy batches materialize on unpacking; array mode views are reused
+    return tuple(m.copy() if hasattr(m, "copy") else m for m in message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from fluvialgen.csv_dataset_generator import CSVDatasetGenerator
+from fluvialgen.movingwindow_generator import MovingWindowBatcher
+from fluvialgen.past_forecast_batcher import PastForecastBatcher
+from fluvialgen.river_dataset_generator import RiverDatasetGenerator
+from fluvialgen.tee import Tee
+from fluvialgen.tests.test_past_forecast_batcher import MockDataset
+
+
+class CountingDataset(MockDataset):
+    """MockDataset that counts how many items were read from it."""
+
+    reads = 0
+
+    def take(self, n):
+        for item in self.data[:n]:
+            self.reads += 1
+            yield item
+
+
+class TestTee(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [({"x": float(i), "z": i % 3}, float(i)) for i in range(40)]
+
+    def _batchers(self, dataset_factory):
+        return (
+            MovingWindowBatcher(dataset=dataset_factory(), instance_size=4, batch_size=2, n_instances=40),
+            PastForecastBatcher(dataset=dataset_factory(), past_size=3, forecast_size=1, n_instances=40),
+        )
+
+    def test_branches_match_independent_batchers(self):
+        expected_mw, expected_pf = (list(b) for b in self._batchers(lambda: MockDataset(self.data)))
+
+        dataset = CountingDataset(self.data)
+        tee = Tee(RiverDatasetGenerator(dataset=dataset, n_instances=40))
+        mw, pf = self._batchers(tee.branch)
+        got_mw, got_pf = list(mw), list(pf)
+
+        self.assertEqual(len(got_mw), len(expected_mw))
+        for (X, y), (X_e, y_e) in zip(got_mw, expected_mw):
+            pd.testing.assert_frame_equal(X, X_e)
+            pd.testing.assert_series_equal(y, y_e)
+        self.assertEqual(len(got_pf), len(expected_pf))
+        for (X, y), (X_e, y_e) in zip(got_pf, expected_pf):
+            pd.testing.assert_frame_equal(X, X_e)
+            self.assertEqual(y, y_e)
+        # The source was read once, not once per batcher
+        self.assertEqual(dataset.reads, 40)
+
+    def test_buffer_holds_only_what_the_slowest_branch_needs(self):
+        tee = Tee(RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=40))
+        fast, slow = tee.branch(), tee.branch()
+        for _ in range(10):
+            next(fast)
+        self.assertEqual(tee.buffered, 10)
+        for _ in range(4):
+            next(slow)
+        self.assertEqual(tee.buffered, 6)
+        # Interleaved consumption keeps the buffer small
+        for _ in range(20):
+            next(fast)
+            next(slow)
+        self.assertEqual(tee.buffered, 6)
+        self.assertEqual(tee.max_buffered, 10)
+
+    def test_closing_a_branch_releases_its_messages(self):
+        source = RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=40)
+        tee = Tee(source)
+        a, b = tee.branch(), tee.branch()
+        for _ in range(5):
+            next(a)
+        b.close()
+        self.assertEqual(tee.buffered, 0)
+        self.assertEqual(len(list(a)), 35)
+        with self.assertRaises(StopIteration):
+            next(b)
+        a.close()
+        self.assertIsNone(source._iterator)
+
+    def test_max_lag(self):
+        tee = Tee(RiverDatasetGenerator(dataset=MockDataset(self.data), n_instances=40), max_lag=3)
+        fast, _ = tee.branch(), tee.branch()
+        for _ in range(3):
+            next(fast)
+        with self.assertRaises(RuntimeError):
+            next(fast)
+
+    def test_csv_source(self):
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+        tmp.close()
+        pd.DataFrame({"value": range(10), "c1": [i / 2 for i in range(10)]}).to_csv(tmp.name, index=False)
+        try:
+            tee = Tee(CSVDatasetGenerator(tmp.name, target_column="value"))
+            first, second = tee.branch(), tee.branch()
+            rows = list(first.take(10))
+            self.assertEqual(rows, list(second.take(10)))
+            self.assertEqual(rows[3], ({"c1": 1.5}, 3))
+        finally:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import pandas as pd
+
+from fluvialgen.window_store import ColumnarStore
+
+
+class TestColumnarStore(unittest.TestCase):
+
+    def _store(self, n, chunk_size=4):
+        store = ColumnarStore(chunk_size=chunk_size)
+        for i in range(n):
+            store.append({"a": i, "b": 10 * i}, -i)
+        return store
+
+    def test_windows_spanning_chunks(self):
+        store = self._store(10)
+        batch = store.batch([2, 3, 5], 3)
+        self.assertEqual(batch.n_windows, 3)
+        self.assertEqual(batch.column("a"), [2, 3, 4, 3, 4, 5, 5, 6, 7])
+        self.assertEqual(batch.targets(), [-2, -3, -4, -3, -4, -5, -5, -6, -7])
+        X, y = batch
+        self.assertEqual(list(X.columns), ["a", "b"])
+        self.assertEqual(X["b"].tolist(), [20, 30, 40, 30, 40, 50, 50, 60, 70])
+
+    def test_release_keeps_batches_valid(self):
+        store = self._store(10)
+        batch = store.batch([4], 4)
+        store.release(9)
+        # Only the chunk holding row 9 (rows 8-11) is left
+        self.assertEqual(store.start, 8)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(batch.column("a"), [4, 5, 6, 7])
+        with self.assertRaises(IndexError):
+            store.batch([4], 4)
+
+    def test_missing_and_new_keys(self):
+        store = ColumnarStore(chunk_size=8)
+        store.append({"a": 1.0}, 0)
+        store.append({"a": 2.0, "b": "x"}, 1)
+        store.append({"b": "y"}, 2)
+        batch = store.batch([0], 3)
+        self.assertEqual(batch.columns, ["a", "b"])
+        self.assertEqual(batch.column("a"), [1.0, 2.0, None])
+        self.assertEqual(batch.column("b"), [None, "x", "y"])
+        self.assertTrue(pd.isna(batch.X["a"].iloc[2]))
+        with self.assertRaises(KeyError):
+            batch.column("c")
+
+    def test_output_format(self):
+        batch = self._store(6).batch([0, 1], 2, output_format="dict")
+        X, y = batch
+        self.assertEqual(X, [{"a": 0, "b": 0}, {"a": 1, "b": 10}, {"a": 1, "b": 10}, {"a": 2, "b": 20}])
+        self.assertEqual(y, [0, -1, -1, -2])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            ColumnarStore(chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""Shared columnar storage for windows referenced by (start, length)."""
+from typing import Any, Dict, List, Sequence
+
+import pandas as pd
+
+from fluvialgen.output_formats import get_output_format
+
+
+class _Chunk:
+    """A run of up to ``chunk_size`` consecutive rows, stored column by column."""
+
+    __slots__ = ("start", "size", "columns", "targets")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.size = 0
+        self.columns: Dict[Any, list] = {}
+        self.targets: list = []
+
+
+class ColumnarStore:
+    """
+    Append-only store of (x, y) rows kept as one list per feature column.
+
+    Rows get consecutive absolute positions and are grouped in chunks of
+    ``chunk_size``. ``release`` drops the chunks before a position; batches
+    returned by ``batch`` keep references to the chunks they span, so they
+    stay valid after the store has moved on while every row is still stored
+    only once.
+
+    Args:
+        chunk_size: Number of rows per chunk
+    """
+
+    def __init__(self, chunk_size: int = 4096):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.chunk_size = chunk_size
+        self.columns: List[Any] = []  # In order of first appearance
+        self._chunks: List[_Chunk] = []
+        self._end = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute position of the oldest row still held."""
+        return self._chunks[0].start if self._chunks else self._end
+
+    @property
+    def end(self) -> int:
+        """Absolute position the next appended row will get."""
+        return self._end
+
+    def __len__(self) -> int:
+        return self._end - self.start
+
+    def append(self, x, y):
+        """Appends a row; keys missing from x are stored as None."""
+        if not self._chunks or self._chunks[-1].size == self.chunk_size:
+            self._chunks.append(_Chunk(self._end))
+        chunk = self._chunks[-1]
+        size = chunk.size
+        columns = chunk.columns
+        for key, value in x.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * size
+                if key not in self.columns:
+                    self.columns.append(key)
+            column.append(value)
+        if len(x) != len(columns):
+            for column in columns.values():
+                if len(column) == size:
+                    column.append(None)
+        chunk.targets.append(y)
+        chunk.size = size + 1
+        self._end += 1
+
+    def release(self, position: int):
+        """Drops the chunks holding only rows before ``position``."""
+        n = 0
+        for chunk in self._chunks:
+            if chunk.start + chunk.size > position or chunk is self._chunks[-1]:
+                break
+            n += 1
+        if n:
+            del self._chunks[:n]
+
+    def batch(self, starts: Sequence[int], length: int, output_format="pandas") -> "WindowBatch":
+        """
+        Returns a lazy batch of the windows ``[s, s + length)`` for each start.
+
+        Args:
+            starts: Absolute start position of every window
+            length: Number of rows per window
+            output_format: Name or OutputFormat used to materialize the batch
+        """
+        first, last = min(starts), max(starts) + length
+        if first < self.start or last > self._end:
+            raise IndexError("window out of range")
+        lo = (first - self.start) // self.chunk_size
+        hi = (last - 1 - self.start) // self.chunk_size
+        return WindowBatch(self._chunks[lo:hi + 1], tuple(starts), length, self.chunk_size,
+                           self.columns, get_output_format(output_format))
+
+
+class WindowBatch:
+    """
+    A batch of windows over a ColumnarStore, materialized on first access.
+
+    Iterating or indexing the batch yields ``(X, y)`` in the batcher's output
+    format, so ``X, y = batch`` works as with an eager batch. The conversion
+    happens once and is cached; ``column``, ``targets`` and ``window`` read the
+    shared store directly without building the whole output.
+
+    If ``mask`` is set (MovingWindowBatcher with ``padding="mask"``), it is
+    yielded as a third item: ``X, y, mask = batch``.
+    """
+
+    __slots__ = ("starts", "length", "mask", "_chunks", "_chunk_size", "_columns", "_output",
+                 "_materialized")
+
+    def __init__(self, chunks, starts, length, chunk_size, columns, output_format):
+        self.starts = starts
+        self.length = length
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        present = set()
+        for chunk in chunks:
+            present.update(chunk.columns)
+        self._columns = [c for c in columns if c in present]
+        self._output = output_format
+        self._materialized = None
+        self.mask = None
+
+    @property
+    def n_windows(self) -> int:
+        return len(self.starts)
+
+    @property
+    def columns(self) -> List[Any]:
+        return list(self._columns)
+
+    def _slice(self, name, start: int, stop: int) -> list:
+        """Values of one column (``None`` for the targets) for rows [start, stop)."""
+        base = self._chunks[0].start
+        index = (start - base) // self._chunk_size
+        values = []
+        while start < stop:
+            chunk = self._chunks[index]
+            offset = start - chunk.start
+            take = min(stop, chunk.start + chunk.size) - start
+            if name is None:
+                values.extend(chunk.targets[offset:offset + take])
+            else:
+                column = chunk.columns.get(name)
+                values.extend(column[offset:offset + take] if column is not None else [None] * take)
+            start += take
+            index += 1
+        return values
+
+    def column(self, name) -> list:
+        """Values of one feature column for every row of every window, in order."""
+        if name not in self._columns:
+            raise KeyError(name)
+        values = []
+        for start in self.starts:
+            values.extend(self._slice(name, start, start + self.length))
+        return values
+
+    def targets(self) -> list:
+        """Targets for every row of every window, in order."""
+        values = []
+        for start in self.starts:
+            values.extend(self._slice(None, start, start + self.length))
+        return values
+
+    def window(self, i: int) -> List[tuple]:
+        """The (x, y) rows of the i-th window."""
+        start = self.starts[i]
+        stop = start + self.length
+        columns = [self._slice(name, start, stop) for name in self._columns]
+        xs = [dict(zip(self._columns, values)) for values in zip(*columns)] if columns else [{}] * self.length
+        return list(zip(xs, self._slice(None, start, stop)))
+
+    def materialize(self):
+        """Builds (X, y) in the output format; the result is cached."""
+        if self._materialized is None:
+            if self._output.frame is pd.DataFrame:
+                # Straight from the columns, without rebuilding row dicts
+                n_rows = self.n_windows * self.length
+                X = pd.DataFrame({c: self.column(c) for c in self._columns}, index=pd.RangeIndex(n_rows))
+            else:
+                columns = [self.column(c) for c in self._columns]
+                X = self._output.frame([dict(zip(self._columns, values)) for values in zip(*columns)])
+            self._materialized = (X, self._output.vector(self.targets()))
+        return self._materialized
+
+    @property
+    def X(self):
+        return self.materialize()[0]
+
+    @property
+    def y(self):
+        return self.materialize()[1]
+
+    def _items(self):
+        X, y = self.materialize()
+        return (X, y) if self.mask is None else (X, y, self.mask)
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __getitem__(self, index):
+        return self._items()[index]
+
+    def __repr__(self):
+        return f"WindowBatch(n_windows={self.n_windows}, length={self.length})"
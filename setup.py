@@ -15,6 +15,10 @@ setup(
         "tqdm",
         "river",
     ],
+    extras_require={
+        # ParquetDatasetGenerator, ParquetPastForecastBatcher and the "arrow" output format
+        "parquet": ["pyarrow"],
+    },
     author="Jose Enrique Ruiz Navarro",
     author_email="joseenriqueruiznavarro@gmail.com",
     description="A Python package for generating synthetic river networks and datasets",